@@ -0,0 +1,33 @@
+"""Benchmark each numeric backend on long chains of operations.
+
+Run with: python -m benchmarks.bench_backends [steps]
+"""
+import sys
+import time
+
+from src.calculator import Calculator
+
+CHAIN = [("+", 3), ("*", 2), ("-", 1), ("/", 4)]
+
+
+def run_chain(backend, steps):
+    calc = Calculator(backend=backend)
+    calculate = calc.calculate
+    start = time.perf_counter()
+    for i in range(steps):
+        operator, operand = CHAIN[i % len(CHAIN)]
+        calculate(calc.current_result, operand, operator)
+    return time.perf_counter() - start
+
+
+def main(steps=200_000):
+    print(f"chain length={steps}")
+    for backend in ("float", "decimal", "fraction"):
+        # Fractions Grow Without Bound on Long Chains, so Cap Their Run
+        length = steps if backend != "fraction" else min(steps, 20_000)
+        elapsed = run_chain(backend, length)
+        print(f"{backend:<10}{length / elapsed:12,.0f} ops/s   ({length} steps)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,29 @@
+"""Benchmark main.py batch mode throughput in lines per second.
+
+Run with: python -m benchmarks.bench_batch_cli [lines]
+"""
+import io
+import sys
+import time
+
+from src.main import run_batch
+
+COMMANDS = ["calc 5 + 3\n", "calc (3+4)*2/7\n", "undo\n", "redo\n", "calc 1.5 * 4\n"]
+
+
+def main(lines=1_000_000):
+    text = "".join(COMMANDS[i % len(COMMANDS)] for i in range(lines))
+    infile = io.StringIO(text)
+    outfile = io.StringIO()
+    errfile = io.StringIO()
+
+    start = time.perf_counter()
+    run_batch(infile, outfile, errfile)
+    elapsed = time.perf_counter() - start
+
+    print(f"lines={lines}")
+    print(f"batch mode: {elapsed:8.3f}s  {lines / elapsed:12,.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
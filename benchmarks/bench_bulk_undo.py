@@ -0,0 +1,40 @@
+"""Benchmark undo(n)/redo(n) slice transfers against loops of single steps.
+
+Run with: python -m benchmarks.bench_bulk_undo [steps]
+"""
+import sys
+import time
+
+from src.calculator import Calculator
+from src.stack import ArrayStack, Stack
+
+
+def build(steps, stack_type):
+    calc = Calculator(stack_type=stack_type)
+    for i in range(steps):
+        calc.calculate(float(i), 1.0, '+')
+    return calc
+
+
+def main(steps=1_000_000):
+    print(f"steps={steps}")
+    for stack_type in (Stack, ArrayStack):
+        calc = build(steps, stack_type)
+        start = time.perf_counter()
+        for _ in range(steps):
+            calc.undo()
+        for _ in range(steps):
+            calc.redo()
+        loop = time.perf_counter() - start
+
+        start = time.perf_counter()
+        calc.undo(steps)
+        calc.redo(steps)
+        bulk = time.perf_counter() - start
+
+        print(f"{stack_type.__name__:<12} single-step loop {loop * 1e3:10.1f} ms"
+              f"   bulk {bulk * 1e3:8.1f} ms   ({loop / bulk:.0f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,46 @@
+"""Benchmark the calculate() result cache against plain arithmetic.
+
+Shows where the cache pays off (expensive backends, repetitive traffic)
+and where its lookup overhead loses to plain float arithmetic.
+
+Run with: python -m benchmarks.bench_cache [operations]
+"""
+import random
+import sys
+import time
+
+from src.calculator import Calculator
+
+
+def workload(operations, distinct, seed=0):
+    """Operations drawn from a pool of `distinct` repeated triples."""
+    rng = random.Random(seed)
+    pool = [(rng.uniform(1, 1000), rng.uniform(1, 1000), rng.choice("+-*/"))
+            for _ in range(distinct)]
+    return [pool[rng.randrange(distinct)] for _ in range(operations)]
+
+
+def run(operations, **options):
+    calc = Calculator(**options)
+    calculate = calc.calculate
+    start = time.perf_counter()
+    for value1, value2, operator in operations:
+        calculate(value1, value2, operator)
+    return time.perf_counter() - start, calc
+
+
+def main(operations=200_000):
+    print(f"operations={operations}")
+    for backend in ("float", "decimal", "fraction"):
+        for distinct in (100, 100_000):
+            ops = workload(operations, distinct)
+            plain, _ = run(ops, backend=backend)
+            cached, calc = run(ops, backend=backend, cache_size=10_000)
+            stats = calc.cache.stats()
+            print(f"{backend:<9} distinct={distinct:<7} plain {operations / plain:11,.0f}/s"
+                  f"   cached {operations / cached:11,.0f}/s"
+                  f"   hit rate {stats['hit_rate']:5.1%}   ({plain / cached:.2f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,60 @@
+"""Benchmark Calculator.calculate_many against a scalar calculate() loop.
+
+Run with: python -m benchmarks.bench_calculate_many [rows]
+"""
+import random
+import sys
+import time
+
+from src import calculator as calculator_module
+from src.calculator import OPERATORS, Calculator
+
+
+def make_columns(rows, seed=0):
+    """Build reproducible value/operator columns with no zero divisors."""
+    rng = random.Random(seed)
+    values1 = [rng.uniform(-1000, 1000) for _ in range(rows)]
+    values2 = [rng.uniform(1, 1000) for _ in range(rows)]
+    operators = [rng.randrange(len(OPERATORS)) for _ in range(rows)]
+    return values1, values2, operators
+
+
+def bench_scalar(values1, values2, operators):
+    calc = Calculator()
+    symbols = [OPERATORS[code] for code in operators]
+    start = time.perf_counter()
+    for value1, value2, operator in zip(values1, values2, symbols):
+        calc.calculate(value1, value2, operator)
+    return time.perf_counter() - start
+
+
+def bench_batch(values1, values2, operators):
+    calc = Calculator()
+    if calculator_module.np is not None:
+        np = calculator_module.np
+        values1, values2 = np.asarray(values1), np.asarray(values2)
+        operators = np.asarray(operators, dtype=np.int8)
+    start = time.perf_counter()
+    calc.calculate_many(values1, values2, operators)
+    return time.perf_counter() - start
+
+
+def main(rows=1_000_000):
+    # NumPy Is Imported Lazily; Load It Now So the Kernel Check Below Is Accurate
+    if calculator_module.np is calculator_module.NUMPY_UNLOADED:
+        calculator_module._load_numpy()
+
+    values1, values2, operators = make_columns(rows)
+    kernel = "numpy" if calculator_module.np is not None else "python"
+
+    scalar = bench_scalar(values1, values2, operators)
+    batch = bench_batch(values1, values2, operators)
+
+    print(f"rows={rows} kernel={kernel}")
+    print(f"scalar loop:    {scalar:8.3f}s  {rows / scalar:12,.0f} rows/s")
+    print(f"calculate_many: {batch:8.3f}s  {rows / batch:12,.0f} rows/s")
+    print(f"speedup:        {scalar / batch:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
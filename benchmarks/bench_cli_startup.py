@@ -0,0 +1,52 @@
+"""Benchmark CLI time-to-first-prompt and command dispatch throughput.
+
+Time-to-first-prompt is the wall time of `python -m src.main` answering
+'exit' at its first prompt, minus a bare interpreter start.
+
+Run with: python -m benchmarks.bench_cli_startup [commands]
+"""
+import subprocess
+import sys
+import time
+
+from src.calculator import Calculator
+from src.main import execute_command
+
+COMMANDS = ["calc 5 + 3", "calc (3+4)*2/7", "undo", "redo", "calc 1.5 * 4", "undo 2", "redo 2"]
+
+
+def wall_time(args, text, repeat=10):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(args, input=text, capture_output=True, text=True, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(commands=500_000):
+    interpreter = wall_time([sys.executable, "-c", "pass"], "")
+    cli = wall_time([sys.executable, "-m", "src.main"], "exit\n")
+    print(f"time to first prompt: {(cli - interpreter) * 1000:6.1f} ms"
+          f"   (interpreter start {interpreter * 1000:.1f} ms)")
+
+    lines = [COMMANDS[i % len(COMMANDS)] for i in range(commands)]
+    calc = Calculator()
+    start = time.perf_counter()
+    for line in lines:
+        calc, _ = execute_command(calc, line)
+    elapsed = time.perf_counter() - start
+    print(f"dispatch: {commands / elapsed:12,.0f} commands/s")
+
+    # Distinct Expressions Miss the Compile Cache and Take the Number Fast Path
+    lines = [f"calc {i} * {i % 97 + 0.5}" for i in range(commands)]
+    calc = Calculator()
+    start = time.perf_counter()
+    for line in lines:
+        calc, _ = execute_command(calc, line)
+    elapsed = time.perf_counter() - start
+    print(f"distinct: {commands / elapsed:12,.0f} commands/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,42 @@
+"""Benchmark run_chains scaling with the number of worker processes.
+
+Run with: python -m benchmarks.bench_executor [chains] [steps_per_chain]
+"""
+import os
+import random
+import sys
+import time
+
+from src.executor import run_chains
+
+
+def make_chains(count, steps, seed=0):
+    rng = random.Random(seed)
+    operators = "+-*/"
+    starts = [rng.uniform(1, 100) for _ in range(count)]
+    chains = [[(rng.choice(operators), rng.uniform(1, 2)) for _ in range(steps)]
+              for _ in range(count)]
+    return starts, chains
+
+
+def main(count=2000, steps=500):
+    starts, chains = make_chains(count, steps)
+    cores = os.cpu_count() or 1
+    print(f"chains={count} steps/chain={steps} cpus={cores}")
+
+    start = time.perf_counter()
+    run_chains(starts, chains, workers=0)
+    inline = time.perf_counter() - start
+    print(f"in-process     {inline:8.3f}s")
+
+    workers = 1
+    while workers <= max(cores, 1):
+        start = time.perf_counter()
+        run_chains(starts, chains, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"workers={workers:<6}{elapsed:8.3f}s   speedup {inline / elapsed:5.2f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
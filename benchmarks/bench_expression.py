@@ -0,0 +1,44 @@
+"""Benchmark expression parse+evaluate throughput, cold and cached.
+
+Run with: python -m benchmarks.bench_expression [iterations]
+"""
+import sys
+import time
+
+from src.calculator import Calculator
+from src.expression import compile_expression, evaluate
+
+EXPRESSIONS = [
+    "(3+4)*2/7",
+    "1.5 * (2 - -3) / 4 + 10",
+    "((1+2)*(3+4)-(5*6))/(7+8*9)",
+    "42",
+]
+
+
+def main(iterations=200_000):
+    print(f"iterations={iterations}")
+    for text in EXPRESSIONS:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            evaluate(compile_expression.__wrapped__(text))
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            evaluate(compile_expression(text))
+        cached = time.perf_counter() - start
+
+        print(f"{text!r:<34} parse+eval {iterations / cold:10,.0f}/s"
+              f"   cached {iterations / cached:10,.0f}/s")
+
+    calc = Calculator()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        calc.calculate_expression("(3+4)*2/7")
+    elapsed = time.perf_counter() - start
+    print(f"Calculator.calculate_expression (cached): {iterations / elapsed:10,.0f}/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
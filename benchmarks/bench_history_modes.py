@@ -0,0 +1,42 @@
+"""Measure memory per undo history entry in snapshot and delta modes.
+
+Run with: python -m benchmarks.bench_history_modes [steps]
+"""
+import sys
+import tracemalloc
+
+from src.calculator import Calculator
+
+
+def repeated_chain(calc, steps):
+    """Apply the same step over and over, as in typical repetitive sessions."""
+    for _ in range(steps):
+        calc.calculate(calc.get_result(), 1.5, '+')
+
+
+def unique_chain(calc, steps):
+    """Add a different operand at every step."""
+    for i in range(steps):
+        calc.calculate(calc.get_result(), i + 0.5, '+')
+
+
+def bytes_per_entry(history_mode, workload, steps):
+    tracemalloc.start()
+    calc = Calculator(history_mode=history_mode)
+    before, _ = tracemalloc.get_traced_memory()
+    workload(calc, steps)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / steps
+
+
+def main(steps=200_000):
+    print(f"steps={steps}")
+    for workload in (repeated_chain, unique_chain):
+        for history_mode in ("snapshot", "delta"):
+            size = bytes_per_entry(history_mode, workload, steps)
+            print(f"{workload.__name__:<16}{history_mode:<10}{size:8.1f} bytes/entry")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,55 @@
+"""Benchmark the cost of instrumentation, attached and detached.
+
+A calculator that was never instrumented runs the original methods
+untouched. A detached one runs the same methods, but CPython may have
+converted its instance dict to a slower layout when the wrappers were set
+and removed.
+
+Run with: python -m benchmarks.bench_instrumentation [operations]
+"""
+import sys
+import time
+
+from src.calculator import Calculator
+from src.instrumentation import Instrumentation
+
+
+def run(make, operations, repeat=7):
+    """Best time over repeat runs, each on a fresh calculator."""
+    best = float("inf")
+    for _ in range(repeat):
+        calc = make()
+        calculate = calc.calculate
+        start = time.perf_counter()
+        for i in range(operations):
+            calculate(i, 2.0, "*")
+            if i % 4 == 3:
+                calc.undo()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def instrumented():
+    calc = Calculator()
+    Instrumentation().attach(calc)
+    return calc
+
+
+def detached():
+    calc = Calculator()
+    stats = Instrumentation()
+    stats.attach(calc)
+    stats.detach()
+    return calc
+
+
+def main(operations=200_000):
+    print(f"operations={operations}")
+    plain = run(Calculator, operations)
+    for label, make in (("plain", Calculator), ("instrumented", instrumented), ("detached", detached)):
+        seconds = run(make, operations)
+        print(f"{label:<13} {operations / seconds:11,.0f} ops/s   ({seconds / plain:.2f}x plain time)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,52 @@
+"""Benchmark journal append throughput and recovery time.
+
+Run with: python -m benchmarks.bench_journal [operations]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from src.calculator import Calculator
+from src.journal import Journal
+
+
+def main(operations=1_000_000):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.jrnl")
+
+        plain = Calculator()
+        start = time.perf_counter()
+        for i in range(operations):
+            plain.calculate(float(i), 1.0, '+')
+        baseline = time.perf_counter() - start
+
+        with Journal(path) as journal:
+            calc = journal.recover()
+            start = time.perf_counter()
+            for i in range(operations):
+                calc.calculate(float(i), 1.0, '+')
+            journaled = time.perf_counter() - start
+
+        with Journal(path) as journal:
+            start = time.perf_counter()
+            journal.recover()
+            full_replay = time.perf_counter() - start
+            journal.checkpoint(journal._calculator)
+            for i in range(1000):
+                journal._calculator.calculate(float(i), 1.0, '+')
+
+        with Journal(path) as journal:
+            start = time.perf_counter()
+            journal.recover()
+            from_checkpoint = time.perf_counter() - start
+
+    print(f"operations={operations}")
+    print(f"calculate without journal: {operations / baseline:12,.0f} ops/s")
+    print(f"calculate with journal:    {operations / journaled:12,.0f} ops/s")
+    print(f"recover by full replay:    {full_replay * 1e3:12.1f} ms")
+    print(f"recover from checkpoint:   {from_checkpoint * 1e3:12.1f} ms (+1000 tail records)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,64 @@
+"""Benchmark write-heavy, read-rare chains: eager calculate() vs lazy chain().
+
+Each run applies a long chain of +, *, - operations to the current result
+and reads the result once every `read_every` operations.
+
+Run with: python -m benchmarks.bench_lazy [operations]
+"""
+import sys
+import time
+
+from src.calculator import Calculator
+from src.lazy import LazyCalculator
+
+STEPS = [("+", 3), ("*", 1.0000001), ("-", 1), ("*", 0.9999999)]
+
+
+def eager(operations, read_every, backend):
+    calc = Calculator(backend=backend)
+    calculate = calc.calculate
+    start = time.perf_counter()
+    for i in range(operations):
+        operator, operand = STEPS[i & 3]
+        calculate(calc.current_result, operand, operator)
+        if i % read_every == 0:
+            calc.get_result()
+    return time.perf_counter() - start
+
+
+def lazy(operations, read_every, backend):
+    calc = LazyCalculator(backend=backend)
+    chain = calc.chain
+    start = time.perf_counter()
+    for i in range(operations):
+        operator, operand = STEPS[i & 3]
+        chain(operator, operand)
+        if i % read_every == 0:
+            calc.get_result()
+    return time.perf_counter() - start
+
+
+def lazy_bulk(operations, read_every, backend):
+    calc = LazyCalculator(backend=backend)
+    steps = [STEPS[i & 3] for i in range(operations)]
+    start = time.perf_counter()
+    for begin in range(0, operations, read_every):
+        calc.chain_many(steps[begin:begin + read_every])
+        calc.get_result()
+    return time.perf_counter() - start
+
+
+def main(operations=200_000):
+    print(f"operations={operations}")
+    for backend in ("float", "decimal"):
+        for read_every in (1, 1000, operations):
+            before = eager(operations, read_every, backend)
+            after = lazy(operations, read_every, backend)
+            bulk = lazy_bulk(operations, read_every, backend)
+            print(f"{backend:<8} read every {read_every:<7} eager {operations / before:11,.0f}/s"
+                  f"   lazy {operations / after:11,.0f}/s ({before / after:.2f}x)"
+                  f"   chain_many {operations / bulk:11,.0f}/s ({before / bulk:.2f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,75 @@
+"""Benchmark macro replay against re-entering the same steps.
+
+Replays a 10-step macro from many starting values four ways: typing every
+step as a 'calc' command through main.py's command parsing, one 'play'
+command per value, calculate() once per step, and play_macro() with one
+undo entry or one per step.
+
+Run with: python -m benchmarks.bench_macro [replays]
+"""
+import sys
+import time
+
+from src.main import execute_command
+from src.variables import VariableCalculator
+
+STEPS = [("*", 1.07), ("+", 12.5), ("-", 3.0), ("/", 1.2), ("*", 0.98),
+         ("+", 0.75), ("*", 1.15), ("-", 20.0), ("/", 4.0), ("+", 1.0)]
+MACRO = " ".join(f"{operator}{operand}" for operator, operand in STEPS)
+
+
+def manual_entry(values):
+    calc = VariableCalculator()
+    for value in values:
+        calc, result = execute_command(calc, f"calc {value} {STEPS[0][0]} {STEPS[0][1]}")
+        for operator, operand in STEPS[1:]:
+            calc, result = execute_command(calc, f"calc {result} {operator} {operand}")
+
+
+def play_command(values):
+    calc = VariableCalculator()
+    calc, _ = execute_command(calc, f"macro m = {MACRO}")
+    for value in values:
+        calc, _ = execute_command(calc, f"play m {value}")
+
+
+def calculate_steps(values):
+    calc = VariableCalculator()
+    calculate = calc.calculate
+    for value in values:
+        calculate(value, STEPS[0][1], STEPS[0][0])
+        for operator, operand in STEPS[1:]:
+            calculate(calc.current_result, operand, operator)
+
+
+def play_macro(values, per_step=False):
+    calc = VariableCalculator()
+    calc.define_macro("m", STEPS)
+    play = calc.play_macro
+    for value in values:
+        play("m", value, per_step)
+
+
+def main(replays=100_000):
+    values = [float(i % 1000) for i in range(replays)]
+    runs = [
+        ("manual 'calc' entry", manual_entry),
+        ("'play' command", play_command),
+        ("calculate() per step", calculate_steps),
+        ("play_macro, per step", lambda v: play_macro(v, per_step=True)),
+        ("play_macro", play_macro),
+    ]
+
+    print(f"replays={replays} steps={len(STEPS)}")
+    baseline = None
+    for label, run in runs:
+        start = time.perf_counter()
+        run(values)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{label:<24}{elapsed:8.3f}s  {replays / elapsed:12,.0f} replays/s"
+              f"   ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
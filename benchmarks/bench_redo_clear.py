@@ -0,0 +1,53 @@
+"""Benchmark calculate-after-undo workloads (redo invalidation cost).
+
+Compares the old strategy of replacing redo_stack with a fresh Stack,
+which frees the whole redo history at once, against Stack.clear(), which
+retires it in O(1) and releases it incrementally.
+
+Run with: python -m benchmarks.bench_redo_clear [depth]
+"""
+import sys
+import time
+
+from src.calculator import Calculator
+from src.stack import Stack
+
+
+class ReallocatingCalculator(Calculator):
+    """Calculator using the previous `self.redo_stack = Stack()` strategy."""
+
+    def calculate(self, value1, value2, operator):
+        redo_stack = self.redo_stack
+        result = super().calculate(value1, value2, operator)
+        if redo_stack is self.redo_stack:
+            self.redo_stack = Stack()
+        return result
+
+
+def run(calculator_type, depth, followups):
+    """Undo depth steps, then time each of the following calculations."""
+    calc = calculator_type()
+    for i in range(depth):
+        calc.calculate(float(i), 1.0, '+')
+    for _ in range(depth):
+        calc.undo()
+
+    timings = []
+    for i in range(followups):
+        start = time.perf_counter()
+        calc.calculate(float(i), 2.0, '*')
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main(depth=1_000_000, followups=10_000):
+    print(f"redo depth={depth} followup calculations={followups}")
+    for calculator_type in (ReallocatingCalculator, Calculator):
+        timings = run(calculator_type, depth, followups)
+        print(f"{calculator_type.__name__:<24} first calc {timings[0] * 1e3:8.3f} ms"
+              f"   worst {max(timings) * 1e3:8.3f} ms"
+              f"   total {sum(timings) * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
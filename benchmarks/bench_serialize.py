@@ -0,0 +1,61 @@
+"""Benchmark binary session export/import against pickle and JSON.
+
+Run with: python -m benchmarks.bench_serialize [depth]
+"""
+import io
+import json
+import pickle
+import sys
+import time
+
+from src.calculator import Calculator
+from src.serialize import dump, dumps, load, loads
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def json_dumps(calc):
+    return json.dumps({"current": calc.current_result,
+                       "undo": calc.undo_stack.items,
+                       "redo": calc.redo_stack.items}).encode()
+
+
+def json_loads(data):
+    state = json.loads(data)
+    calc = Calculator()
+    calc.undo_stack.push_many(state["undo"])
+    calc.redo_stack.push_many(state["redo"])
+    calc.current_result = state["current"]
+    return calc
+
+
+def streamed(calc):
+    stream = io.BytesIO()
+    dump(calc, stream)
+    return stream.getvalue()
+
+
+def main(depth=1_000_000):
+    calc = Calculator()
+    for i in range(depth):
+        calc.calculate(i, 0.5, "*")
+    calc.undo(depth // 4)
+
+    print(f"depth={depth}")
+    for name, save, restore in (("pickle", pickle.dumps, pickle.loads),
+                                ("json", json_dumps, json_loads),
+                                ("binary", dumps, loads),
+                                ("binary stream", streamed, lambda data: load(io.BytesIO(data)))):
+        save_time, data = timed(save, calc)
+        load_time, copy = timed(restore, data)
+        assert copy.current_result == calc.current_result
+        print(f"{name:<14} {len(data) / 1e6:8.2f} MB   dump {save_time * 1000:8.1f} ms"
+              f"   load {load_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,65 @@
+"""Load generator for the asyncio calculator server.
+
+Starts a CalculatorServer in-process, opens many client connections that
+each drive their own sessions, and reports request latency percentiles and
+commands per second.
+
+Run with: python -m benchmarks.bench_server [sessions] [requests_per_session]
+"""
+import asyncio
+import sys
+import time
+
+from src.server import CalculatorServer
+
+COMMANDS = [b"calc 5 + 3", b"calc (3+4)*2/7", b"undo", b"redo"]
+
+# Sessions Multiplexed Over Each Client Connection
+SESSIONS_PER_CONNECTION = 10
+
+
+async def client(host, port, first_session, sessions, requests, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    for i in range(requests):
+        session = first_session + i % sessions
+        line = b"s%d %s\n" % (session, COMMANDS[i % len(COMMANDS)])
+        start = time.perf_counter()
+        writer.write(line)
+        await reader.readline()
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run(sessions, requests_per_session):
+    server = await CalculatorServer().start()
+    host, port = server.address
+    latencies = []
+
+    connections = max(1, sessions // SESSIONS_PER_CONNECTION)
+    per_connection = sessions // connections
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, c * per_connection, per_connection,
+               per_connection * requests_per_session, latencies)
+        for c in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+    await server.close()
+
+    latencies.sort()
+    print(f"sessions={len(server.store)} connections={connections} requests={len(latencies)}")
+    print(f"throughput: {len(latencies) / elapsed:10,.0f} commands/s")
+    print(f"latency p50: {percentile(latencies, 0.50) * 1e3:8.3f} ms")
+    print(f"latency p99: {percentile(latencies, 0.99) * 1e3:8.3f} ms")
+
+
+def main(sessions=2000, requests_per_session=20):
+    asyncio.run(run(sessions, requests_per_session))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
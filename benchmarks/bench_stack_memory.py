@@ -0,0 +1,56 @@
+"""Compare Stack and ArrayStack push/pop throughput and memory.
+
+Run with: python -m benchmarks.bench_stack_memory [items]
+"""
+import sys
+import time
+import tracemalloc
+
+from src.stack import ArrayStack, Stack
+
+
+def measure_memory(stack_type, values):
+    """Return bytes allocated while filling a stack with values."""
+    tracemalloc.start()
+    stack = stack_type()
+    for value in values:
+        stack.push(value * 1.0001)  # Fresh float objects, like real results
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del stack
+    return current
+
+
+def measure_throughput(stack_type, values):
+    """Return (push seconds, pop seconds) for the given values."""
+    stack = stack_type()
+    push = stack.push
+    start = time.perf_counter()
+    for value in values:
+        push(value)
+    pushed = time.perf_counter() - start
+
+    pop = stack.pop
+    start = time.perf_counter()
+    for _ in range(len(values)):
+        pop()
+    popped = time.perf_counter() - start
+    return pushed, popped
+
+
+def main(items=1_000_000):
+    values = [float(i) for i in range(items)]
+    print(f"items={items}")
+    print(f"{'stack':<12}{'bytes/item':>12}{'push/s':>16}{'pop/s':>16}")
+    baseline = None
+    for stack_type in (Stack, ArrayStack):
+        memory = measure_memory(stack_type, values)
+        pushed, popped = measure_throughput(stack_type, values)
+        baseline = baseline or memory
+        print(f"{stack_type.__name__:<12}{memory / items:>12.1f}"
+              f"{items / pushed:>16,.0f}{items / popped:>16,.0f}"
+              f"   ({baseline / memory:.1f}x smaller than Stack)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,51 @@
+"""Benchmark ThreadSafeCalculator scaling across threads.
+
+Each thread performs a mix of lock-free reads and serialized writes.
+Reports whether the interpreter is free-threaded, since only then can
+readers run in parallel.
+
+Run with: python -m benchmarks.bench_threads [operations_per_thread]
+"""
+import sys
+import threading
+import time
+
+from src.threadsafe import ThreadSafeCalculator
+
+# Reads per Write in the Mixed Workload
+READS_PER_WRITE = 9
+
+
+def worker(calc, operations):
+    get_result = calc.get_result
+    calculate = calc.calculate
+    for i in range(operations):
+        if i % (READS_PER_WRITE + 1):
+            get_result()
+        else:
+            calculate(1.0, 1.0, '+')
+
+
+def run(threads, operations):
+    calc = ThreadSafeCalculator()
+    pool = [threading.Thread(target=worker, args=(calc, operations)) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return threads * operations / (time.perf_counter() - start)
+
+
+def main(operations=200_000):
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"operations/thread={operations} free-threaded={not gil}")
+    baseline = None
+    for threads in (1, 2, 4, 8):
+        rate = run(threads, operations)
+        baseline = baseline or rate
+        print(f"threads={threads:<3}{rate:14,.0f} ops/s   ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
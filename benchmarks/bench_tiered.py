@@ -0,0 +1,76 @@
+"""Compare Stack and TieredStack history memory and deep undo latency.
+
+Run with: python -m benchmarks.bench_tiered [items]
+"""
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from src.calculator import Calculator
+from src.stack import Stack, TieredStack
+
+# (label, stack factory); cold_dir is filled in at run time
+TIERS = [
+    ("Stack", None),
+    ("hot=1024 chunk=4096", dict(hot_items=1024, chunk_items=4096)),
+    ("hot=4096 chunk=16384", dict(hot_items=4096, chunk_items=16384)),
+    ("hot=1024 chunk=4096 disk", dict(hot_items=1024, chunk_items=4096, disk=True)),
+]
+
+REWINDS = (1, 100, 10_000)
+
+
+def build(options, items, cold_dir):
+    """Return (calculator, bytes held by its history) after items calculations."""
+    if options is None:
+        stack_type = Stack
+    else:
+        options = dict(options)
+        if options.pop("disk", False):
+            options["cold_dir"] = cold_dir
+        stack_type = lambda: TieredStack(**options)  # noqa: E731
+
+    tracemalloc.start()
+    calc = Calculator(stack_type=stack_type)
+    calculate = calc.calculate
+    for i in range(items):
+        calculate(calc.current_result, 1.0001, "*" if i % 2 else "+")
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return calc, current
+
+
+def time_rewind(calc, steps, repeat=3):
+    """Return the best seconds for undo(steps), redoing after each run."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        calc.undo(steps)
+        best = min(best, time.perf_counter() - start)
+        calc.redo(steps)
+    return best
+
+
+def main(items=1_000_000):
+    print(f"items={items}")
+    header = f"{'history':<26}{'RAM B/entry':>12}"
+    header += "".join(f"{f'undo({steps:,})':>16}" for steps in REWINDS)
+    header += f"{'undo(all)':>14}"
+    print(header)
+
+    baseline = None
+    with tempfile.TemporaryDirectory() as cold_dir:
+        for label, options in TIERS:
+            calc, memory = build(options, items, cold_dir)
+            baseline = baseline or memory
+            row = f"{label:<26}{memory / items:>12.1f}"
+            for steps in REWINDS:
+                row += f"{time_rewind(calc, steps) * 1e6:>14.1f}us"
+            row += f"{time_rewind(calc, items) * 1e3:>12.1f}ms"
+            print(row + f"   ({baseline / memory:.1f}x smaller than Stack)")
+            del calc
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
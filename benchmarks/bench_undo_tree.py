@@ -0,0 +1,40 @@
+"""Benchmark multi-step jumps in the undo tree against single-step undos.
+
+Run with: python -m benchmarks.bench_undo_tree [depth]
+"""
+import sys
+import time
+
+from src.calculator import Calculator
+from src.undo_tree import BranchingCalculator
+
+
+def main(depth=1_000_000):
+    stack_calc = Calculator()
+    tree_calc = BranchingCalculator()
+    for i in range(depth):
+        stack_calc.calculate(float(i), 1.0, '+')
+        tree_calc.calculate(float(i), 1.0, '+')
+
+    start = time.perf_counter()
+    for _ in range(depth):
+        stack_calc.undo()
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tree_calc.undo(depth)
+    jump = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for version in range(0, depth, max(1, depth // 1000)):
+        tree_calc.goto(version)
+    goto = (time.perf_counter() - start) / 1000
+
+    print(f"depth={depth}")
+    print(f"{depth} single undo() calls: {loop * 1e3:10.3f} ms")
+    print(f"tree undo({depth}):          {jump * 1e3:10.3f} ms")
+    print(f"tree goto(version) average:  {goto * 1e6:10.3f} us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,62 @@
+"""Benchmark undo-history memory with thousands of variables.
+
+Compares VariableCalculator, whose undo States share a PersistentMap,
+against snapshotting a copy of a plain dict on every change, the
+O(steps * variables) approach the persistent map avoids.
+
+Run with: python -m benchmarks.bench_variables [changes]
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+from src.variables import VariableCalculator
+
+
+def traced(function):
+    """Time function untraced, then measure its peak memory under tracemalloc."""
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    keep = function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del keep
+    return elapsed, peak
+
+
+def persistent(count, changes):
+    # Each Initial let() Is Also an Undo Step, Unlike the Dict Baseline
+    calc = VariableCalculator()
+    for i in range(count):
+        calc.let(f"v{i}", float(i))
+    rng = random.Random(0)
+    for _ in range(changes):
+        calc.let(f"v{rng.randrange(count)}", rng.random())
+    return calc
+
+
+def dict_copies(count, changes):
+    variables = {f"v{i}": float(i) for i in range(count)}
+    history = []
+    rng = random.Random(0)
+    for _ in range(changes):
+        history.append(dict(variables))
+        variables[f"v{rng.randrange(count)}"] = rng.random()
+    return history
+
+
+def main(changes=1000):
+    print(f"changes={changes}")
+    for count in (1000, 5000, 20000):
+        fast_time, fast_peak = traced(lambda: persistent(count, changes))
+        slow_time, slow_peak = traced(lambda: dict_copies(count, changes))
+        print(f"variables={count:<6} persistent {fast_peak / 1e6:8.2f} MB {fast_time:6.2f}s"
+              f"   dict copies {slow_peak / 1e6:9.2f} MB {slow_time:6.2f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,69 @@
+"""Benchmark array calculations: in-place results vs copying history, and spilling.
+
+The naive baseline computes with temporaries (np.where for the zero
+policy) and stores a defensive copy of every superseded result. The
+VectorCalculator writes each result once into its own buffer and keeps
+it read-only, optionally spilling history to memory-mapped files.
+
+Run with: python -m benchmarks.bench_vector [elements] [steps]
+"""
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from src.vector import VectorCalculator
+
+
+def naive(values, divisors, steps):
+    history = [0]
+    current = values + 0
+    for _ in range(steps):
+        history.append(current.copy())
+        with np.errstate(divide="ignore", invalid="ignore"):
+            current = np.where(divisors == 0, np.nan, current / divisors)
+        history.append(current.copy())
+        current = current + 1
+    return history
+
+
+def vectorized(values, divisors, steps, **options):
+    calc = VectorCalculator(zero_policy="nan", **options)
+    current = calc.calculate(values, 0, "+")
+    for _ in range(steps):
+        current = calc.calculate(current, divisors, "/")
+        current = calc.calculate(current, 1, "+")
+    return calc
+
+
+def measure(function, *args, **options):
+    tracemalloc.start()
+    start = time.perf_counter()
+    keep = function(*args, **options)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del keep
+    return elapsed, peak
+
+
+def main(elements=1_000_000, steps=20):
+    rng = np.random.default_rng(0)
+    values = rng.random(elements)
+    divisors = rng.integers(0, 4, elements).astype(float)
+    print(f"elements={elements} steps={steps} ({values.nbytes / 1e6:.0f} MB per array)")
+
+    with tempfile.TemporaryDirectory() as spill_dir:
+        for label, function, options in (
+                ("naive copies", naive, {}),
+                ("in place", vectorized, {}),
+                ("in place + spill", vectorized, {"spill_bytes": 1 << 20, "spill_dir": spill_dir})):
+            elapsed, peak = measure(function, values, divisors, steps, **options)
+            print(f"{label:<17} {elapsed:7.3f}s   peak heap {peak / 1e6:9.1f} MB")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
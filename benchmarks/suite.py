@@ -0,0 +1,182 @@
+"""Reproducible benchmark suite with JSON results and a regression gate.
+
+Each scenario runs `repeat` times on fresh objects. The best time is
+kept, because it is the run least disturbed by the rest of the machine.
+Results are written as JSON so runs can be compared over time. Passing
+--baseline compares against an earlier results file and exits with status
+1 when any scenario is slower than the baseline by more than --threshold
+(a fraction, default 0.25).
+
+Run with:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline results.json --threshold 0.2
+"""
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from src.calculator import Calculator
+from src.main import execute_command, run_batch
+from src.stack import Stack
+
+# Results File Layout; Bump When Fields Change Meaning
+FORMAT_VERSION = 1
+
+CLI_COMMANDS = ["calc 5 + 3", "calc (3+4)*2/7", "undo", "redo", "calc 1.5 * 4"]
+
+
+def push_pop(size):
+    """size pushes followed by size pops on a bare Stack."""
+    stack = Stack()
+    push, pop = stack.push, stack.pop
+    start = time.perf_counter()
+    for i in range(size):
+        push(i)
+    for _ in range(size):
+        pop()
+    return time.perf_counter() - start, 2 * size
+
+
+def deep_history(size):
+    """size calculations into one history, tracking peak traced memory."""
+    calc = Calculator()
+    calculate = calc.calculate
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(size):
+        calculate(i, 0.5, "*")
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, size, {"peak_bytes": peak, "bytes_per_entry": peak / size}
+
+
+def undo_redo_ping_pong(size):
+    """Alternate undo and redo over a 1000-entry history."""
+    calc = Calculator()
+    for i in range(1000):
+        calc.calculate(i, 1, "+")
+    undo, redo = calc.undo, calc.redo
+    start = time.perf_counter()
+    for _ in range(size // 2):
+        undo()
+        redo()
+    return time.perf_counter() - start, size // 2 * 2
+
+
+def calculate_after_undo(size):
+    """Undo half of a deep history, then calculate, invalidating redo."""
+    calc = Calculator()
+    for i in range(size):
+        calc.calculate(i, 1, "+")
+    calc.undo(size // 2)
+    start = time.perf_counter()
+    calc.calculate(1, 1, "+")
+    for i in range(size // 2):
+        calc.calculate(i, 1, "+")
+    return time.perf_counter() - start, size // 2 + 1
+
+
+def cli_parsing(size):
+    """Dispatch size command lines through execute_command and batch mode."""
+    commands = [CLI_COMMANDS[i % len(CLI_COMMANDS)] for i in range(size)]
+    text = "".join(command + "\n" for command in commands)
+    calc = Calculator()
+    start = time.perf_counter()
+    for command in commands:
+        calc, _ = execute_command(calc, command)
+    run_batch(io.StringIO(text), io.StringIO(), io.StringIO())
+    return time.perf_counter() - start, 2 * size
+
+
+SCENARIOS = {
+    "push_pop": push_pop,
+    "deep_history": deep_history,
+    "undo_redo_ping_pong": undo_redo_ping_pong,
+    "calculate_after_undo": calculate_after_undo,
+    "cli_parsing": cli_parsing,
+}
+
+
+def run_suite(size=100_000, repeat=5, names=None):
+    """Run the scenarios and return the results as a JSON-ready dict."""
+    scenarios = {}
+    for name in names or SCENARIOS:
+        best = None
+        for _ in range(repeat):
+            elapsed, operations, *extra = SCENARIOS[name](size)
+            if best is None or elapsed < best[0]:
+                best = (elapsed, operations, extra[0] if extra else {})
+        elapsed, operations, extra = best
+        scenarios[name] = {
+            "seconds": elapsed,
+            "operations": operations,
+            "ops_per_sec": operations / elapsed if elapsed else float("inf"),
+            **extra,
+        }
+    return {
+        "format": FORMAT_VERSION,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "size": size,
+        "repeat": repeat,
+        "scenarios": scenarios,
+    }
+
+
+def compare(results, baseline, threshold=0.25):
+    """List the scenarios that slowed by more than threshold against baseline.
+
+    Returns (name, baseline_seconds, seconds, slowdown) tuples. Scenarios
+    missing from either run, or run at a different size, are not compared.
+    """
+    if baseline.get("size") != results.get("size"):
+        raise ValueError("Baseline was run with a different size")
+
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if previous is None:
+            continue
+        slowdown = current["seconds"] / previous["seconds"] - 1
+        if slowdown > threshold:
+            regressions.append((name, previous["seconds"], current["seconds"], slowdown))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", choices=sorted(SCENARIOS))
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument("--baseline", help="earlier JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.size, args.repeat, args.only)
+    for name, stats in results["scenarios"].items():
+        print(f"{name:<22} {stats['seconds']:9.4f}s  {stats['ops_per_sec']:14,.0f} ops/s")
+
+    if args.output:
+        with open(args.output, "w") as outfile:
+            json.dump(results, outfile, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as infile:
+            baseline = json.load(infile)
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, after, slowdown in regressions:
+            print(f"REGRESSION {name}: {before:.4f}s -> {after:.4f}s (+{slowdown:.0%})")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+from src.expression import NEGATE, Variable, lookup
+
+
+class FloatBackend:
+    """Plain Python arithmetic; Calculator's default, built-in code path."""
+
+    name = "float"
+    zero = 0
+
+    def convert(self, value):
+        return value
+
+    def apply(self, value1, value2, operator):
+        if operator == "+":
+            return value1 + value2
+        elif operator == "-":
+            return value1 - value2
+        elif operator == "*":
+            return value1 * value2
+        return value1 / value2
+
+
+class DecimalBackend:
+    """decimal.Decimal arithmetic under a configurable context.
+
+    Floats are converted through their shortest repr, so 0.1 becomes
+    Decimal('0.1') rather than the exact binary value of the float.
+    """
+
+    name = "decimal"
+
+    def __init__(self, context=None):
+        # Imported Here So Float-Only Sessions Do Not Pay for It at Startup
+        import decimal
+
+        self.context = context if context is not None else decimal.Context()
+        self.decimal_type = decimal.Decimal
+        self.zero = decimal.Decimal(0)
+        self.operations = {
+            "+": self.context.add,
+            "-": self.context.subtract,
+            "*": self.context.multiply,
+            "/": self.context.divide,
+        }
+
+    def convert(self, value):
+        if value.__class__ is self.decimal_type:
+            return value
+        if isinstance(value, float):
+            value = repr(value)
+        return self.context.create_decimal(value)
+
+    def apply(self, value1, value2, operator):
+        return self.operations[operator](value1, value2)
+
+
+class FractionBackend:
+    """Exact rational arithmetic with fractions.Fraction.
+
+    Floats are converted through their shortest repr, so 0.1 becomes
+    Fraction(1, 10); strings such as "1/3" are accepted too.
+    """
+
+    name = "fraction"
+
+    def __init__(self):
+        from fractions import Fraction
+
+        self.fraction_type = Fraction
+        self.zero = Fraction(0)
+
+    def convert(self, value):
+        if value.__class__ is self.fraction_type:
+            return value
+        if isinstance(value, float):
+            value = repr(value)
+        return self.fraction_type(value)
+
+    def apply(self, value1, value2, operator):
+        if operator == "+":
+            return value1 + value2
+        elif operator == "-":
+            return value1 - value2
+        elif operator == "*":
+            return value1 * value2
+        return value1 / value2
+
+
+BACKENDS = {
+    "float": FloatBackend,
+    "decimal": DecimalBackend,
+    "fraction": FractionBackend,
+}
+
+
+def get_backend(name, context=None):
+    """Create the numeric backend called name.
+
+    context is a decimal.Context and only applies to the decimal backend.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Invalid Backend: {name}")
+    if context is not None:
+        if name != "decimal":
+            raise ValueError("A context is only supported by the decimal backend")
+        return DecimalBackend(context)
+    return BACKENDS[name]()
+
+
+def evaluate_with(program, backend, variables=None):
+    """Run a compiled expression program using backend arithmetic.
+
+    variables maps names to values already in the backend's number type.
+    """
+    convert = backend.convert
+    apply = backend.apply
+    stack = []
+
+    for instruction in program:
+        if instruction.__class__ is float:
+            stack.append(convert(instruction))
+        elif instruction.__class__ is Variable:
+            stack.append(lookup(variables, instruction))
+        elif instruction == NEGATE:
+            stack[-1] = -stack[-1]
+        else:
+            value2 = stack.pop()
+            if instruction == "/" and value2 == 0:
+                raise ValueError("Cannot divide by zero")
+            stack[-1] = apply(stack[-1], value2, instruction)
+
+    return stack[0]
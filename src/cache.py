@@ -0,0 +1,126 @@
+from collections import OrderedDict
+
+# Returned by get() When a Key Is Not Cached
+MISSING = object()
+
+
+class LRUCache:
+    """A bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Get the cached value for key, or MISSING."""
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            return MISSING
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Cache value under key, evicting the least recently used entry if full."""
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        """Get hit/miss/eviction counters as a dict."""
+        return _stats(self)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class LFUCache:
+    """A bounded mapping that evicts the least frequently used entry.
+
+    Keys are grouped into per-frequency buckets kept in insertion order, so
+    get, put and eviction are all O(1); ties evict the oldest key.
+    """
+
+    def __init__(self, maxsize):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.entries = {}
+        self.buckets = {}
+        self.min_frequency = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Get the cached value for key, or MISSING."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+        self.hits += 1
+        self._touch(key, entry)
+        return entry[0]
+
+    def put(self, key, value):
+        """Cache value under key, evicting the least frequently used entry if full."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            entry[0] = value
+            self._touch(key, entry)
+            return
+
+        if len(self.entries) >= self.maxsize:
+            bucket = self.buckets[self.min_frequency]
+            evicted, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self.buckets[self.min_frequency]
+            del self.entries[evicted]
+            self.evictions += 1
+
+        self.entries[key] = [value, 1]
+        self.buckets.setdefault(1, OrderedDict())[key] = None
+        self.min_frequency = 1
+
+    def stats(self):
+        """Get hit/miss/eviction counters as a dict."""
+        return _stats(self)
+
+    def _touch(self, key, entry):
+        """Move key from its frequency bucket to the next one."""
+        frequency = entry[1]
+        bucket = self.buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[frequency]
+            if self.min_frequency == frequency:
+                self.min_frequency = frequency + 1
+        entry[1] = frequency + 1
+        self.buckets.setdefault(frequency + 1, OrderedDict())[key] = None
+
+    def __len__(self):
+        return len(self.entries)
+
+
+CACHE_POLICIES = {"lru": LRUCache, "lfu": LFUCache}
+
+
+def _stats(cache):
+    lookups = cache.hits + cache.misses
+    return {
+        "size": len(cache),
+        "maxsize": cache.maxsize,
+        "hits": cache.hits,
+        "misses": cache.misses,
+        "evictions": cache.evictions,
+        "hit_rate": cache.hits / lookups if lookups else 0.0,
+    }
@@ -1,12 +1,120 @@
-from src.stack import Stack
+from array import array
+from math import copysign
+
+from src.backends import evaluate_with, get_backend
+from src.cache import CACHE_POLICIES, MISSING
+from src.expression import compile_expression, evaluate
+from src.stack import ArrayStack, BoundedStack, Stack
+
+# NumPy Is Optional and Imported on First Batch, Keeping Startup Fast;
+# calculate_many Falls Back to Pure Python When It Is Not Installed
+NUMPY_UNLOADED = object()
+np = NUMPY_UNLOADED
+
+# Operator Codes Used by the Batch API (index into this tuple)
+OPERATORS = ("+", "-", "*", "/")
+
+# Operator That Undoes Each Operator in Delta History Mode
+INVERSE_OPERATORS = {"+": "-", "-": "+", "*": "/", "/": "*"}
+
+# Maximum Number of Distinct Delta Entries Shared Between History Steps
+DELTA_CACHE_SIZE = 4096
+
+HISTORY_MODES = ("snapshot", "delta")
+
+
+class Delta:
+    '''An undo history entry recording the applied operation, not the state.'''
+
+    __slots__ = ("operator", "operand")
+
+    def __init__(self, operator, operand):
+        self.operator = operator
+        self.operand = operand
+
+    def __repr__(self):
+        return f"Delta({self.operator!r}, {self.operand!r})"
+
 
 class Calculator:
     '''A calculator with undo/redo functionality using custom stacks.'''
 
-    def __init__(self):
-        self.undo_stack = Stack()
-        self.redo_stack = Stack()
+    def __init__(self, history_limit=None, history_bytes=None, stack_type=Stack,
+                 history_mode="snapshot", backend="float", context=None,
+                 cache_size=None, cache_policy="lru"):
+        '''Create a calculator.
+
+        history_limit caps the undo history at that many entries and
+        history_bytes caps it at a byte budget; once a cap is hit the oldest
+        entries are evicted (see undo_stack.evictions). Both default to None,
+        which keeps the history unbounded.
+
+        stack_type is the Stack class used for the history, e.g. ArrayStack
+        for a compact float64 history. A capped undo history always uses
+        BoundedStack.
+
+        history_mode is "snapshot" (the default), where each undo entry is
+        the previous result, or "delta", where a chained calculation (value1
+        is the current result) records a Delta and undo applies its inverse.
+        Delta mode falls back to a snapshot whenever the inverse would not
+        reproduce the previous result exactly, sign of zero included, e.g.
+        multiplying by zero or when floating-point rounding loses information. Delta entries are
+        objects, so delta mode needs an object stack (not ArrayStack).
+
+        backend selects the number type: "float" (the default, plain Python
+        arithmetic), "decimal" (decimal.Decimal under context, a
+        decimal.Context) or "fraction" (exact fractions.Fraction). The
+        backend is bound once here, so the float path runs unchanged code.
+        ArrayStack stores float64, so the other backends need an object stack.
+
+        cache_size enables a bounded memo of calculate() results keyed by
+        (value1, value2, operator), evicted by cache_policy ("lru" or "lfu").
+        Hits still push onto the undo stack exactly like a computed result;
+        see cache.stats() for hit/miss/eviction counters.
+        '''
+
+        if history_mode not in HISTORY_MODES:
+            raise ValueError(f"Invalid History Mode: {history_mode}")
+        if cache_policy not in CACHE_POLICIES:
+            raise ValueError(f"Invalid Cache Policy: {cache_policy}")
+
+        if history_limit is None and history_bytes is None:
+            self.undo_stack = stack_type()
+        else:
+            self.undo_stack = BoundedStack(history_limit, history_bytes)
+        self.redo_stack = stack_type()
+        if history_mode == "delta" and (
+                isinstance(self.undo_stack, ArrayStack) or isinstance(self.redo_stack, ArrayStack)):
+            raise ValueError("Delta history needs an object stack (not ArrayStack)")
         self.current_result = 0
+        self.history_mode = history_mode
+        self.macros = {}
+        self.recording = None
+        self.backend = get_backend(backend, context)
+        if self.backend.name != "float" and (
+                isinstance(self.undo_stack, ArrayStack) or isinstance(self.redo_stack, ArrayStack)):
+            raise ValueError("Decimal and fraction backends need an object stack (not ArrayStack)")
+
+        # Swap in Backend Arithmetic so the Float Path Pays Nothing
+        if backend != "float":
+            self.current_result = self.backend.zero
+            self.calculate = self._calculate_backend
+            self.calculate_expression = self._calculate_expression_backend
+
+        # Swap in the Memoized calculate() Only When a Cache Is Requested
+        self.cache = None
+        if cache_size is not None:
+            self.cache = CACHE_POLICIES[cache_policy](cache_size)
+            self._calculate_uncached = self.calculate
+            self.calculate = self._calculate_cached
+
+        # Swap in the Delta Implementations so Snapshot Mode Pays Nothing
+        if history_mode == "delta":
+            self._delta_cache = {}
+            self._calculate_base = self.calculate
+            self.calculate = self._calculate_delta
+            self.undo = self._undo_delta
+            self.redo = self._redo_delta
 
     def calculate(self, value1, value2, operator):
         '''Perform a calculation and store in undo stack.'''
@@ -22,7 +130,7 @@ class Calculator:
         self.undo_stack.push(self.current_result)
 
         # Clear Redo Stack When New Calculation is Performed
-        self.redo_stack = Stack()
+        self.redo_stack.clear()
 
         # Perform Calculation
         if operator == "+":
@@ -35,9 +143,123 @@ class Calculator:
             self.current_result = value1 / value2
 
         return self.current_result
+
+    def calculate_expression(self, expression):
+        '''Evaluate an infix expression such as "(3+4)*2/7" as one undoable step.'''
+
+        # Compile (Cached by Text) and Evaluate Before Touching History
+        result = evaluate(compile_expression(expression))
+
+        # Store Previous Result Before Calculating
+        self.undo_stack.push(self.current_result)
+
+        # Clear Redo Stack When New Calculation is Performed
+        self.redo_stack.clear()
+
+        self.current_result = result
+        return result
+
+    def calculate_many(self, values1, values2, operators):
+        '''Perform a batch of calculations given as columns.
+
+        operators holds codes indexing OPERATORS (0="+", 1="-", 2="*", 3="/").
+        Returns (results, errors): results is a float64 array and errors is a
+        boolean mask marking rows that divided by zero (their result is NaN).
+        Every valid row is recorded in the undo stack exactly as if calculate()
+        had been called for it, so undo walks back one row at a time.
+        Batches are float64 only and need the float backend.
+        '''
+
+        if self.backend.name != "float":
+            raise ValueError("calculate_many only supports the float backend")
+
+        results, errors, valid = self._calculate_batch(values1, values2, operators)
+
+        if valid:
+            # Store Previous Result and Every Intermediate Row Result
+            self.undo_stack.push(self.current_result)
+            self.undo_stack.push_many(valid[:-1])
+
+            # Clear Redo Stack When New Calculation is Performed
+            self.redo_stack.clear()
+
+            self.current_result = valid[-1]
+
+        return results, errors
+
+    @staticmethod
+    def _calculate_batch(values1, values2, operators):
+        '''Run the batch kernel; returns (results, errors, valid results list).'''
+
+        if np is NUMPY_UNLOADED:
+            _load_numpy()
+
+        if np is not None:
+            results, errors = Calculator._calculate_many_numpy(values1, values2, operators)
+            return results, errors, results[~errors].tolist()
+
+        results, errors = Calculator._calculate_many_python(values1, values2, operators)
+        return results, errors, [r for r, e in zip(results, errors) if not e]
+
+    @staticmethod
+    def _calculate_many_numpy(values1, values2, operators):
+        '''Vectorized batch kernel used when NumPy is available.'''
+
+        v1 = np.asarray(values1, dtype=np.float64)
+        v2 = np.asarray(values2, dtype=np.float64)
+        ops = np.asarray(operators)
+
+        if not v1.shape == v2.shape == ops.shape or v1.ndim != 1:
+            raise ValueError("Batch columns must be 1-D and of equal length")
+        if ops.size and (ops.min() < 0 or ops.max() >= len(OPERATORS)):
+            raise ValueError("Invalid Operator code in batch")
+
+        divide = ops == 3
+        errors = divide & (v2 == 0)
+
+        results = np.full(v1.shape, np.nan)
+        np.add(v1, v2, out=results, where=ops == 0)
+        np.subtract(v1, v2, out=results, where=ops == 1)
+        np.multiply(v1, v2, out=results, where=ops == 2)
+        np.divide(v1, v2, out=results, where=divide & ~errors)
+
+        return results, errors
+
+    @staticmethod
+    def _calculate_many_python(values1, values2, operators):
+        '''Row-at-a-time fallback used when NumPy is not installed.'''
+
+        if not len(values1) == len(values2) == len(operators):
+            raise ValueError("Batch columns must be 1-D and of equal length")
+
+        results = array("d")
+        errors = []
+        nan = float("nan")
+
+        for value1, value2, code in zip(values1, values2, operators):
+            if code == 0:
+                results.append(value1 + value2)
+            elif code == 1:
+                results.append(value1 - value2)
+            elif code == 2:
+                results.append(value1 * value2)
+            elif code == 3:
+                if value2 == 0:
+                    results.append(nan)
+                    errors.append(True)
+                    continue
+                results.append(value1 / value2)
+            else:
+                raise ValueError(f"Invalid Operator code in batch: {code}")
+            errors.append(False)
+
+        return results, errors
     
-    def undo(self):
-        '''Undo the last calculation.'''
+    def undo(self, steps=1):
+        '''Undo the last calculation, or the last steps calculations.'''
+
+        if steps != 1:
+            return self._undo_many(steps)
 
         if self.undo_stack.isEmpty():
             raise IndexError("No operations to undo")
@@ -50,8 +272,11 @@ class Calculator:
 
         return self.current_result
     
-    def redo(self):
-        '''Redo the last undone calculation.'''
+    def redo(self, steps=1):
+        '''Redo the last undone calculation, or the last steps of them.'''
+
+        if steps != 1:
+            return self._redo_many(steps)
 
         if self.redo_stack.isEmpty():
             raise IndexError("Cannot redo when redo stack is empty")
@@ -64,8 +289,306 @@ class Calculator:
 
         return self.current_result
     
+    def undo_to(self, predicate):
+        '''Undo back to the most recent earlier result satisfying predicate.'''
+
+        for steps, value in enumerate(self._undo_values(), 1):
+            if predicate(value):
+                return self.undo(steps)
+        raise IndexError("No earlier result matches")
+
     def get_result(self):
         '''Get the current result without modifying state.'''
 
         return self.current_result
-        
\ No newline at end of file
+
+    def define_macro(self, name, steps):
+        '''Define macro name from (operator, operand) steps, compiling it for replay.'''
+
+        from src.macro import Macro
+
+        macro = Macro(name, steps, self.backend)
+        self.macros[name] = macro
+        return macro
+
+    def record_macro(self, name):
+        '''Start recording calculate() calls as the steps of macro name.
+
+        The first recorded call may start from any value1; later calls must
+        continue from the current result. stop_recording() defines the macro.
+        '''
+
+        if self.recording is not None:
+            raise ValueError(f"Already recording macro: {self.recording[0]}")
+
+        self.recording = (name, [])
+        self._calculate_unrecorded = self.calculate
+        self.calculate = self._calculate_recording
+
+    def stop_recording(self):
+        '''Stop recording and define the recorded macro, which is returned.'''
+
+        if self.recording is None:
+            raise ValueError("Not recording a macro")
+
+        name, steps = self.recording
+        self.recording = None
+
+        # Drop the Swap, Restoring Any calculate() Swapped In by __init__
+        del self.calculate
+        if self.calculate != self._calculate_unrecorded:
+            self.calculate = self._calculate_unrecorded
+        del self._calculate_unrecorded
+        return self.define_macro(name, steps)
+
+    def play_macro(self, name, value=None, per_step=False):
+        '''Replay macro name from value (default: the current result).
+
+        The whole replay is one undoable step, or one step per macro step
+        when per_step is true, exactly as if calculate() had run each step.
+        '''
+
+        macro = self._macro(name)
+        value = self.current_result if value is None else self.backend.convert(value)
+
+        if per_step:
+            values = macro.run_steps(value)
+            self.undo_stack.push(self.current_result)
+            self.undo_stack.push_many(values[1:-1])
+            result = values[-1]
+        else:
+            result = macro.run(value)
+            self.undo_stack.push(self.current_result)
+
+        self.redo_stack.clear()
+
+        self.current_result = result
+        return result
+
+    def _undo_many(self, steps):
+        '''Undo steps calculations by moving one slice between the stacks.'''
+
+        if steps < 1:
+            raise ValueError("steps must be at least 1")
+        if steps > self.undo_stack.size():
+            raise IndexError("No operations to undo")
+
+        # The Deepest Taken Entry Becomes Current; the Rest Move to Redo
+        taken = self.undo_stack.pop_many(steps)
+        self.redo_stack.push(self.current_result)
+        self.redo_stack.push_many(taken[:0:-1])
+        self.current_result = taken[0]
+
+        return self.current_result
+
+    def _redo_many(self, steps):
+        '''Redo steps calculations by moving one slice between the stacks.'''
+
+        if steps < 1:
+            raise ValueError("steps must be at least 1")
+        if steps > self.redo_stack.size():
+            raise IndexError("Cannot redo when redo stack is empty")
+
+        taken = self.redo_stack.pop_many(steps)
+        self.undo_stack.push(self.current_result)
+        self.undo_stack.push_many(taken[:0:-1])
+        self.current_result = taken[0]
+
+        return self.current_result
+
+    def _undo_values(self):
+        '''Yield the earlier results from the most recent backwards.'''
+
+        value = self.current_result
+        for entry in reversed(self.undo_stack.items):
+            if isinstance(entry, Delta):
+                value = self._apply(value, entry.operand, INVERSE_OPERATORS[entry.operator])
+            else:
+                value = entry
+            yield value
+
+    def _calculate_backend(self, value1, value2, operator):
+        '''calculate() for the decimal and fraction backends.'''
+
+        # Validate Inputs
+        if operator not in ["+", "-", "*", "/"]:
+            raise ValueError(f"Invalid Operator: {operator}")
+
+        value1 = self.backend.convert(value1)
+        value2 = self.backend.convert(value2)
+
+        if operator == "/" and value2 == 0:
+            raise ValueError("Cannot divide by zero")
+
+        result = self.backend.apply(value1, value2, operator)
+
+        # Store Previous Result Before Calculating
+        self.undo_stack.push(self.current_result)
+
+        # Clear Redo Stack When New Calculation is Performed
+        self.redo_stack.clear()
+
+        self.current_result = result
+        return result
+
+    def _macro(self, name):
+        '''Get macro name or raise ValueError.'''
+
+        macro = self.macros.get(name)
+        if macro is None:
+            raise ValueError(f"Unknown macro: {name}")
+        return macro
+
+    def _calculate_recording(self, value1, value2, operator):
+        '''calculate() while a macro is being recorded.'''
+
+        steps = self.recording[1]
+        if steps and value1 != self.current_result:
+            raise ValueError("Macro steps must continue from the current result")
+
+        result = self._calculate_unrecorded(value1, value2, operator)
+        steps.append((operator, value2))
+        return result
+
+    def _calculate_cached(self, value1, value2, operator):
+        '''calculate() with result memoization.'''
+
+        # Zeros Bypass the Cache: 0.0 == -0.0 Would Share Entries With Different Signs
+        if not value1 or not value2:
+            return self._calculate_uncached(value1, value2, operator)
+
+        # Types Are Part of the Key Because 1 == 1.0 == Decimal(1) Hash Alike
+        key = (value1, value2, operator, value1.__class__, value2.__class__)
+        result = self.cache.get(key)
+        if result is MISSING:
+            result = self._calculate_uncached(value1, value2, operator)
+            self.cache.put(key, result)
+            return result
+
+        # Record the Cached Result Exactly Like a Computed One
+        self.undo_stack.push(self.current_result)
+        self.redo_stack.clear()
+        self.current_result = result
+        return result
+
+    def _calculate_expression_backend(self, expression):
+        '''calculate_expression() for the decimal and fraction backends.'''
+
+        result = evaluate_with(compile_expression(expression), self.backend)
+
+        self.undo_stack.push(self.current_result)
+        self.redo_stack.clear()
+
+        self.current_result = result
+        return result
+
+    @staticmethod
+    def _apply(value1, value2, operator):
+        '''Compute value1 <operator> value2 for an already validated operator.'''
+
+        if operator == "+":
+            return value1 + value2
+        elif operator == "-":
+            return value1 - value2
+        elif operator == "*":
+            return value1 * value2
+        return value1 / value2
+
+    def _calculate_delta(self, value1, value2, operator):
+        '''calculate() for delta history mode.'''
+
+        previous = self.current_result
+        result = self._calculate_base(value1, value2, operator)
+        value1 = self.backend.convert(value1)
+        value2 = self.backend.convert(value2)
+
+        # Replace the Snapshot With a Delta When Undo Can Be Replayed Exactly
+        if _identical(value1, previous) and value2 != 0:
+            inverse = INVERSE_OPERATORS[operator]
+            if _identical(self._apply(result, value2, inverse), previous):
+                self.undo_stack.pop()
+                self.undo_stack.push(self._delta(operator, value2))
+
+        return result
+
+    def _delta(self, operator, operand):
+        '''Get a shared Delta entry so repeated operations cost one pointer.'''
+
+        key = (operator, operand)
+        delta = self._delta_cache.get(key)
+        if delta is None:
+            delta = Delta(operator, operand)
+            if len(self._delta_cache) < DELTA_CACHE_SIZE:
+                self._delta_cache[key] = delta
+        return delta
+
+    def _undo_delta(self, steps=1):
+        '''undo() for delta history mode.'''
+
+        if steps != 1:
+            # Deltas Must Be Replayed One by One, After an All-or-Nothing Check
+            if steps < 1:
+                raise ValueError("steps must be at least 1")
+            if steps > self.undo_stack.size():
+                raise IndexError("No operations to undo")
+            for _ in range(steps):
+                self._undo_delta()
+            return self.current_result
+
+        if self.undo_stack.isEmpty():
+            raise IndexError("No operations to undo")
+
+        entry = self.undo_stack.pop()
+
+        if isinstance(entry, Delta):
+            # Replay the Inverse Operation; Redo Reapplies the Same Delta
+            self.redo_stack.push(entry)
+            inverse = INVERSE_OPERATORS[entry.operator]
+            self.current_result = self._apply(self.current_result, entry.operand, inverse)
+        else:
+            self.redo_stack.push(self.current_result)
+            self.current_result = entry
+
+        return self.current_result
+
+    def _redo_delta(self, steps=1):
+        '''redo() for delta history mode.'''
+
+        if steps != 1:
+            if steps < 1:
+                raise ValueError("steps must be at least 1")
+            if steps > self.redo_stack.size():
+                raise IndexError("Cannot redo when redo stack is empty")
+            for _ in range(steps):
+                self._redo_delta()
+            return self.current_result
+
+        if self.redo_stack.isEmpty():
+            raise IndexError("Cannot redo when redo stack is empty")
+
+        entry = self.redo_stack.pop()
+
+        if isinstance(entry, Delta):
+            self.undo_stack.push(entry)
+            self.current_result = self._apply(self.current_result, entry.operand, entry.operator)
+        else:
+            self.undo_stack.push(self.current_result)
+            self.current_result = entry
+
+        return self.current_result
+
+
+def _identical(a, b):
+    """a == b, but also telling 0.0 and -0.0 apart."""
+    return a == b and (a != 0 or copysign(1, a) == copysign(1, b))
+
+
+def _load_numpy():
+    """Import NumPy into this module, or record that it is missing."""
+    global np
+    try:
+        import numpy
+    except ImportError:
+        np = None
+    else:
+        np = numpy
@@ -0,0 +1,168 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from src.calculator import OPERATORS, Calculator
+from src.stack import ArrayStack
+
+# Shards Handed to Each Worker, so Uneven Chains Still Balance Out
+SHARDS_PER_WORKER = 4
+
+OPERATOR_CODES = {operator: code for code, operator in enumerate(OPERATORS)}
+
+
+class ChainLayout:
+    """Offsets of the packed arrays inside the shared input/output blocks.
+
+    Input block:  starts (float64 x chains) | offsets (int64 x chains+1) |
+                  operands (float64 x steps) | operator codes (int8 x steps)
+    Output block: results (float64 x chains) | histories (float64 x steps) |
+                  error flags (int8 x chains)
+    """
+
+    def __init__(self, chains, steps, with_history):
+        self.chains = chains
+        self.steps = steps
+        self.with_history = with_history
+
+        self.starts = 0
+        self.offsets = self.starts + 8 * chains
+        self.operands = self.offsets + 8 * (chains + 1)
+        self.codes = self.operands + 8 * steps
+        self.input_size = self.codes + steps
+
+        self.results = 0
+        self.histories = self.results + 8 * chains
+        self.errors = self.histories + (8 * steps if with_history else 0)
+        self.output_size = self.errors + chains
+
+
+def run_chains(starts, chains, workers=None, with_history=False):
+    """Run independent calculation chains, sharded across worker processes.
+
+    chains[i] is a sequence of (operator, operand) steps applied to starts[i]
+    one after another, each as a Calculator.calculate(result, operand,
+    operator) call on the chain's own Calculator. Inputs and outputs travel
+    through shared memory as packed arrays instead of pickled objects.
+
+    Returns (results, errors, histories): results is an array('d') of final
+    values, errors an array('b') flagging chains that failed (their result
+    is NaN), and histories, when with_history is set, a list holding each
+    chain's undo stack as an array('d') (partial for failed chains).
+    workers=0 runs everything in this process.
+    """
+    if len(starts) != len(chains):
+        raise ValueError("Need one start value per chain")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    # Pack Inputs Once; Workers Attach Instead of Unpickling
+    offsets = array("q", [0])
+    operands = array("d")
+    codes = array("b")
+    for chain in chains:
+        for operator, operand in chain:
+            if operator not in OPERATOR_CODES:
+                raise ValueError(f"Invalid Operator: {operator}")
+            codes.append(OPERATOR_CODES[operator])
+            operands.append(operand)
+        offsets.append(len(codes))
+
+    layout = ChainLayout(len(chains), len(codes), with_history)
+    inputs = shared_memory.SharedMemory(create=True, size=max(layout.input_size, 1))
+    outputs = shared_memory.SharedMemory(create=True, size=max(layout.output_size, 1))
+
+    try:
+        buffer = inputs.buf
+        buffer[layout.starts:layout.offsets] = array("d", starts).tobytes()
+        buffer[layout.offsets:layout.operands] = offsets.tobytes()
+        buffer[layout.operands:layout.codes] = operands.tobytes()
+        buffer[layout.codes:layout.input_size] = codes.tobytes()
+
+        shards = _shards(layout.chains, max(workers, 1) * SHARDS_PER_WORKER)
+        if workers == 0:
+            for begin, end in shards:
+                _run_chains(inputs.buf, outputs.buf, layout, begin, end)
+        else:
+            with ProcessPoolExecutor(workers) as pool:
+                jobs = [pool.submit(_run_shard, inputs.name, outputs.name, layout, begin, end)
+                        for begin, end in shards]
+                for job in jobs:
+                    job.result()
+
+        # Copy Results Out Before the Shared Blocks Are Released
+        out = outputs.buf
+        results = _unpack("d", out[layout.results:layout.histories])
+        errors = _unpack("b", out[layout.errors:layout.output_size])
+        histories = None
+        if with_history:
+            history = _unpack("d", out[layout.histories:layout.errors])
+            histories = [history[offsets[i]:offsets[i + 1]] for i in range(layout.chains)]
+        del buffer, out
+    finally:
+        inputs.close()
+        inputs.unlink()
+        outputs.close()
+        outputs.unlink()
+
+    return results, errors, histories
+
+
+def _unpack(typecode, data):
+    """Copy packed bytes into a new array of the given type."""
+    values = array(typecode)
+    values.frombytes(data)
+    return values
+
+
+def _shards(count, pieces):
+    """Split range(count) into at most pieces contiguous (begin, end) ranges."""
+    size = max(1, -(-count // pieces))
+    return [(begin, min(begin + size, count)) for begin in range(0, count, size)]
+
+
+def _run_shard(inputs_name, outputs_name, layout, begin, end):
+    """Worker entry point: attach to the shared blocks and run one shard."""
+    # Pool Workers Share the Parent's Resource Tracker, So the Parent's
+    # unlink() Is the Only Cleanup Needed
+    inputs = shared_memory.SharedMemory(name=inputs_name)
+    outputs = shared_memory.SharedMemory(name=outputs_name)
+    try:
+        _run_chains(inputs.buf, outputs.buf, layout, begin, end)
+    finally:
+        inputs.close()
+        outputs.close()
+
+
+def _run_chains(source, target, layout, begin, end):
+    """Run chains begin..end, reading source and writing target in place."""
+    starts = source[layout.starts:layout.offsets].cast("d")
+    offsets = source[layout.offsets:layout.operands].cast("q")
+    operands = source[layout.operands:layout.codes].cast("d")
+    codes = source[layout.codes:layout.input_size].cast("b")
+    results = target[layout.results:layout.histories].cast("d")
+    histories = target[layout.histories:layout.errors].cast("d")
+    errors = target[layout.errors:layout.output_size].cast("b")
+
+    try:
+        for chain in range(begin, end):
+            calc = Calculator(stack_type=ArrayStack)
+            calculate = calc.calculate
+            result = starts[chain]
+            first, last = offsets[chain], offsets[chain + 1]
+            try:
+                for step in range(first, last):
+                    result = calculate(result, operands[step], OPERATORS[codes[step]])
+            except ValueError:
+                result = float("nan")
+                errors[chain] = 1
+
+            results[chain] = result
+            if layout.with_history:
+                history = calc.undo_stack.items
+                histories[first:first + len(history)] = history
+    finally:
+        # Views Must Be Released Before the Shared Blocks Can Close
+        for view in (starts, offsets, operands, codes, results, histories, errors):
+            view.release()
@@ -0,0 +1,163 @@
+import re
+from functools import lru_cache
+
+from src.cache import MISSING
+
+# Binding Strength of Each Binary Operator
+PRECEDENCE = {"+": 1, "-": 1, "*": 2, "/": 2}
+
+# Unary Minus Instruction in Compiled Programs
+NEGATE = "neg"
+
+# Number of Compiled Expressions Kept in the Cache
+CACHE_SIZE = 1024
+
+NUMBER = r"\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?"
+NAME = r"[A-Za-z_]\w*"
+TOKEN = re.compile(rf"\s*(?:({NUMBER})|({NAME})|(\S))")
+
+# The Common 'number' and 'number op number' Forms, Compiled Without Parsing
+SIMPLE = re.compile(rf"\s*({NUMBER})\s*(?:([-+*/])\s*({NUMBER})\s*)?")
+
+
+class Variable:
+    """A named operand in a compiled program, looked up when evaluated."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __eq__(self, other):
+        return isinstance(other, Variable) and other.name == self.name
+
+    def __hash__(self):
+        return hash(self.name)
+
+    def __repr__(self):
+        return f"Variable({self.name!r})"
+
+
+def tokenize(text):
+    """Split an infix expression into number, variable and symbol tokens."""
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = TOKEN.match(text, position)
+        number, name, symbol = match.groups()
+        if number is not None:
+            tokens.append(float(number))
+        elif name is not None:
+            tokens.append(Variable(name))
+        elif symbol in PRECEDENCE or symbol in "()":
+            tokens.append(symbol)
+        else:
+            raise ValueError(f"Invalid Operator: {symbol}")
+        position = match.end()
+    return tokens
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(text):
+    """Compile an infix expression into a postfix program.
+
+    The program is a tuple of instructions: a float pushes itself, a
+    Variable pushes its value, an operator symbol pops two values and
+    pushes the result, and NEGATE negates the top value. Programs are
+    cached by expression text, so a repeated expression skips tokenizing
+    and parsing entirely.
+    """
+    simple = SIMPLE.fullmatch(text)
+    if simple is not None:
+        number1, operator, number2 = simple.groups()
+        if operator is None:
+            return (float(number1),)
+        return (float(number1), float(number2), operator)
+
+    program = []
+    operators = []
+    expect_operand = True
+
+    for token in tokenize(text):
+        if token.__class__ is float or token.__class__ is Variable:
+            if not expect_operand:
+                raise ValueError(f"Invalid expression: {text!r}")
+            program.append(token)
+            expect_operand = False
+        elif token == "(":
+            if not expect_operand:
+                raise ValueError(f"Invalid expression: {text!r}")
+            operators.append(token)
+        elif token == ")":
+            if expect_operand:
+                raise ValueError(f"Invalid expression: {text!r}")
+            while operators and operators[-1] != "(":
+                program.append(operators.pop())
+            if not operators:
+                raise ValueError(f"Unbalanced parentheses: {text!r}")
+            operators.pop()
+        elif expect_operand:
+            # A Sign Where an Operand Is Expected Is Unary
+            if token == "-":
+                operators.append(NEGATE)
+            elif token != "+":
+                raise ValueError(f"Invalid expression: {text!r}")
+        else:
+            # Pop Operators That Bind at Least as Tightly (Left Associative)
+            while operators and operators[-1] != "(" and (
+                    operators[-1] == NEGATE or PRECEDENCE[operators[-1]] >= PRECEDENCE[token]):
+                program.append(operators.pop())
+            operators.append(token)
+            expect_operand = True
+
+    if expect_operand:
+        raise ValueError(f"Invalid expression: {text!r}")
+
+    while operators:
+        operator = operators.pop()
+        if operator == "(":
+            raise ValueError(f"Unbalanced parentheses: {text!r}")
+        program.append(operator)
+
+    return tuple(program)
+
+
+def evaluate(program, variables=None):
+    """Run a compiled postfix program and return its value.
+
+    variables maps names to values for programs that use Variables.
+    """
+    stack = []
+    push = stack.append
+    pop = stack.pop
+
+    for instruction in program:
+        if instruction.__class__ is float:
+            push(instruction)
+        elif instruction.__class__ is Variable:
+            push(lookup(variables, instruction))
+        elif instruction == NEGATE:
+            stack[-1] = -stack[-1]
+        else:
+            value2 = pop()
+            if instruction == "+":
+                stack[-1] += value2
+            elif instruction == "-":
+                stack[-1] -= value2
+            elif instruction == "*":
+                stack[-1] *= value2
+            else:
+                if value2 == 0:
+                    raise ValueError("Cannot divide by zero")
+                stack[-1] /= value2
+
+    return stack[0]
+
+
+def lookup(variables, variable):
+    """Get the value of variable, raising ValueError if it is not defined."""
+    value = variables.get(variable.name, MISSING) if variables is not None else MISSING
+    if value is MISSING:
+        raise ValueError(f"Unknown variable: {variable.name}")
+    return value
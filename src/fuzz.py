@@ -0,0 +1,353 @@
+"""Seeded random operation sequences for checking and loading a Calculator.
+
+generate() yields a reproducible mix of calc/chain/undo/redo/clear
+operations.
+check() replays it against a calculator and a simple reference model and
+raises FuzzFailure, with a shrunk sequence that still fails, as soon as
+they disagree. throughput() replays the same kind of sequence without the
+model and reports ops/sec and peak traced memory.
+
+Run with:
+    python -m src.fuzz --count 1000000 --seed 7
+    python -m src.fuzz --check --calculator delta --ratios calc=5,undo=3,redo=2,clear=0.1
+"""
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+
+from src.calculator import OPERATORS, Calculator
+from src.lazy import LazyCalculator
+from src.stack import ArrayStack, TieredStack
+from src.variables import VariableCalculator
+
+# Relative Weights of Each Operation Kind
+DEFAULT_RATIOS = {"calc": 0.45, "chain": 0.15, "undo": 0.2, "redo": 0.15, "clear": 0.05}
+
+# Chance a calc Continues From the Current Result, and of a Zero Operand
+CHAIN_CHANCE = 0.8
+ZERO_CHANCE = 0.05
+
+# Most Failing Sequences Tried While Shrinking
+SHRINK_TRIALS = 2000
+
+# Calculator Configurations Selectable From the Command Line
+CALCULATORS = {
+    "snapshot": Calculator,
+    "delta": lambda: Calculator(history_mode="delta"),
+    "array": lambda: Calculator(stack_type=ArrayStack),
+    "bounded": lambda: Calculator(history_limit=1000),
+    "tiered": lambda: Calculator(stack_type=TieredStack),
+    "decimal": lambda: Calculator(backend="decimal"),
+    "variables": VariableCalculator,
+    "lazy": LazyCalculator,
+}
+
+
+class FuzzFailure(AssertionError):
+    """A calculator disagreed with the reference model.
+
+    operations is the shortest failing sequence found; replaying it from a
+    fresh calculator reproduces the failure at its last operation.
+    """
+
+    def __init__(self, message, seed, index, operations):
+        super().__init__(message)
+        self.seed = seed
+        self.index = index
+        self.operations = operations
+
+
+class Model:
+    """Reference undo/redo: every result in a list, and a cursor into it.
+
+    Undo and redo only move the cursor; a calculation drops everything
+    after the cursor and appends. history_limit, like Calculator's, keeps
+    at most that many earlier results.
+    """
+
+    def __init__(self, backend, history_limit=None):
+        self.backend = backend
+        self.history_limit = history_limit
+        self.results = [backend.zero]
+        self.position = 0
+
+    def get_result(self):
+        return self.results[self.position]
+
+    def calculate(self, value1, value2, operator):
+        if operator not in OPERATORS:
+            raise ValueError(f"Invalid Operator: {operator}")
+        if operator == "/" and value2 == 0:
+            raise ValueError("Cannot divide by zero")
+
+        convert = self.backend.convert
+        result = self.backend.apply(convert(value1), convert(value2), operator)
+        del self.results[self.position + 1:]
+        self.results.append(result)
+        self.position += 1
+
+        if self.history_limit is not None and self.position > self.history_limit:
+            del self.results[0]
+            self.position -= 1
+        return result
+
+    def undo(self, steps=1):
+        if steps > self.position:
+            raise IndexError("No operations to undo")
+        self.position -= steps
+        return self.get_result()
+
+    def redo(self, steps=1):
+        if steps > len(self.results) - 1 - self.position:
+            raise IndexError("Cannot redo when redo stack is empty")
+        self.position += steps
+        return self.get_result()
+
+
+def parse_ratios(text):
+    """Parse "calc=6,undo=2,..." into a ratios dict; missing kinds get 0."""
+    ratios = dict.fromkeys(DEFAULT_RATIOS, 0.0)
+    for part in text.split(","):
+        kind, equals, weight = part.partition("=")
+        kind = kind.strip()
+        if not equals or kind not in ratios:
+            raise ValueError(f"Invalid ratio: {part.strip()}")
+        ratios[kind] = float(weight)
+    return ratios
+
+
+def generate(seed, count, ratios=None, max_steps=4):
+    """Yield count reproducible operations.
+
+    Operations are ("calc", value1, value2, operator), where value1 None
+    means the current result, ("chain", operand, operator), a deferred
+    operation on the current result (LazyCalculator.chain, or calculate()
+    for calculators without chain), ("undo", steps), ("redo", steps) and
+    ("clear",), which starts a fresh calculator as the CLI does. ratios
+    weights the kinds (default DEFAULT_RATIOS); undo and redo take
+    1 to max_steps steps and may ask for more than the history holds.
+    """
+    ratios = DEFAULT_RATIOS if ratios is None else ratios
+    for kind in ratios:
+        if kind not in DEFAULT_RATIOS:
+            raise ValueError(f"Invalid operation kind: {kind}")
+    kinds = list(ratios)
+    weights = [ratios[kind] for kind in kinds]
+    if min(weights) < 0 or sum(weights) <= 0:
+        raise ValueError("Ratios must be non-negative and not all zero")
+
+    rng = random.Random(seed)
+    random_value = rng.random
+    for kind in rng.choices(kinds, weights, k=count):
+        if kind == "calc":
+            value1 = None if random_value() < CHAIN_CHANCE else _operand(rng)
+            value2 = 0 if random_value() < ZERO_CHANCE else _operand(rng)
+            yield ("calc", value1, value2, OPERATORS[rng.randrange(4)])
+        elif kind == "chain":
+            operand = 0 if random_value() < ZERO_CHANCE else _operand(rng)
+            yield ("chain", operand, OPERATORS[rng.randrange(4)])
+        elif kind == "clear":
+            yield ("clear",)
+        else:
+            steps = 1 if random_value() < 0.75 else rng.randint(1, max_steps)
+            yield (kind, steps)
+
+
+def _operand(rng):
+    """A small int or two-decimal float, never zero."""
+    if rng.random() < 0.3:
+        return rng.choice((-3, -2, -1, 1, 2, 3, 10))
+    return rng.choice((-1, 1)) * round(rng.uniform(0.01, 10), 2)
+
+
+def execute(calc, operation, factory):
+    """Apply one operation; return (calculator, result)."""
+    kind = operation[0]
+    if kind == "calc":
+        _, value1, value2, operator = operation
+        if value1 is None:
+            value1 = calc.get_result()
+        return calc, calc.calculate(value1, value2, operator)
+    if kind == "chain":
+        _, operand, operator = operation
+        chain = getattr(calc, "chain", None)
+        if chain is None:
+            return calc, calc.calculate(calc.get_result(), operand, operator)
+        chain(operator, operand)
+        return calc, calc.get_result()
+    if kind == "undo":
+        return calc, calc.undo(operation[1])
+    if kind == "redo":
+        return calc, calc.redo(operation[1])
+    calc = factory()
+    return calc, calc.get_result()
+
+
+def check(factory=Calculator, seed=0, count=10_000, ratios=None, max_steps=4):
+    """Replay a generated sequence against factory() and the model.
+
+    After every operation the result, or the error type (ValueError or
+    IndexError), and get_result() must match. Raises FuzzFailure on the
+    first difference and returns the number of operations checked.
+    """
+    operations = list(generate(seed, count, ratios, max_steps))
+    index = _first_mismatch(operations, factory)
+    if index is None:
+        return count
+
+    failing = shrink(operations[:index + 1], factory)
+    calc, model = _replay(failing[:-1], factory)
+    calc_outcome = _outcome(calc, failing[-1], factory)[1]
+    model_outcome = _outcome(model, failing[-1], _model_factory(calc))[1]
+    raise FuzzFailure(
+        f"seed {seed}: operation {index} {operations[index]!r}: "
+        f"calculator gave {calc_outcome!r}, model gave {model_outcome!r}; "
+        f"shrunk to {len(failing)} operations: {failing!r}",
+        seed, index, failing)
+
+
+def shrink(operations, factory):
+    """Remove operations while the sequence still fails at its last one.
+
+    Tries dropping ever smaller runs of operations, keeping each removal
+    that still fails, for at most SHRINK_TRIALS replays.
+    """
+    trials = 0
+    chunk = max(len(operations) // 2, 1)
+    while trials < SHRINK_TRIALS:
+        start = 0
+        while start < len(operations) - 1 and trials < SHRINK_TRIALS:
+            # The Failing Last Operation Is Always Kept
+            candidate = operations[:start] + operations[min(start + chunk, len(operations) - 1):]
+            trials += 1
+            index = _first_mismatch(candidate, factory)
+            if index is not None:
+                operations = candidate[:index + 1]
+            else:
+                start += chunk
+        if chunk == 1:
+            break
+        chunk //= 2
+    return operations
+
+
+def throughput(factory=Calculator, seed=0, count=1_000_000, ratios=None, max_steps=4,
+               trace_memory=True):
+    """Time a generated sequence on factory() without the model.
+
+    The sequence is generated before timing starts. Returns ops, seconds,
+    ops_per_sec, errors (operations that raised ValueError or IndexError)
+    and depth (final undo history size). With trace_memory the run is
+    repeated under tracemalloc, which is several times slower, to add
+    peak_bytes.
+    """
+    operations = list(generate(seed, count, ratios, max_steps))
+
+    start = time.perf_counter()
+    calc, errors = _run(operations, factory)
+    seconds = time.perf_counter() - start
+    stats = {
+        "ops": count,
+        "seconds": seconds,
+        "ops_per_sec": count / seconds if seconds else float("inf"),
+        "errors": errors,
+        "depth": calc.undo_stack.size(),
+    }
+    del calc
+
+    if trace_memory:
+        tracemalloc.start()
+        calc, _ = _run(operations, factory)
+        stats["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return stats
+
+
+def _run(operations, factory):
+    calc = factory()
+    errors = 0
+    for operation in operations:
+        try:
+            calc, _ = execute(calc, operation, factory)
+        except (ValueError, IndexError):
+            errors += 1
+    return calc, errors
+
+
+def _model_factory(calc):
+    limit = getattr(calc.undo_stack, "max_items", None)
+    backend = calc.backend
+    return lambda: Model(backend, limit)
+
+
+def _outcome(target, operation, factory):
+    """Apply operation; return (target, result or exception type, current result)."""
+    try:
+        target, result = execute(target, operation, factory)
+    except Exception as e:
+        # Any Other Exception Type Is a Crash the Model Never Matches
+        result = type(e)
+    return target, result, target.get_result()
+
+
+def _replay(operations, factory):
+    calc = factory()
+    model = _model_factory(calc)()
+    for operation in operations:
+        calc = _outcome(calc, operation, factory)[0]
+        model = _outcome(model, operation, _model_factory(calc))[0]
+    return calc, model
+
+
+def _first_mismatch(operations, factory):
+    """Index of the first operation where calculator and model differ, or None."""
+    calc = factory()
+    model_factory = _model_factory(calc)
+    model = model_factory()
+    for index, operation in enumerate(operations):
+        calc, calc_result, calc_current = _outcome(calc, operation, factory)
+        model, model_result, model_current = _outcome(model, operation, model_factory)
+        if not (_same(calc_result, model_result) and _same(calc_current, model_current)):
+            return index
+    return None
+
+
+def _same(a, b):
+    """Equality that treats NaN as equal to NaN."""
+    return a == b or (a != a and b != b)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ratios", type=parse_ratios, help="e.g. calc=6,undo=2,redo=1.5,clear=0.5")
+    parser.add_argument("--max-steps", type=int, default=4)
+    parser.add_argument("--calculator", choices=sorted(CALCULATORS), default="snapshot")
+    parser.add_argument("--check", action="store_true", help="also compare against the reference model")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    args = parser.parse_args(argv)
+    factory = CALCULATORS[args.calculator]
+
+    if args.check:
+        try:
+            check(factory, args.seed, args.count, args.ratios, args.max_steps)
+        except FuzzFailure as e:
+            print(f"FAIL {e}")
+            return 1
+        print(f"checked {args.count:,} operations against the model: OK")
+
+    stats = throughput(factory, args.seed, args.count, args.ratios, args.max_steps,
+                       trace_memory=not args.no_memory)
+    print(f"{args.calculator}: {stats['ops']:,} ops in {stats['seconds']:.3f}s "
+          f"= {stats['ops_per_sec']:,.0f} ops/s, {stats['errors']:,} rejected, "
+          f"final depth {stats['depth']:,}")
+    if "peak_bytes" in stats:
+        print(f"peak traced memory: {stats['peak_bytes'] / 2**20:,.2f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+import time
+
+# Calculator Methods Timed as a Whole (calculate Is Also Split by Operator)
+TIMED_METHODS = ("calculate_expression", "calculate_many", "undo", "redo", "undo_to", "play_macro")
+
+
+class InstrumentedStack:
+    """A proxy that counts push/pop traffic on a stack and tracks its depth."""
+
+    def __init__(self, stack, stats):
+        self.stack = stack
+        self.stats = stats
+        stats["depth"] = stack.size()
+        stats["high_water"] = max(stats["high_water"], stats["depth"])
+
+    @property
+    def items(self):
+        return self.stack.items
+
+    def push(self, data):
+        self.stack.push(data)
+        self.stats["push"] += 1
+        self._track_depth()
+
+    def push_many(self, items):
+        before = self.stack.size()
+        self.stack.push_many(items)
+        self.stats["push"] += self.stack.size() - before
+        self._track_depth()
+
+    def pop(self):
+        data = self.stack.pop()
+        self.stats["pop"] += 1
+        self.stats["depth"] = self.stack.size()
+        return data
+
+    def pop_many(self, count):
+        taken = self.stack.pop_many(count)
+        self.stats["pop"] += len(taken)
+        self.stats["depth"] = self.stack.size()
+        return taken
+
+    def transfer(self, other, count):
+        other.push_many(self.pop_many(count)[::-1])
+
+    def clear(self):
+        self.stack.clear()
+        self.stats["depth"] = 0
+
+    def truncate(self, size):
+        self.stack.truncate(size)
+        self.stats["depth"] = self.stack.size()
+
+    def peek(self):
+        return self.stack.peek()
+
+    def size(self):
+        return self.stack.size()
+
+    def isEmpty(self):
+        return self.stack.isEmpty()
+
+    def _track_depth(self):
+        depth = self.stack.size()
+        self.stats["depth"] = depth
+        if depth > self.stats["high_water"]:
+            self.stats["high_water"] = depth
+
+    def __getattr__(self, name):
+        # Expose Extras Such as BoundedStack.evictions
+        return getattr(self.stack, name)
+
+
+class Instrumentation:
+    """Counts and timings for one Calculator, collected by swapped-in wrappers.
+
+    instrument(calc) replaces the calculator's methods and stacks on that
+    instance only; uninstrumented calculators keep running the original
+    code, so disabled instrumentation costs nothing per call.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.operators = {}
+        self.methods = {name: {"count": 0, "errors": 0, "seconds": 0.0} for name in TIMED_METHODS}
+        self.stacks = {
+            name: {"push": 0, "pop": 0, "depth": 0, "high_water": 0} for name in ("undo", "redo")
+        }
+        self._originals = None
+
+    def attach(self, calculator):
+        """Swap instrumented methods and stacks into calculator."""
+        if self._originals is not None:
+            raise ValueError("Instrumentation is already attached")
+
+        self._originals = {name: vars(calculator).get(name) for name in
+                           ("calculate",) + TIMED_METHODS + ("undo_stack", "redo_stack")}
+
+        calculator.calculate = self._timed_calculate(calculator.calculate)
+        for name in TIMED_METHODS:
+            setattr(calculator, name, self._timed(getattr(calculator, name), self.methods[name]))
+
+        for name in ("undo", "redo"):
+            stack = getattr(calculator, f"{name}_stack")
+            if stack is not None:
+                setattr(calculator, f"{name}_stack", InstrumentedStack(stack, self.stacks[name]))
+
+        self._calculator = calculator
+        return calculator
+
+    def detach(self):
+        """Restore the calculator's original methods and stacks."""
+        calculator = self._calculator
+        for name, original in self._originals.items():
+            if name.endswith("_stack"):
+                setattr(calculator, name, original)
+            elif original is None:
+                vars(calculator).pop(name, None)
+            else:
+                setattr(calculator, name, original)
+        self._originals = None
+
+    def snapshot(self):
+        """Get every counter as a plain nested dict."""
+        return {
+            "calculate": {operator: dict(stats) for operator, stats in self.operators.items()},
+            "methods": {name: dict(stats) for name, stats in self.methods.items()},
+            "stacks": {name: dict(stats) for name, stats in self.stacks.items()},
+        }
+
+    def to_prometheus(self, prefix="calculator"):
+        """Render the counters in the Prometheus text exposition format."""
+        labelled = [(f'method="calculate",operator="{operator}"', stats)
+                    for operator, stats in sorted(self.operators.items())]
+        labelled += [(f'method="{name}"', stats) for name, stats in self.methods.items()]
+
+        lines = []
+        for metric, field, kind in (("operations_total", "count", "counter"),
+                                    ("operation_errors_total", "errors", "counter"),
+                                    ("operation_seconds_total", "seconds", "counter")):
+            lines.append(f"# TYPE {prefix}_{metric} {kind}")
+            lines.extend(f"{prefix}_{metric}{{{labels}}} {stats[field]}" for labels, stats in labelled)
+
+        lines.append(f"# TYPE {prefix}_stack_operations_total counter")
+        for name, stats in self.stacks.items():
+            for operation in ("push", "pop"):
+                lines.append(f'{prefix}_stack_operations_total{{stack="{name}",operation="{operation}"}} '
+                             f'{stats[operation]}')
+        for metric, field in (("stack_depth", "depth"), ("stack_depth_high_water", "high_water")):
+            lines.append(f"# TYPE {prefix}_{metric} gauge")
+            lines.extend(f'{prefix}_{metric}{{stack="{name}"}} {stats[field]}'
+                         for name, stats in self.stacks.items())
+
+        return "\n".join(lines) + "\n"
+
+    def _timed_calculate(self, calculate):
+        clock = self.clock
+        per_operator = self.operators
+
+        def timed_calculate(value1, value2, operator):
+            stats = per_operator.get(operator)
+            if stats is None:
+                stats = per_operator[operator] = {"count": 0, "errors": 0, "seconds": 0.0}
+            start = clock()
+            try:
+                return calculate(value1, value2, operator)
+            except Exception:
+                stats["errors"] += 1
+                raise
+            finally:
+                stats["count"] += 1
+                stats["seconds"] += clock() - start
+
+        return timed_calculate
+
+    def _timed(self, method, stats):
+        clock = self.clock
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            except Exception:
+                stats["errors"] += 1
+                raise
+            finally:
+                stats["count"] += 1
+                stats["seconds"] += clock() - start
+
+        return timed
+
+
+def instrument(calculator):
+    """Attach a new Instrumentation to calculator and return it."""
+    instrumentation = Instrumentation()
+    instrumentation.attach(calculator)
+    return instrumentation
@@ -0,0 +1,299 @@
+import mmap
+import os
+import struct
+from array import array
+
+from src.calculator import Calculator, Delta
+from src.variables import VariableCalculator
+
+# Journal File: Header Followed by Fixed-Width Records
+JOURNAL_MAGIC = b"CALCJRNL"
+JOURNAL_VERSION = 1
+HEADER = struct.Struct("<8sIIQ")      # magic, version, record size, record count
+RECORD = struct.Struct("<B7xd")       # kind, padding, result (step count for undo/redo)
+
+# Checkpoint File: Header Followed by Packed float64 Undo and Redo Stacks
+CHECKPOINT_MAGIC = b"CALCCKPT"
+CHECKPOINT = struct.Struct("<8sIxxxxQdQQ")  # magic, version, records covered, result, undo size, redo size
+
+# Record Kinds
+CALC = 1
+UNDO = 2
+REDO = 3
+RESET = 4
+
+# Records the Journal File Grows by When It Runs Out of Mapped Space
+GROW_RECORDS = 65536
+
+
+class Journal:
+    """An append-only, memory-mapped journal of calculator history.
+
+    Every calculation, undo and redo is appended as a 16-byte record to a
+    memory-mapped file, so appends are plain memory writes. The record count
+    in the header is updated after each record is written, which means a
+    crash can never leave a torn record visible to recovery.
+
+    checkpoint_every, when set, writes a checkpoint (a packed snapshot of
+    both stacks) after that many records; recovery loads the checkpoint and
+    replays only the records written after it.
+    """
+
+    def __init__(self, path, checkpoint_every=None):
+        """Open the journal at path, creating it if needed."""
+        self.path = path
+        self.checkpoint_path = path + ".ckpt"
+        self.checkpoint_every = checkpoint_every
+        self._calculator = None
+
+        exists = os.path.exists(path) and os.path.getsize(path) >= HEADER.size
+        self._file = open(path, "r+b" if exists else "w+b")
+
+        if exists:
+            self._map = mmap.mmap(self._file.fileno(), 0)
+            magic, version, record_size, self.count = HEADER.unpack_from(self._map)
+            if magic != JOURNAL_MAGIC or record_size != RECORD.size:
+                self.close()
+                raise ValueError(f"Not a calculator journal: {path}")
+            if version != JOURNAL_VERSION:
+                self.close()
+                raise ValueError(f"Unsupported journal version: {version}")
+        else:
+            self.count = 0
+            self._file.truncate(HEADER.size + GROW_RECORDS * RECORD.size)
+            self._map = mmap.mmap(self._file.fileno(), 0)
+            HEADER.pack_into(self._map, 0, JOURNAL_MAGIC, JOURNAL_VERSION, RECORD.size, 0)
+
+        self._checkpointed = self._checkpoint_count()
+
+    def append(self, kind, value=0.0):
+        """Append one record and publish it by bumping the header count."""
+        offset = HEADER.size + self.count * RECORD.size
+        if offset + RECORD.size > len(self._map):
+            self._grow()
+        RECORD.pack_into(self._map, offset, kind, value)
+        self.count += 1
+        HEADER.pack_into(self._map, 0, JOURNAL_MAGIC, JOURNAL_VERSION, RECORD.size, self.count)
+
+        if (self.checkpoint_every is not None and self._calculator is not None
+                and self.count - self._checkpointed >= self.checkpoint_every):
+            self.checkpoint(self._calculator)
+
+    def reset(self):
+        """Record that the attached calculator was reset to 0."""
+        self.append(RESET)
+
+    def attach(self, calculator):
+        """Journal every calculation, undo and redo made on calculator from now on.
+
+        The calculator's methods are wrapped per instance, so calculators
+        without a journal run the unwrapped code. Records hold only results,
+        so a VariableCalculator, whose memory and variable steps have no
+        record kind, is rejected.
+        """
+        _check_calculator(calculator)
+
+        calculate = calculator.calculate
+        calculate_expression = calculator.calculate_expression
+        calculate_many = calculator.calculate_many
+        undo = calculator.undo
+        redo = calculator.redo
+        play_macro = calculator.play_macro
+        append = self.append
+
+        def journaled_calculate(value1, value2, operator):
+            result = calculate(value1, value2, operator)
+            append(CALC, result)
+            return result
+
+        def journaled_calculate_expression(expression):
+            result = calculate_expression(expression)
+            append(CALC, result)
+            return result
+
+        def journaled_calculate_many(values1, values2, operators):
+            results, errors = calculate_many(values1, values2, operators)
+            for result, error in zip(results, errors):
+                if not error:
+                    append(CALC, result)
+            return results, errors
+
+        def journaled_play_macro(name, value=None, per_step=False):
+            start = calculator.current_result
+            result = play_macro(name, value, per_step)
+            if per_step:
+                # One CALC Record per Step, as if calculate() Had Run Each Step
+                if value is not None:
+                    start = calculator.backend.convert(value)
+                for step_result in calculator.macros[name].run_steps(start)[1:]:
+                    append(CALC, step_result)
+            else:
+                append(CALC, result)
+            return result
+
+        def journaled_undo(steps=1):
+            result = undo(steps)
+            append(UNDO, steps)
+            return result
+
+        def journaled_redo(steps=1):
+            result = redo(steps)
+            append(REDO, steps)
+            return result
+
+        calculator.calculate = journaled_calculate
+        calculator.calculate_expression = journaled_calculate_expression
+        calculator.calculate_many = journaled_calculate_many
+        calculator.play_macro = journaled_play_macro
+        calculator.undo = journaled_undo
+        calculator.redo = journaled_redo
+        self._calculator = calculator
+        return calculator
+
+    def recover(self, **calculator_options):
+        """Rebuild a Calculator from the latest checkpoint plus the journal tail.
+
+        calculator_options are passed to Calculator(). The returned
+        calculator is attached to this journal.
+        """
+        calc = Calculator(**calculator_options)
+        start = self._load_checkpoint(calc)
+
+        undo_stack = calc.undo_stack
+        redo_stack = calc.redo_stack
+        current = calc.current_result
+
+        # Replay Straight From the Mapped Bytes Without Any Text Parsing
+        begin = HEADER.size + start * RECORD.size
+        end = HEADER.size + self.count * RECORD.size
+        with memoryview(self._map) as view:
+            for kind, value in RECORD.iter_unpack(view[begin:end]):
+                if kind == CALC:
+                    undo_stack.push(current)
+                    redo_stack.clear()
+                    current = value
+                elif kind == UNDO:
+                    for _ in range(int(value) or 1):
+                        redo_stack.push(current)
+                        current = undo_stack.pop()
+                elif kind == REDO:
+                    for _ in range(int(value) or 1):
+                        undo_stack.push(current)
+                        current = redo_stack.pop()
+                elif kind == RESET:
+                    undo_stack.truncate(0)
+                    redo_stack.truncate(0)
+                    current = 0
+                else:
+                    raise ValueError(f"Corrupt journal record kind: {kind}")
+
+        calc.current_result = current
+        return self.attach(calc)
+
+    def checkpoint(self, calculator):
+        """Write a snapshot of calculator covering every record so far."""
+        _check_calculator(calculator)
+        undo_values, redo_values = history_values(calculator)
+        temporary = self.checkpoint_path + ".tmp"
+
+        with open(temporary, "wb") as f:
+            f.write(CHECKPOINT.pack(CHECKPOINT_MAGIC, JOURNAL_VERSION, self.count,
+                                    calculator.current_result,
+                                    len(undo_values), len(redo_values)))
+            undo_values.tofile(f)
+            redo_values.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Atomically Replace the Previous Checkpoint
+        os.replace(temporary, self.checkpoint_path)
+        self._checkpointed = self.count
+
+    def flush(self):
+        """Flush mapped records to disk."""
+        self._map.flush()
+
+    def close(self):
+        """Flush and close the journal."""
+        if not self._map.closed:
+            self._map.flush()
+            self._map.close()
+        self._file.close()
+
+    def _grow(self):
+        """Extend the file and remap it when the mapped space is full."""
+        size = len(self._map) + GROW_RECORDS * RECORD.size
+        self._map.close()
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    def _checkpoint_count(self):
+        """Get the number of records the checkpoint file covers (0 if none)."""
+        try:
+            with open(self.checkpoint_path, "rb") as f:
+                header = f.read(CHECKPOINT.size)
+        except FileNotFoundError:
+            return 0
+        if len(header) < CHECKPOINT.size:
+            return 0
+        magic, _, covered, _, _, _ = CHECKPOINT.unpack(header)
+        return covered if magic == CHECKPOINT_MAGIC else 0
+
+    def _load_checkpoint(self, calc):
+        """Load the checkpoint into calc and return the first record to replay."""
+        try:
+            with open(self.checkpoint_path, "rb") as f:
+                header = f.read(CHECKPOINT.size)
+                if len(header) < CHECKPOINT.size:
+                    return 0
+                magic, version, covered, current, undo_size, redo_size = CHECKPOINT.unpack(header)
+                if magic != CHECKPOINT_MAGIC or version != JOURNAL_VERSION or covered > self.count:
+                    return 0
+
+                undo_values = array("d")
+                redo_values = array("d")
+                undo_values.fromfile(f, undo_size)
+                redo_values.fromfile(f, redo_size)
+        except (FileNotFoundError, EOFError):
+            return 0
+
+        calc.undo_stack.push_many(undo_values)
+        calc.redo_stack.push_many(redo_values)
+        calc.current_result = current
+        return covered
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def history_values(calculator):
+    """Get the undo and redo stacks of calculator as float64 arrays.
+
+    Delta entries are materialized into the results they stand for, so the
+    arrays hold plain snapshots regardless of the history mode.
+    """
+    apply = Calculator._apply
+
+    undo_values = list(calculator._undo_values())
+    undo_values.reverse()
+
+    # Redo Entries Are Resolved Top-Down, Moving Forward in Time
+    redo_values = []
+    value = calculator.current_result
+    for entry in reversed(list(calculator.redo_stack.items)):
+        if isinstance(entry, Delta):
+            value = apply(value, entry.operand, entry.operator)
+        else:
+            value = entry
+        redo_values.append(value)
+    redo_values.reverse()
+
+    return array("d", undo_values), array("d", redo_values)
+
+
+def _check_calculator(calculator):
+    if isinstance(calculator, VariableCalculator):
+        raise ValueError("Journals do not support VariableCalculator memory or variables")
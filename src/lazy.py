@@ -0,0 +1,243 @@
+from src.calculator import OPERATORS, Calculator
+
+# Methods That Need Every Pending Operation Applied First
+EAGER_METHODS = ("calculate", "calculate_expression", "calculate_many", "undo_to", "play_macro")
+
+
+class LazyCalculator(Calculator):
+    """A Calculator that defers chained operations and fuses them.
+
+    chain(operator, operand) applies an operation to the current result
+    without computing it; it only validates and records the operation.
+    On the next read the new operations are folded in one tight loop, and
+    one entry per operation is kept in maps, so undo/redo still move one
+    operation at a time and the value after any prefix is at hand.
+
+    With the exact "fraction" backend every chained operation is affine
+    (x + c, x - c, x * c and x / c), so the entries are running
+    compositions a*x + b and the value after any prefix costs one multiply
+    and one add. Composition is only done where it is exact: with floats
+    and decimals, a*x + b can overflow or cancel where step-by-step
+    evaluation does not (1e200 * 1e200 / 1e200 from 0 gives NaN instead
+    of 0), so those backends fold the operations step by step and the
+    entries are the values themselves, identical to eager results.
+
+    Values are computed only when read: get_result(), current_result and
+    undo/redo return the folded value, and the chain is written out to
+    the ordinary undo/redo stacks only when another method needs them.
+    """
+
+    def __init__(self, **options):
+        self.ops = []
+        self.maps = []
+        self.undone = []
+        super().__init__(**options)
+        self._identity = (self.backend.convert(1), self.backend.zero)
+
+        # Convert Operands Only for Non-Float Backends
+        if self.backend.name != "float":
+            self.chain = self._chain_backend
+            self.chain_many = self._chain_many_backend
+
+        # Compose Affine Maps Only Where Composition Is Exact
+        if self.backend.name != "fraction":
+            self._fuse = self._fold
+            self._value = self._folded_value
+
+        # Wrap Whatever Implementations __init__ Selected (Backend, Delta, ...)
+        for name in EAGER_METHODS:
+            setattr(self, name, self._eager(getattr(self, name)))
+        self._undo_eager = self.undo
+        self._redo_eager = self.redo
+        self.undo = self._undo_lazy
+        self.redo = self._redo_lazy
+
+    @property
+    def current_result(self):
+        '''The current result, computed from the pending chain if there is one.'''
+
+        if self.ops:
+            return self._evaluate()
+        return self._base
+
+    @current_result.setter
+    def current_result(self, value):
+        self._base = value
+
+    def chain(self, operator, operand):
+        '''Apply operator and operand to the current result without computing it.'''
+
+        # Validate Inputs
+        if operator not in OPERATORS:
+            raise ValueError(f"Invalid Operator: {operator}")
+
+        if operator == "/" and operand == 0:
+            raise ValueError("Cannot divide by zero")
+
+        self._start_chain()
+        self.ops.append((operator, operand))
+
+    def chain_many(self, operations):
+        '''Chain several (operator, operand) pairs, validating them all first.'''
+
+        operations = list(operations)
+        for operator, operand in operations:
+            if operator not in OPERATORS:
+                raise ValueError(f"Invalid Operator: {operator}")
+            if operator == "/" and operand == 0:
+                raise ValueError("Cannot divide by zero")
+
+        self._start_chain()
+        self.ops.extend(operations)
+
+    def pending(self):
+        '''Get the number of chained operations not yet written to the stacks.'''
+
+        return len(self.ops) + len(self.undone)
+
+    def flush(self):
+        '''Write the pending chain out to the undo and redo stacks.
+
+        Each chained operation becomes its own undo entry, exactly as if it
+        had been calculated step by step.
+        '''
+
+        if not self.ops and not self.undone:
+            return
+        base = self._base
+
+        # Redo the Whole Chain So Every Step Has a Map, Then Step Back
+        applied = len(self.ops)
+        self._redo_chain(len(self.undone))
+        self._fuse()
+        value = self._value
+        values = [value(entry, base) for entry in self.maps]
+
+        if applied:
+            self.undo_stack.push(base)
+            self.undo_stack.push_many(values[:applied - 1])
+        self.redo_stack.push_many(values[applied:][::-1])
+
+        self.ops = []
+        self.maps = []
+        self._base = values[applied - 1] if applied else base
+
+    def _start_chain(self):
+        """Drop the undone part of the chain, or the redo stack for a new chain."""
+        if self.undone:
+            # A New Operation Discards the Undone Part of the Chain
+            self.undone = []
+        elif not self.ops:
+            self.redo_stack.clear()
+
+    def _chain_backend(self, operator, operand):
+        if operator in OPERATORS:
+            operand = self.backend.convert(operand)
+        LazyCalculator.chain(self, operator, operand)
+
+    def _chain_many_backend(self, operations):
+        convert = self.backend.convert
+        LazyCalculator.chain_many(self, [(operator, convert(operand)) for operator, operand in operations])
+
+    def _undo_lazy(self, steps=1):
+        if steps < 1:
+            raise ValueError("steps must be at least 1")
+        if steps <= len(self.ops):
+            # Undone Operations Are Kept Top-First, Like a Redo Stack
+            taken = self.ops[-steps:]
+            del self.ops[-steps:]
+            del self.maps[len(self.ops):]
+            self.undone.extend(reversed(taken))
+            return self.current_result
+        self.flush()
+        return self._undo_eager(steps)
+
+    def _redo_lazy(self, steps=1):
+        if steps < 1:
+            raise ValueError("steps must be at least 1")
+        if steps <= len(self.undone):
+            self._redo_chain(steps)
+            return self.current_result
+        self.flush()
+        return self._redo_eager(steps)
+
+    def _redo_chain(self, steps):
+        """Move steps undone operations back onto the chain."""
+        if steps:
+            taken = self.undone[-steps:]
+            del self.undone[-steps:]
+            self.ops.extend(reversed(taken))
+
+    def _evaluate(self):
+        """Get the value after every applied chained operation."""
+        if len(self.maps) < len(self.ops):
+            self._fuse()
+        return self._value(self.maps[-1], self._base)
+
+    def _value(self, entry, x):
+        """Evaluate the map entry = (a, b) as a*x + b."""
+        a, b = entry
+        apply = self.backend.apply
+        if a == 1:
+            return apply(x, b, "+")
+        return apply(apply(a, x, "*"), b, "+")
+
+    def _fuse(self):
+        """Compose maps for the applied operations that do not have one yet."""
+        maps = self.maps
+        append = maps.append
+        a, b = maps[-1] if maps else self._identity
+
+        for operator, operand in self.ops[len(maps):]:
+            if operator == "+":
+                b += operand
+            elif operator == "-":
+                b -= operand
+            elif operator == "*":
+                a *= operand
+                b *= operand
+            else:
+                a /= operand
+                b /= operand
+            append((a, b))
+
+    def _fold(self):
+        """Compute the value after each applied operation that has none yet."""
+        maps = self.maps
+        append = maps.append
+        x = maps[-1] if maps else self._base
+        pending = self.ops[len(maps):]
+
+        if self.backend.name == "decimal":
+            # Decimal Arithmetic Must Go Through the Backend's Context
+            apply = self.backend.apply
+            for operator, operand in pending:
+                x = apply(x, operand, operator)
+                append(x)
+            return
+
+        for operator, operand in pending:
+            if operator == "+":
+                x += operand
+            elif operator == "-":
+                x -= operand
+            elif operator == "*":
+                x *= operand
+            else:
+                x /= operand
+            append(x)
+
+    def _folded_value(self, entry, x):
+        """A step-by-step entry already is the value."""
+        return entry
+
+    def _eager(self, method):
+        flush = self.flush
+
+        def eager(*args, **kwargs):
+            flush()
+            return method(*args, **kwargs)
+
+        eager.__name__ = method.__name__
+        eager.__doc__ = method.__doc__
+        return eager
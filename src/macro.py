@@ -0,0 +1,89 @@
+import re
+
+from src.calculator import OPERATORS
+from src.expression import NUMBER
+
+# Names Bound to the Decimal Context's Methods in Compiled Decimal Macros
+DECIMAL_OPERATIONS = {"+": "add", "-": "subtract", "*": "multiply", "/": "divide"}
+
+# One Macro Step in CLI Text, e.g. "*1.2" or "- 3"
+STEP = re.compile(rf"\s*([-+*/])\s*(-?(?:{NUMBER}))")
+
+
+class Macro:
+    """A named sequence of (operator, operand) steps compiled for replay.
+
+    Each step applies to the running value, so a macro maps one input to one
+    output. The steps are compiled once, when the macro is created, into two
+    plain Python functions: run(x) returns the final value and
+    run_steps(x) returns the value after every step. Both are straight-line
+    code with the operands bound as constants, so replay does no parsing,
+    no validation and no per-step dispatch.
+    """
+
+    __slots__ = ("name", "steps", "run", "run_steps")
+
+    def __init__(self, name, steps, backend):
+        """Validate and compile steps, converting operands with backend."""
+        steps = [(operator, backend.convert(operand)) for operator, operand in steps]
+        if not steps:
+            raise ValueError("A macro needs at least one step")
+        for operator, operand in steps:
+            if operator not in OPERATORS:
+                raise ValueError(f"Invalid Operator: {operator}")
+            if operator == "/" and operand == 0:
+                raise ValueError("Cannot divide by zero")
+
+        self.name = name
+        self.steps = tuple(steps)
+        self.run, self.run_steps = compile_steps(self.steps, backend)
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __repr__(self):
+        return f"Macro({self.name!r}, {list(self.steps)!r})"
+
+
+def compile_steps(steps, backend):
+    """Build run(x) and run_steps(x) for steps.
+
+    Operands are passed in as globals c0, c1, ... rather than written into
+    the source, so every number type keeps its exact value. Decimal steps
+    call the backend's context methods; other backends use the operators.
+    """
+    namespace = {f"c{i}": operand for i, (_, operand) in enumerate(steps)}
+
+    if backend.name == "decimal":
+        for operator, name in DECIMAL_OPERATIONS.items():
+            namespace[name] = backend.operations[operator]
+        terms = [f"{DECIMAL_OPERATIONS[operator]}({{}}, c{i})" for i, (operator, _) in enumerate(steps)]
+    else:
+        terms = [f"{{}} {operator} c{i}" for i, (operator, _) in enumerate(steps)]
+
+    run = ["def run(x):"]
+    run += [f"    x = {term.format('x')}" for term in terms]
+    run.append("    return x")
+
+    run_steps = ["def run_steps(v0):"]
+    run_steps += [f"    v{i + 1} = {term.format(f'v{i}')}" for i, term in enumerate(terms)]
+    run_steps.append(f"    return [{', '.join(f'v{i}' for i in range(len(terms) + 1))}]")
+
+    exec(compile("\n".join(run + run_steps), "<macro>", "exec"), namespace)
+    return namespace["run"], namespace["run_steps"]
+
+
+def parse_macro(text):
+    """Parse CLI macro steps such as "*1.2 +5 -3" into (operator, operand) pairs."""
+    steps = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = STEP.match(text, position)
+        if match is None:
+            raise ValueError(f"Invalid macro step: {text[position:].strip()}")
+        steps.append((match.group(1), float(match.group(2))))
+        position = match.end()
+    if not steps:
+        raise ValueError("A macro needs at least one step")
+    return steps
@@ -1,4 +1,10 @@
-from src.calculator import Calculator
+import sys
+
+from src.macro import parse_macro
+from src.variables import VariableCalculator
+
+# Lines Read and Written per Chunk in Batch Mode
+BATCH_CHUNK_LINES = 8192
 
 
 def display_menu():
@@ -7,94 +13,266 @@ def display_menu():
     print("CALCULATOR WITH UNDO/REDO")
     print("="*50)
     print("Operations: +, -, *, /")
-    print("Commands: undo, redo, clear, exit")
+    print(f"Commands: {', '.join(COMMANDS)}, help, exit")
     print("="*50)
 
 
+def display_help():
+    """Display every registered command with its help text."""
+    print("\nCommands:")
+    for usage, text in COMMAND_HELP.values():
+        print(f"  {usage:<30} - {text}")
+    print(f"  {'help':<30} - Show this help")
+    print(f"  {'exit':<30} - Exit calculator")
+
+
 def display_result(result):
     """Display the current result."""
     print(f"Result: {result}")
 
 
-def main():
-    """Main calculator loop."""
-    calc = Calculator()
+# Command Name -> Handler(calc, argument) Returning (calculator, result)
+COMMANDS = {}
+
+# Command Name -> (usage, help text), Shown by 'help'
+COMMAND_HELP = {}
+
+
+def register_command(name, usage=None, help=""):
+    """Register a command handler; use as a decorator.
+
+    The handler is called as handler(calc, argument), where argument is
+    the text after the command name (empty if none). It returns
+    (calculator, result), and raises ValueError or IndexError to report
+    a bad command. Plugins call this to add commands to the CLI, the
+    batch mode and the server, and may replace built-in commands.
+    """
+    def decorator(handler):
+        COMMANDS[name] = handler
+        COMMAND_HELP[name] = (usage or name, help)
+        return handler
+    return decorator
+
+
+def load_plugins(modules):
+    """Import plugin modules, which register their commands on import."""
+    import importlib
+
+    for module in modules:
+        importlib.import_module(module)
+
+
+def parse_steps(argument):
+    """Parse the optional step count of undo/redo."""
+    if not argument:
+        return 1
+    if not argument.isdigit():
+        raise ValueError(f"Invalid step count: {argument}")
+    return int(argument)
+
+
+@register_command("calc", "calc <expression>", "Calculate, e.g. calc (3+4)*2/7")
+def command_calc(calc, argument):
+    if not argument:
+        raise ValueError("Please use format 'calc <expression>'")
+    return calc, calc.calculate_expression(argument)
+
+
+@register_command("undo", "undo [n]", "Undo the last n operations (default 1)")
+def command_undo(calc, argument):
+    return calc, calc.undo(parse_steps(argument))
+
+
+@register_command("redo", "redo [n]", "Redo the last n undone operations (default 1)")
+def command_redo(calc, argument):
+    return calc, calc.redo(parse_steps(argument))
+
+
+@register_command("clear", help="Reset calculator to 0")
+def command_clear(calc, argument):
+    if argument:
+        raise ValueError(f"Invalid command: clear {argument}")
+    fresh = VariableCalculator()
+    fresh.macros = calc.macros
+    return fresh, 0
+
+
+@register_command("let", "let <name> = <expression>", "Set a variable, e.g. let x = 2*3")
+def command_let(calc, argument):
+    name, equals, expression = argument.partition('=')
+    if not equals or not expression.strip():
+        raise ValueError("Please use format 'let <name> = <expression>'")
+    return calc, calc.let(name.strip(), expression.strip())
+
+
+@register_command("m+", help="Add the result to memory")
+def command_memory_add(calc, argument):
+    return calc, calc.memory_add()
+
+
+@register_command("m-", help="Subtract the result from memory")
+def command_memory_subtract(calc, argument):
+    return calc, calc.memory_subtract()
+
+
+@register_command("mr", help="Recall memory as the result")
+def command_memory_recall(calc, argument):
+    return calc, calc.memory_recall()
+
+
+@register_command("mc", help="Clear memory")
+def command_memory_clear(calc, argument):
+    return calc, calc.memory_clear()
+
+
+@register_command("macro", "macro <name> = <steps>", "Define a macro, e.g. macro tax = *1.2 +5")
+def command_macro(calc, argument):
+    name, equals, steps = argument.partition('=')
+    name = name.strip()
+    if not equals or not name or ' ' in name:
+        raise ValueError("Please use format 'macro <name> = <steps>'")
+    calc.define_macro(name, parse_macro(steps))
+    return calc, calc.get_result()
+
+
+def parse_play(argument):
+    """Parse the '<name> [value]' argument of play/play-steps."""
+    name, _, value = argument.partition(' ')
+    if not name:
+        raise ValueError("Please use format 'play <name> [value]'")
+    try:
+        return name, float(value) if value.strip() else None
+    except ValueError:
+        raise ValueError(f"Invalid starting value: {value.strip()}") from None
+
+
+@register_command("play", "play <name> [value]", "Replay a macro as one undoable step")
+def command_play(calc, argument):
+    name, value = parse_play(argument)
+    return calc, calc.play_macro(name, value)
+
+
+@register_command("play-steps", "play-steps <name> [value]", "Replay a macro, one undoable step per macro step")
+def command_play_steps(calc, argument):
+    name, value = parse_play(argument)
+    return calc, calc.play_macro(name, value, per_step=True)
+
+
+def execute_command(calc, command):
+    """Run one registered command and return (calculator, result).
+
+    The first word selects the handler in COMMANDS and the rest is its
+    argument, so dispatch is one dict lookup whatever the number of
+    commands. 'clear' returns a fresh VariableCalculator. Bad commands raise
+    ValueError and empty undo/redo stacks raise IndexError.
+    """
+    name, _, argument = command.partition(' ')
+    handler = COMMANDS.get(name)
+    if handler is None:
+        raise ValueError(f"Invalid command: {command}")
+    return handler(calc, argument.strip())
+
+
+def run_batch(infile, outfile, errfile):
+    """Run commands from infile without the menu, writing one result per line.
+
+    Input is consumed and output produced in large buffered chunks. Blank
+    lines and lines starting with '#' are skipped, and 'exit' stops the run.
+    A bad line is reported on errfile with its line number and the run
+    continues. Returns the number of lines that failed.
+    """
+    calc = VariableCalculator()
+    out = []
+    failures = 0
+
+    for line_number, line in enumerate(infile, 1):
+        command = line.strip().lower()
+
+        if not command or command[0] == '#':
+            continue
+
+        if command == 'exit':
+            break
+
+        try:
+            calc, result = execute_command(calc, command)
+        except (ValueError, IndexError) as e:
+            failures += 1
+            errfile.write(f"line {line_number}: Error: {e}\n")
+            continue
+
+        out.append(f"{result}\n")
+        if len(out) >= BATCH_CHUNK_LINES:
+            outfile.write("".join(out))
+            out.clear()
+
+    outfile.write("".join(out))
+    outfile.flush()
+    return failures
+
+
+def main(argv=None):
+    """Main calculator loop.
+
+    'main.py --batch [FILE]' runs the commands in FILE (or stdin when FILE
+    is missing or '-') non-interactively instead. '--plugin MODULE' (which
+    may be repeated) imports MODULE first so it can register commands.
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+
+    plugins = []
+    while len(argv) > 1 and argv[0] == '--plugin':
+        plugins.append(argv[1])
+        del argv[:2]
+    load_plugins(plugins)
+
+    if argv and argv[0] == '--batch':
+        path = argv[1] if len(argv) > 1 else '-'
+        if path == '-':
+            failures = run_batch(sys.stdin, sys.stdout, sys.stderr)
+        else:
+            with open(path, buffering=1 << 20) as infile:
+                failures = run_batch(infile, sys.stdout, sys.stderr)
+        return 1 if failures else 0
+
+    calc = VariableCalculator()
     
     print("Welcome to Calculator with Undo/Redo!")
     print("Type 'help' for commands")
+    display_menu()
     
     while True:
-        display_menu()
-        print(f"Current Result: {calc.get_result()}")
-        
-        user_input = input("\nEnter command (help/exit): ").strip().lower()
+        user_input = input(f"\n[{calc.get_result()}] Enter command (help/exit): ").strip().lower()
         
-        # Handle special commands
+        # Handle Interactive-Only Commands
         if user_input == 'exit':
             print("Goodbye!")
-            break
+            return 0
         
         elif user_input == 'help':
-            print("\nCommands:")
-            print("  calc <num1> <operator> <num2>  - Perform calculation")
-            print("  undo                           - Undo last operation")
-            print("  redo                           - Redo last undone operation")
-            print("  clear                          - Reset calculator to 0")
-            print("  exit                           - Exit calculator")
+            display_help()
             continue
         
-        elif user_input == 'undo':
-            try:
-                result = calc.undo()
-                display_result(result)
-            except IndexError as e:
-                print(f"Error: {e}")
-        
-        elif user_input == 'redo':
-            try:
-                result = calc.redo()
-                display_result(result)
-            except IndexError as e:
-                print(f"Error: {e}")
-        
-        elif user_input == 'clear':
-            calc = Calculator()
-            print("Calculator reset to 0")
+        elif user_input == 'menu':
+            display_menu()
+            continue
         
-        elif user_input.startswith('calc '):
-            try:
-                # Parse input: "calc 5 + 3"
-                parts = user_input[5:].split()
-                
-                if len(parts) < 3:
-                    print("Error: Please use format 'calc <num1> <operator> <num2>'")
-                    continue
-                
-                try:
-                    value1 = float(parts[0])
-                except ValueError:
-                    print(f"Error: '{parts[0]}' is not a valid number")
-                    continue
-                
-                operator = parts[1]
-                
-                try:
-                    value2 = float(parts[2])
-                except ValueError:
-                    print(f"Error: '{parts[2]}' is not a valid number")
-                    continue
-                
-                result = calc.calculate(value1, value2, operator)
-                display_result(result)
-            
-            except ValueError as e:
-                print(f"Error: {e}")
-            except Exception as e:
-                print(f"Unexpected error: {e}")
+        if user_input.partition(' ')[0] not in COMMANDS:
+            print("Invalid command. Type 'help' for available commands.")
+            continue
         
+        try:
+            calc, result = execute_command(calc, user_input)
+        except (ValueError, IndexError) as e:
+            print(f"Error: {e}")
+        except Exception as e:
+            print(f"Unexpected error: {e}")
         else:
-            print("Invalid command. Type 'help' for available commands.")
+            if user_input == 'clear':
+                print("Calculator reset to 0")
+            else:
+                display_result(result)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,237 @@
+# Hash Bits Consumed per Trie Level, and the Hash Width Used
+SHIFT = 5
+MASK = (1 << SHIFT) - 1
+HASH_BITS = 32
+
+# Returned by Lookups When a Key Is Absent
+MISSING = object()
+
+
+class _Node:
+    """A bitmap-indexed trie node: one entry per set bit, in bit order.
+
+    Each entry is either a (key, value) tuple or a child node.
+    """
+
+    __slots__ = ("bitmap", "entries")
+
+    def __init__(self, bitmap, entries):
+        self.bitmap = bitmap
+        self.entries = entries
+
+
+class _Collision:
+    """A leaf holding keys whose hashes are identical."""
+
+    __slots__ = ("hash", "pairs")
+
+    def __init__(self, key_hash, pairs):
+        self.hash = key_hash
+        self.pairs = pairs
+
+
+EMPTY_NODE = _Node(0, ())
+
+
+class PersistentMap:
+    """An immutable mapping that shares structure between versions.
+
+    A hash array mapped trie: set() and delete() return a new map and copy
+    only the O(log32 n) nodes on the path to the changed key, so many
+    versions of a large map cost little more than one. Lookups are
+    O(log32 n) as well, which is at most 7 levels.
+    """
+
+    __slots__ = ("root", "size")
+
+    def __init__(self, items=None):
+        """Create a map, optionally filled from a dict or (key, value) pairs."""
+        self.root = EMPTY_NODE
+        self.size = 0
+        if items is not None:
+            pairs = items.items() if hasattr(items, "items") else items
+            for key, value in pairs:
+                self.root, added = _set(self.root, key, value, _hash(key), 0)
+                self.size += added
+
+    def get(self, key, default=None):
+        """Get the value for key, or default."""
+        value = _get(self.root, key, _hash(key))
+        return default if value is MISSING else value
+
+    def set(self, key, value):
+        """Get a new map with key set to value."""
+        root, added = _set(self.root, key, value, _hash(key), 0)
+        if root is self.root:
+            return self
+        return self._derive(root, self.size + added)
+
+    def delete(self, key):
+        """Get a new map without key; raises KeyError if it is absent."""
+        root = _delete(self.root, key, _hash(key), 0)
+        if root is MISSING:
+            raise KeyError(key)
+        return self._derive(root if root is not None else EMPTY_NODE, self.size - 1)
+
+    def items(self):
+        """Iterate over (key, value) pairs in no particular order."""
+        return _items(self.root)
+
+    def keys(self):
+        """Iterate over keys in no particular order."""
+        return (key for key, _ in _items(self.root))
+
+    def __getitem__(self, key):
+        value = _get(self.root, key, _hash(key))
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return _get(self.root, key, _hash(key)) is not MISSING
+
+    def __iter__(self):
+        return self.keys()
+
+    def __len__(self):
+        return self.size
+
+    def __eq__(self, other):
+        if not isinstance(other, PersistentMap):
+            return NotImplemented
+        return self.size == other.size and all(
+            other.get(key, MISSING) == value for key, value in self.items())
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"PersistentMap({dict(self.items())!r})"
+
+    def _derive(self, root, size):
+        derived = PersistentMap.__new__(PersistentMap)
+        derived.root = root
+        derived.size = size
+        return derived
+
+
+def _hash(key):
+    return hash(key) & ((1 << HASH_BITS) - 1)
+
+
+def _get(node, key, key_hash):
+    shift = 0
+    while True:
+        if node.__class__ is _Collision:
+            for pair in node.pairs:
+                if pair[0] == key:
+                    return pair[1]
+            return MISSING
+
+        bit = 1 << ((key_hash >> shift) & MASK)
+        if not node.bitmap & bit:
+            return MISSING
+        entry = node.entries[(node.bitmap & (bit - 1)).bit_count()]
+        if entry.__class__ is tuple:
+            return entry[1] if entry[0] == key else MISSING
+        node = entry
+        shift += SHIFT
+
+
+def _set(node, key, value, key_hash, shift):
+    """Return (node with key set, 1 if key was added else 0)."""
+    if node.__class__ is _Collision:
+        if key_hash != node.hash:
+            return _merge(node, node.hash, (key, value), key_hash, shift), 1
+        for i, pair in enumerate(node.pairs):
+            if pair[0] == key:
+                if pair[1] is value:
+                    return node, 0
+                return _Collision(node.hash, node.pairs[:i] + ((key, value),) + node.pairs[i + 1:]), 0
+        return _Collision(node.hash, node.pairs + ((key, value),)), 1
+
+    bit = 1 << ((key_hash >> shift) & MASK)
+    index = (node.bitmap & (bit - 1)).bit_count()
+    entries = node.entries
+
+    if not node.bitmap & bit:
+        return _Node(node.bitmap | bit, entries[:index] + ((key, value),) + entries[index:]), 1
+
+    entry = entries[index]
+    if entry.__class__ is tuple:
+        if entry[0] == key:
+            if entry[1] is value:
+                return node, 0
+            replacement, added = (key, value), 0
+        else:
+            replacement, added = _merge(entry, _hash(entry[0]), (key, value), key_hash, shift + SHIFT), 1
+    else:
+        replacement, added = _set(entry, key, value, key_hash, shift + SHIFT)
+        if replacement is entry:
+            return node, 0
+
+    return _Node(node.bitmap, entries[:index] + (replacement,) + entries[index + 1:]), added
+
+
+def _merge(pair1, hash1, pair2, hash2, shift):
+    """Build the smallest subtree holding two entries with different keys.
+
+    pair1 may also be a collision node, whose hash always differs from hash2.
+    """
+    if hash1 == hash2:
+        return _Collision(hash1, (pair1, pair2))
+
+    index1 = (hash1 >> shift) & MASK
+    index2 = (hash2 >> shift) & MASK
+    if index1 == index2:
+        return _Node(1 << index1, (_merge(pair1, hash1, pair2, hash2, shift + SHIFT),))
+    if index1 < index2:
+        return _Node((1 << index1) | (1 << index2), (pair1, pair2))
+    return _Node((1 << index1) | (1 << index2), (pair2, pair1))
+
+
+def _delete(node, key, key_hash, shift):
+    """Return node without key, None if it became empty, or MISSING if key is absent."""
+    if node.__class__ is _Collision:
+        pairs = tuple(pair for pair in node.pairs if pair[0] != key)
+        if len(pairs) == len(node.pairs):
+            return MISSING
+        if len(pairs) == 1:
+            return pairs[0]
+        return _Collision(node.hash, pairs)
+
+    bit = 1 << ((key_hash >> shift) & MASK)
+    if not node.bitmap & bit:
+        return MISSING
+    index = (node.bitmap & (bit - 1)).bit_count()
+    entries = node.entries
+    entry = entries[index]
+
+    if entry.__class__ is tuple:
+        if entry[0] != key:
+            return MISSING
+        replacement = None
+    else:
+        replacement = _delete(entry, key, key_hash, shift + SHIFT)
+        if replacement is MISSING:
+            return MISSING
+        # Pull a Lone Remaining Pair Up Into This Node
+        if replacement.__class__ is _Node and len(replacement.entries) == 1 \
+                and replacement.entries[0].__class__ is tuple:
+            replacement = replacement.entries[0]
+
+    if replacement is None:
+        if node.bitmap == bit:
+            return None
+        return _Node(node.bitmap ^ bit, entries[:index] + entries[index + 1:])
+    return _Node(node.bitmap, entries[:index] + (replacement,) + entries[index + 1:])
+
+
+def _items(node):
+    if node.__class__ is _Collision:
+        yield from node.pairs
+        return
+    for entry in node.entries:
+        if entry.__class__ is tuple:
+            yield entry
+        else:
+            yield from _items(entry)
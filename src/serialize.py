@@ -0,0 +1,138 @@
+import struct
+from array import array
+
+from src.calculator import Calculator
+from src.journal import history_values
+from src.variables import VariableCalculator
+
+# Session Layout: Header Followed by Packed float64 Undo and Redo Stacks
+SESSION_MAGIC = b"CALCSESS"
+SESSION_VERSION = 1
+HEADER = struct.Struct("<8sIxxxxdQQ")  # magic, version, current result, undo size, redo size
+
+# Values Read or Written per Chunk When Streaming
+CHUNK_ITEMS = 65536
+
+
+def dumps(calculator):
+    """Serialize calculator to bytes: a fixed header plus both stacks as float64.
+
+    Stacks are stored bottom to top. Delta history entries are
+    materialized, so a session exported in either history mode imports
+    into any mode. A VariableCalculator is rejected, since the format has
+    no room for its memory register or variables.
+    """
+    undo_values, redo_values = _history_arrays(calculator)
+    return b"".join((_header(calculator, undo_values, redo_values),
+                     undo_values.tobytes(), redo_values.tobytes()))
+
+
+def dump(calculator, file):
+    """Stream calculator to a binary file object in CHUNK_ITEMS pieces."""
+    undo_values, redo_values = _history_arrays(calculator)
+    file.write(_header(calculator, undo_values, redo_values))
+    for values in (undo_values, redo_values):
+        with memoryview(values) as view:
+            for start in range(0, len(view), CHUNK_ITEMS):
+                file.write(view[start:start + CHUNK_ITEMS])
+
+
+def views(data):
+    """Parse a session without copying it.
+
+    Returns (current_result, undo_view, redo_view), where the two views are
+    float64 memoryviews straight into data. They are read-only and only
+    valid while data is.
+    """
+    view = memoryview(data).toreadonly()
+    current, undo_size, redo_size = _parse_header(view[:HEADER.size])
+
+    undo_end = HEADER.size + 8 * undo_size
+    redo_end = undo_end + 8 * redo_size
+    if len(view) < redo_end:
+        raise ValueError("Truncated calculator session")
+    return current, view[HEADER.size:undo_end].cast("d"), view[undo_end:redo_end].cast("d")
+
+
+def loads(data, **calculator_options):
+    """Build a Calculator from bytes written by dumps().
+
+    calculator_options are passed to Calculator(), so a session can be
+    imported into any stack type or history mode.
+    """
+    current, undo_view, redo_view = views(data)
+    calc = Calculator(**calculator_options)
+    _check_backend(calc)
+    with undo_view, redo_view:
+        calc.undo_stack.push_many(undo_view)
+        calc.redo_stack.push_many(redo_view)
+    calc.current_result = current
+    return calc
+
+
+def load(file, **calculator_options):
+    """Stream a Calculator from a binary file object, CHUNK_ITEMS values at a time.
+
+    Only one chunk is held in memory besides the stacks being rebuilt, so
+    very deep histories never need a second full-size buffer.
+    """
+    current, undo_size, redo_size = _parse_header(_read_exactly(file, HEADER.size))
+    calc = Calculator(**calculator_options)
+    _check_backend(calc)
+
+    buffer = bytearray(8 * CHUNK_ITEMS)
+    for stack, size in ((calc.undo_stack, undo_size), (calc.redo_stack, redo_size)):
+        while size:
+            count = min(size, CHUNK_ITEMS)
+            with memoryview(buffer)[:8 * count] as chunk:
+                if file.readinto(chunk) != len(chunk):
+                    raise ValueError("Truncated calculator session")
+                with chunk.cast("d") as values:
+                    stack.push_many(values)
+            size -= count
+
+    calc.current_result = current
+    return calc
+
+
+def _history_arrays(calculator):
+    """Get both stacks as float64 arrays, reusing ArrayStack storage as is."""
+    _check_backend(calculator)
+    if calculator.history_mode == "delta":
+        return history_values(calculator)
+
+    undo_items = calculator.undo_stack.items
+    redo_items = calculator.redo_stack.items
+    if isinstance(undo_items, array) and isinstance(redo_items, array):
+        return undo_items, redo_items
+    return array("d", undo_items), array("d", redo_items)
+
+
+def _header(calculator, undo_values, redo_values):
+    return HEADER.pack(SESSION_MAGIC, SESSION_VERSION, calculator.current_result,
+                       len(undo_values), len(redo_values))
+
+
+def _parse_header(data):
+    if len(data) < HEADER.size:
+        raise ValueError("Truncated calculator session")
+    magic, version, current, undo_size, redo_size = HEADER.unpack(data)
+    if magic != SESSION_MAGIC:
+        raise ValueError("Not a calculator session")
+    if version != SESSION_VERSION:
+        raise ValueError(f"Unsupported session version: {version}")
+    return current, undo_size, redo_size
+
+
+def _read_exactly(file, size):
+    data = file.read(size)
+    if len(data) != size:
+        raise ValueError("Truncated calculator session")
+    return data
+
+
+def _check_backend(calculator):
+    if calculator.backend.name != "float":
+        raise ValueError("Sessions only support the float backend")
+    if isinstance(calculator, VariableCalculator):
+        raise ValueError("Sessions do not support VariableCalculator memory or variables")
@@ -0,0 +1,162 @@
+import asyncio
+import sys
+import time
+from collections import OrderedDict
+
+from src.variables import VariableCalculator
+from src.main import execute_command
+
+# Seconds a Session May Stay Unused Before It Is Dropped
+IDLE_TIMEOUT = 300.0
+
+# Seconds Between Sweeps for Idle Sessions
+SWEEP_INTERVAL = 10.0
+
+
+class SessionStore:
+    """Independent Calculator sessions keyed by session id, expired when idle.
+
+    Sessions are kept in least-recently-used order, so expiring idle
+    sessions only looks at the ones that actually expire.
+    """
+
+    def __init__(self, idle_timeout=IDLE_TIMEOUT, clock=time.monotonic):
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self.sessions = OrderedDict()
+        self.expired = 0
+
+    def execute(self, session_id, command):
+        """Run a command in a session, creating the session on first use."""
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = [VariableCalculator(), 0.0]
+        else:
+            self.sessions.move_to_end(session_id)
+        session[1] = self.clock()
+        session[0], result = execute_command(session[0], command)
+        return result
+
+    def expire_idle(self):
+        """Drop sessions idle for longer than idle_timeout; return how many."""
+        deadline = self.clock() - self.idle_timeout
+        sessions = self.sessions
+        count = 0
+        while sessions and next(iter(sessions.values()))[1] < deadline:
+            sessions.popitem(last=False)
+            count += 1
+        self.expired += count
+        return count
+
+    def __len__(self):
+        return len(self.sessions)
+
+
+def handle_line(store, line):
+    """Answer one '<session> <command>' request line with 'OK ...' or 'ERR ...'.
+
+    line may be raw bytes from a client; invalid UTF-8 is replaced rather
+    than raised, so it gets an ERR reply like any other bad request.
+    """
+    if isinstance(line, bytes):
+        line = line.decode(errors="replace")
+    session_id, _, command = line.strip().partition(" ")
+    command = command.strip().lower()
+    if not session_id or not command:
+        return "ERR Please use format '<session> <command>'\n"
+    try:
+        return f"OK {store.execute(session_id, command)}\n"
+    except (ValueError, IndexError) as e:
+        return f"ERR {e}\n"
+
+
+class CalculatorServer:
+    """An asyncio server hosting many calculator sessions in one process.
+
+    Clients send one '<session> <command>' line per request, using the same
+    calc/undo/redo/clear commands as main.py, and receive one 'OK <result>'
+    or 'ERR <message>' line back. Requests may be pipelined.
+    """
+
+    def __init__(self, idle_timeout=IDLE_TIMEOUT, sweep_interval=SWEEP_INTERVAL):
+        self.store = SessionStore(idle_timeout)
+        self.sweep_interval = sweep_interval
+        self._server = None
+        self._sweeper = None
+
+    async def start(self, host="127.0.0.1", port=0, path=None):
+        """Listen on a TCP host/port, or on a Unix socket when path is given."""
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_client, path)
+        else:
+            self._server = await asyncio.start_server(self._handle_client, host, port)
+        self._sweeper = asyncio.create_task(self._sweep())
+        return self
+
+    @property
+    def address(self):
+        """The address the server is listening on."""
+        return self._server.sockets[0].getsockname()
+
+    async def close(self):
+        """Stop accepting clients and stop the idle sweeper."""
+        self._sweeper.cancel()
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def _handle_client(self, reader, writer):
+        store = self.store
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as e:
+                    # Last Line Without a Newline, or End of Input
+                    line = e.partial
+                except asyncio.LimitOverrunError:
+                    # Drop the Whole Line, Not Just What Has Arrived So Far
+                    await _skip_line(reader)
+                    writer.write(b"ERR Request line too long\n")
+                    await writer.drain()
+                    continue
+                if not line:
+                    break
+                writer.write(handle_line(store, line).encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _sweep(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            self.store.expire_idle()
+
+
+async def _skip_line(reader):
+    """Discard input up to and including the next newline, or to end of input."""
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.LimitOverrunError as e:
+            await reader.readexactly(e.consumed)
+        except asyncio.IncompleteReadError:
+            return
+
+
+async def serve(host="127.0.0.1", port=7878, path=None):
+    server = await CalculatorServer().start(host, port, path)
+    print(f"Serving calculator sessions on {path or server.address}")
+    await server.serve_forever()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and not sys.argv[1].isdigit():
+        asyncio.run(serve(path=sys.argv[1]))
+    else:
+        asyncio.run(serve(port=int(sys.argv[1]) if len(sys.argv) > 1 else 7878))
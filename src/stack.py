@@ -1,17 +1,65 @@
+import sys
+from array import array
+from collections import deque
+
+# Number of Discarded Items Released per clear() Call
+RECLAIM_STEP = 256
+
+# Retired Items Released per Item Pushed While Any Are Pending
+RECLAIM_PER_PUSH = 2
+
+
 class Stack:
+    __slots__ = ("items", "_stale")
+
     def __init__(self):
         """Initialize an empty stack."""
         self.items = []
+        self._stale = []
 
     def push(self, data):
         """Add an item to the top of the stack."""
         self.items.append(data)
+        if self._stale:
+            self.reclaim(RECLAIM_PER_PUSH)
+
+    def push_many(self, items):
+        """Add several items in order; the last one ends up on top."""
+        if self._stale:
+            before = len(self.items)
+            self.items.extend(items)
+            self.reclaim(RECLAIM_PER_PUSH * (len(self.items) - before))
+        else:
+            self.items.extend(items)
 
     def pop(self):
         """Remove and return the top item from the stack."""
         if len(self.items) == 0:
             raise IndexError("Empty Stack")
         return self.items.pop()
+
+    def pop_many(self, count):
+        """Remove the top count items and return them bottom-to-top.
+
+        The items are sliced off in one operation; nothing is removed if
+        the stack holds fewer than count items.
+        """
+        if count > len(self.items):
+            raise IndexError("Empty Stack")
+        if count <= 0:
+            return self.items[:0]
+        taken = self.items[-count:]
+        del self.items[-count:]
+        return taken
+
+    def transfer(self, other, count):
+        """Pop the top count items and push them onto other in LIFO order.
+
+        This is count pop/push pairs done as one slice operation, so the top
+        item of this stack ends up deepest in other.
+        """
+        taken = self.pop_many(count)
+        other.push_many(taken[::-1])
     
     def peek(self):
         """View the top item without removing it."""
@@ -26,4 +74,333 @@ class Stack:
     def isEmpty(self):
         """Check if the stack is empty."""
         return len(self.items) == 0
-    
\ No newline at end of file
+
+    def clear(self):
+        """Remove all items in O(1).
+
+        The old item list is retired rather than freed. Every clear() call
+        releases up to RECLAIM_STEP retired items and every pushed item
+        releases RECLAIM_PER_PUSH more. Dropping a huge history therefore
+        never stalls on one big deallocation, and because a list can only
+        be retired after its items were pushed, the retired backlog never
+        exceeds the largest list cleared. Clearing an already-empty stack
+        allocates nothing.
+        """
+        if self.items:
+            self._stale.append(self.items)
+            self.items = []
+        if self._stale:
+            self.reclaim(RECLAIM_STEP)
+
+    def truncate(self, size):
+        """Drop items above the given size, keeping the bottom size items."""
+        if size == 0:
+            self.clear()
+        else:
+            del self.items[size:]
+
+    def reclaim(self, limit=None):
+        """Release up to limit retired items (all of them when limit is None)."""
+        if limit is None:
+            self._stale.clear()
+            return
+        while limit > 0 and self._stale:
+            stale = self._stale[-1]
+            count = min(limit, len(stale))
+            del stale[len(stale) - count:]
+            limit -= count
+            if not stale:
+                self._stale.pop()
+
+    def pending_reclaim(self):
+        """Get the number of retired items not yet released."""
+        return sum(len(stale) for stale in self._stale)
+
+
+class ArrayStack(Stack):
+    """A stack of floats packed into an array('d').
+
+    Each item costs 8 bytes instead of a pointer plus a boxed float object,
+    so deep numeric histories use about a quarter of the memory of Stack.
+    Only real numbers can be pushed and they come back as floats.
+    """
+
+    __slots__ = ()
+
+    def __init__(self):
+        """Initialize an empty stack."""
+        self.items = array("d")
+        self._stale = []
+
+    def clear(self):
+        """Remove all items; unboxed floats are freed without per-item work."""
+        del self.items[:]
+
+
+class BoundedStack(Stack):
+    """A stack that evicts its oldest items once a capacity is reached.
+
+    The capacity is a maximum number of items, a byte budget (measured with
+    sys.getsizeof), or both. Items live in a deque, which acts as a ring
+    buffer: pushing onto a full stack drops the bottom item in O(1).
+    """
+
+    def __init__(self, max_items=None, max_bytes=None):
+        """Initialize an empty stack with the given capacity."""
+        if max_items is None and max_bytes is None:
+            raise ValueError("BoundedStack needs max_items or max_bytes")
+        if max_items is not None and max_items < 1:
+            raise ValueError("max_items must be at least 1")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+
+        self.items = deque()
+        self._stale = []
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+
+    def push(self, data):
+        """Add an item to the top, evicting the oldest items if over capacity."""
+        if self.max_items is not None and len(self.items) == self.max_items:
+            self._evict()
+        self.items.append(data)
+        if self.max_bytes is not None:
+            self.nbytes += sys.getsizeof(data)
+            while self.nbytes > self.max_bytes and len(self.items) > 1:
+                self._evict()
+
+    def push_many(self, items):
+        """Add several items in order; the last one ends up on top."""
+        for data in items:
+            self.push(data)
+
+    def pop_many(self, count):
+        """Remove the top count items and return them bottom-to-top."""
+        if count > len(self.items):
+            raise IndexError("Empty Stack")
+        taken = [self.pop() for _ in range(max(count, 0))]
+        taken.reverse()
+        return taken
+
+    def pop(self):
+        """Remove and return the top item from the stack."""
+        if len(self.items) == 0:
+            raise IndexError("Empty Stack")
+        data = self.items.pop()
+        if self.max_bytes is not None:
+            self.nbytes -= sys.getsizeof(data)
+        return data
+
+    def clear(self):
+        """Remove all items; the capacity bounds how long this takes."""
+        self.items.clear()
+        self.nbytes = 0
+
+    def truncate(self, size):
+        """Drop items above the given size, keeping the bottom size items."""
+        while len(self.items) > size:
+            self.pop()
+
+    def _evict(self):
+        """Drop the bottom (oldest) item and update the eviction counters."""
+        data = self.items.popleft()
+        self.evictions += 1
+        if self.max_bytes is not None:
+            size = sys.getsizeof(data)
+            self.nbytes -= size
+            self.evicted_bytes += size
+
+
+class TieredStack(Stack):
+    """A stack that keeps recent items hot and compresses older ones.
+
+    The newest hot_items items (and up to chunk_items more) live in a plain
+    list, so push, pop and shallow undo cost the same as in Stack. Once the
+    list grows past that, its oldest chunk_items items are compacted into
+    one zlib-compressed chunk (packed float64 when every item is a float,
+    pickled otherwise). Chunks are kept in memory or, with cold_dir, in an
+    append-only scratch file there. Popping past the hot items decompresses
+    the newest chunk back into the list in one step. Because chunks leave in
+    LIFO order, the file is simply truncated as they are read back.
+    """
+
+    __slots__ = ("hot", "chunks", "cold_items", "hot_items", "chunk_items", "level", "cold_file")
+
+    def __init__(self, hot_items=1024, chunk_items=4096, level=6, cold_dir=None):
+        """Initialize an empty stack with the given tier sizes."""
+        if hot_items < 0:
+            raise ValueError("hot_items must not be negative")
+        if chunk_items < 1:
+            raise ValueError("chunk_items must be at least 1")
+        self.hot = []
+        self._stale = []
+        self.chunks = []
+        self.cold_items = 0
+        self.hot_items = hot_items
+        self.chunk_items = chunk_items
+        self.level = level
+        self.cold_file = None
+        if cold_dir is not None:
+            # Imported Here So Plain Stack Users Do Not Pay for It at Startup
+            import tempfile
+
+            self.cold_file = tempfile.TemporaryFile(dir=cold_dir)
+
+    @property
+    def items(self):
+        """Every item bottom-to-top, decompressing the cold tier (O(n))."""
+        items = []
+        for chunk in self.chunks:
+            items.extend(self._decode(chunk))
+        items.extend(self.hot)
+        return items
+
+    def push(self, data):
+        """Add an item to the top, compacting the oldest hot items if needed."""
+        self.hot.append(data)
+        if self._stale:
+            self.reclaim(RECLAIM_PER_PUSH)
+        if len(self.hot) > self.hot_items + self.chunk_items:
+            self._compact()
+
+    def push_many(self, items):
+        """Add several items in order; the last one ends up on top."""
+        before = len(self.hot)
+        self.hot.extend(items)
+        if self._stale:
+            self.reclaim(RECLAIM_PER_PUSH * (len(self.hot) - before))
+        while len(self.hot) > self.hot_items + self.chunk_items:
+            self._compact()
+
+    def pop(self):
+        """Remove and return the top item from the stack."""
+        if not self.hot:
+            if not self.chunks:
+                raise IndexError("Empty Stack")
+            self._thaw()
+        return self.hot.pop()
+
+    def pop_many(self, count):
+        """Remove the top count items and return them bottom-to-top."""
+        if count > self.size():
+            raise IndexError("Empty Stack")
+        if count <= 0:
+            return []
+        if len(self.hot) < count:
+            # Decompress Every Chunk Needed, Then Join Them in One Pass
+            thawed = []
+            available = len(self.hot)
+            while available < count:
+                thawed.append(self._take())
+                available += len(thawed[-1])
+            thawed.reverse()
+            hot = []
+            for values in thawed:
+                hot.extend(values)
+            hot.extend(self.hot)
+            self.hot = hot
+        taken = self.hot[-count:]
+        del self.hot[-count:]
+        return taken
+
+    def peek(self):
+        """View the top item without removing it."""
+        if not self.hot:
+            if not self.chunks:
+                raise IndexError("Empty Stack")
+            self._thaw()
+        return self.hot[-1]
+
+    def size(self):
+        """Get the number of items in both tiers."""
+        return len(self.hot) + self.cold_items
+
+    def isEmpty(self):
+        """Check if the stack is empty."""
+        return not self.hot and not self.chunks
+
+    def clear(self):
+        """Remove all items; the hot list is retired like Stack.clear()."""
+        if self.hot:
+            self._stale.append(self.hot)
+            self.hot = []
+        self.chunks = []
+        self.cold_items = 0
+        if self.cold_file is not None:
+            self.cold_file.truncate(0)
+        if self._stale:
+            self.reclaim(RECLAIM_STEP)
+
+    def truncate(self, size):
+        """Drop items above the given size, keeping the bottom size items."""
+        if size == 0:
+            self.clear()
+        elif size < self.size():
+            self.pop_many(self.size() - size)
+
+    def stats(self):
+        """Get tier sizes and the compressed size of the cold tier."""
+        return {
+            "hot_items": len(self.hot),
+            "cold_items": self.cold_items,
+            "chunks": len(self.chunks),
+            "compressed_bytes": sum(chunk[2] for chunk in self.chunks),
+        }
+
+    def _compact(self):
+        """Compress the oldest chunk_items hot items into a new cold chunk."""
+        import pickle
+        import zlib
+
+        count = self.chunk_items
+        values = self.hot[:count]
+        del self.hot[:count]
+
+        if all(value.__class__ is float for value in values):
+            encoding, raw = "d", array("d", values).tobytes()
+        else:
+            encoding, raw = "p", pickle.dumps(values, pickle.HIGHEST_PROTOCOL)
+        payload = zlib.compress(raw, self.level)
+
+        if self.cold_file is not None:
+            self.cold_file.seek(0, 2)
+            offset = self.cold_file.tell()
+            self.cold_file.write(payload)
+            payload = offset
+            length = self.cold_file.tell() - offset
+        else:
+            length = len(payload)
+
+        self.chunks.append((encoding, payload, length, count))
+        self.cold_items += count
+
+    def _thaw(self):
+        """Move the newest cold chunk back under the hot items."""
+        self.hot[:0] = self._take()
+
+    def _take(self):
+        """Remove the newest cold chunk and return its items."""
+        chunk = self.chunks.pop()
+        self.cold_items -= chunk[3]
+        values = self._decode(chunk)
+        if self.cold_file is not None:
+            self.cold_file.truncate(chunk[1])
+        return values
+
+    def _decode(self, chunk):
+        import pickle
+        import zlib
+
+        encoding, payload, length, _ = chunk
+        if self.cold_file is not None:
+            self.cold_file.seek(payload)
+            payload = self.cold_file.read(length)
+        raw = zlib.decompress(payload)
+        if encoding == "d":
+            values = array("d")
+            values.frombytes(raw)
+            return values.tolist()
+        return pickle.loads(raw)
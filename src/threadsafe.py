@@ -0,0 +1,50 @@
+import threading
+
+from src.calculator import Calculator
+
+# Methods That Change State and Must Be Serialized
+WRITERS = ("calculate", "calculate_expression", "calculate_many", "undo", "redo", "undo_to",
+           "play_macro")
+
+
+class ThreadSafeCalculator(Calculator):
+    """A Calculator that can be shared between threads.
+
+    Writers (calculate, undo, redo, ...) are serialized by a re-entrant lock.
+    After every write the result is published as an immutable
+    (version, result) snapshot with a single reference assignment, so
+    get_result() and snapshot() never take the lock and never see a
+    half-finished update.
+    """
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.lock = threading.RLock()
+        self._snapshot = (0, self.current_result)
+
+        # Wrap Whatever Implementations __init__ Selected (Backend, Delta, ...)
+        for name in WRITERS:
+            setattr(self, name, self._serialized(getattr(self, name)))
+
+    def get_result(self):
+        '''Get the latest published result without locking.'''
+
+        return self._snapshot[1]
+
+    def snapshot(self):
+        '''Get the latest published (version, result) pair without locking.'''
+
+        return self._snapshot
+
+    def _serialized(self, method):
+        lock = self.lock
+
+        def serialized(*args, **kwargs):
+            with lock:
+                result = method(*args, **kwargs)
+                self._snapshot = (self._snapshot[0] + 1, self.current_result)
+                return result
+
+        serialized.__name__ = method.__name__
+        serialized.__doc__ = method.__doc__
+        return serialized
@@ -0,0 +1,195 @@
+from src.backends import evaluate_with
+from src.calculator import OPERATORS, Calculator
+from src.expression import compile_expression
+
+
+class Version:
+    """One calculator state in an UndoTree."""
+
+    __slots__ = ("id", "value", "parent", "depth", "jump")
+
+    def __init__(self, version_id, value, parent):
+        self.id = version_id
+        self.value = value
+        self.parent = parent
+
+        if parent is None:
+            self.depth = 0
+            self.jump = self
+        else:
+            # Skew-Binary Jump Pointers Give O(log n) Ancestor Lookups
+            self.depth = parent.depth + 1
+            jump = parent.jump
+            if parent.depth - jump.depth == jump.depth - jump.jump.depth:
+                self.jump = jump.jump
+            else:
+                self.jump = parent
+
+    def __repr__(self):
+        return f"Version({self.id}, {self.value!r}, depth={self.depth})"
+
+
+class UndoTree:
+    """A persistent history that keeps every branch.
+
+    Each version stores only its own value and a link to its parent, so all
+    versions share their common history and a version costs O(1) memory.
+    undo(n), redo(n) and the ancestry checks in goto() walk skew-binary jump
+    pointers and take O(log n) steps no matter how far they move.
+    """
+
+    def __init__(self, value=0):
+        root = Version(0, value, None)
+        self.versions = [root]
+        self.current = root
+        self.tip = root
+
+    def commit(self, value):
+        """Add value as a new child of the current version and move to it."""
+        version = Version(len(self.versions), value, self.current)
+        self.versions.append(version)
+        self.current = self.tip = version
+        return version
+
+    def undo(self, steps=1):
+        """Move steps versions towards the root."""
+        if steps < 1:
+            raise ValueError("steps must be at least 1")
+        if steps > self.current.depth:
+            raise IndexError("No operations to undo")
+        self.current = ancestor(self.current, self.current.depth - steps)
+        return self.current
+
+    def redo(self, steps=1):
+        """Move steps versions back towards the most recently visited tip."""
+        if steps < 1:
+            raise ValueError("steps must be at least 1")
+        if steps > self.tip.depth - self.current.depth:
+            raise IndexError("Cannot redo when redo stack is empty")
+        self.current = ancestor(self.tip, self.current.depth + steps)
+        return self.current
+
+    def goto(self, version_id):
+        """Jump straight to any version on any branch."""
+        if not 0 <= version_id < len(self.versions):
+            raise IndexError(f"No such version: {version_id}")
+        version = self.versions[version_id]
+
+        # Keep the Redo Path When Jumping Back Along It
+        if version.depth > self.tip.depth or ancestor(self.tip, version.depth) is not version:
+            self.tip = version
+        self.current = version
+        return version
+
+
+def ancestor(version, depth):
+    """Get the ancestor of version at the given depth in O(log n) steps."""
+    while version.depth > depth:
+        if version.jump.depth >= depth:
+            version = version.jump
+        else:
+            version = version.parent
+    return version
+
+
+class BranchingCalculator(Calculator):
+    """A Calculator whose history is an UndoTree instead of two stacks.
+
+    A new calculation after an undo starts a new branch and keeps the old
+    one, so goto() can return to any version ever computed. undo(n) and
+    redo(n) move n steps in O(log n).
+    """
+
+    def __init__(self, backend="float", context=None):
+        super().__init__(backend=backend, context=context)
+        self.tree = UndoTree(self.current_result)
+
+        # Drop the Per-Instance Backend Swaps; the Methods Below Handle Backends
+        vars(self).pop("calculate", None)
+        vars(self).pop("calculate_expression", None)
+
+        # The Tree Replaces Both Stacks
+        self.undo_stack = None
+        self.redo_stack = None
+
+    def calculate(self, value1, value2, operator):
+        '''Perform a calculation and record it as a new version.'''
+
+        # Validate Inputs
+        if operator not in OPERATORS:
+            raise ValueError(f"Invalid Operator: {operator}")
+
+        value1 = self.backend.convert(value1)
+        value2 = self.backend.convert(value2)
+
+        if operator == "/" and value2 == 0:
+            raise ValueError("Cannot divide by zero")
+
+        return self._commit(self.backend.apply(value1, value2, operator))
+
+    def calculate_expression(self, expression):
+        '''Evaluate an infix expression and record it as a new version.'''
+
+        return self._commit(evaluate_with(compile_expression(expression), self.backend))
+
+    def calculate_many(self, values1, values2, operators):
+        '''Perform a batch of calculations, recording one version per valid row.'''
+
+        if self.backend.name != "float":
+            raise ValueError("calculate_many only supports the float backend")
+
+        results, errors, valid = self._calculate_batch(values1, values2, operators)
+        for result in valid:
+            self._commit(result)
+        return results, errors
+
+    def play_macro(self, name, value=None, per_step=False):
+        '''Replay macro name from value as one version, or one per step when per_step.'''
+
+        macro = self._macro(name)
+        value = self.current_result if value is None else self.backend.convert(value)
+
+        if per_step:
+            for result in macro.run_steps(value)[1:]:
+                self._commit(result)
+            return self.current_result
+        return self._commit(macro.run(value))
+
+    def undo(self, steps=1):
+        '''Undo the last steps calculations.'''
+
+        self.current_result = self.tree.undo(steps).value
+        return self.current_result
+
+    def redo(self, steps=1):
+        '''Redo steps undone calculations along the current branch.'''
+
+        self.current_result = self.tree.redo(steps).value
+        return self.current_result
+
+    def undo_to(self, predicate):
+        '''Undo back to the most recent earlier result satisfying predicate.'''
+
+        version = self.tree.current.parent
+        while version is not None:
+            if predicate(version.value):
+                return self.undo(self.tree.current.depth - version.depth)
+            version = version.parent
+        raise IndexError("No earlier result matches")
+
+    def goto(self, version_id):
+        '''Restore the result of any earlier version, on any branch.'''
+
+        self.current_result = self.tree.goto(version_id).value
+        return self.current_result
+
+    @property
+    def version(self):
+        '''The id of the current version.'''
+
+        return self.tree.current.id
+
+    def _commit(self, result):
+        self.tree.commit(result)
+        self.current_result = result
+        return result
@@ -0,0 +1,166 @@
+import re
+
+from src.backends import evaluate_with
+from src.calculator import Calculator
+from src.expression import NAME, compile_expression, evaluate
+from src.pmap import PersistentMap
+from src.stack import ArrayStack
+
+VARIABLE_NAME = re.compile(NAME)
+
+
+class State:
+    '''An undo entry for a step that changed the memory register or variables.'''
+
+    __slots__ = ("result", "memory", "variables")
+
+    def __init__(self, result, memory, variables):
+        self.result = result
+        self.memory = memory
+        self.variables = variables
+
+    def __repr__(self):
+        return f"State({self.result!r}, memory={self.memory!r}, variables={len(self.variables)})"
+
+
+class VariableCalculator(Calculator):
+    """A Calculator with an M+/M-/MR memory register and named variables.
+
+    Variables are set with let() and can be used by name in
+    calculate_expression(). Undo and redo cover the register and the
+    variables as well as the result.
+
+    Steps that only change the result keep the plain entries Calculator
+    uses. Steps that change the register or a variable push a State, which
+    holds the previous register and variables. Variables live in a
+    PersistentMap, so a State shares every unchanged entry with its
+    neighbours and each let() adds only O(log n) memory to the history,
+    not a copy of the whole table.
+    """
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        if self.history_mode != "snapshot":
+            raise ValueError("Variables need history_mode='snapshot'")
+        if isinstance(self.undo_stack, ArrayStack) or isinstance(self.redo_stack, ArrayStack):
+            raise ValueError("Variables need an object stack (not ArrayStack)")
+
+        self.memory = self.backend.zero
+        self.variables = PersistentMap()
+
+        # The Method Below Handles Backends Itself
+        vars(self).pop("calculate_expression", None)
+
+    def calculate_expression(self, expression):
+        '''Evaluate an infix expression, which may use variables, as one undoable step.'''
+
+        result = self._evaluate(expression)
+
+        self.undo_stack.push(self.current_result)
+        self.redo_stack.clear()
+
+        self.current_result = result
+        return result
+
+    def let(self, name, expression):
+        '''Set variable name to the value of expression (a number or infix text).'''
+
+        if not VARIABLE_NAME.fullmatch(name):
+            raise ValueError(f"Invalid variable name: {name}")
+
+        if isinstance(expression, str):
+            value = self._evaluate(expression)
+        else:
+            value = self.backend.convert(expression)
+
+        self._change(self.memory, self.variables.set(name, value))
+        return value
+
+    def forget(self, name):
+        '''Remove variable name.'''
+
+        if name not in self.variables:
+            raise ValueError(f"Unknown variable: {name}")
+        self._change(self.memory, self.variables.delete(name))
+
+    def memory_add(self):
+        '''M+: add the current result to the memory register.'''
+
+        self._change(self.backend.apply(self.memory, self.current_result, "+"), self.variables)
+        return self.memory
+
+    def memory_subtract(self):
+        '''M-: subtract the current result from the memory register.'''
+
+        self._change(self.backend.apply(self.memory, self.current_result, "-"), self.variables)
+        return self.memory
+
+    def memory_clear(self):
+        '''MC: reset the memory register to 0.'''
+
+        self._change(self.backend.zero, self.variables)
+        return self.memory
+
+    def memory_recall(self):
+        '''MR: make the memory register the current result, as one undoable step.'''
+
+        self.undo_stack.push(self.current_result)
+        self.redo_stack.clear()
+
+        self.current_result = self.memory
+        return self.current_result
+
+    def undo(self, steps=1):
+        '''Undo the last steps operations, including register and variable changes.'''
+
+        if steps < 1:
+            raise ValueError("steps must be at least 1")
+        if steps > self.undo_stack.size():
+            raise IndexError("No operations to undo")
+
+        for _ in range(steps):
+            self.redo_stack.push(self._restore(self.undo_stack.pop()))
+        return self.current_result
+
+    def redo(self, steps=1):
+        '''Redo the last steps undone operations.'''
+
+        if steps < 1:
+            raise ValueError("steps must be at least 1")
+        if steps > self.redo_stack.size():
+            raise IndexError("Cannot redo when redo stack is empty")
+
+        for _ in range(steps):
+            self.undo_stack.push(self._restore(self.redo_stack.pop()))
+        return self.current_result
+
+    def _evaluate(self, expression):
+        program = compile_expression(expression)
+        if self.backend.name == "float":
+            return evaluate(program, self.variables)
+        return evaluate_with(program, self.backend, self.variables)
+
+    def _change(self, memory, variables):
+        """Record a register/variable change as one undoable step."""
+        self.undo_stack.push(State(self.current_result, self.memory, self.variables))
+        self.redo_stack.clear()
+
+        self.memory = memory
+        self.variables = variables
+
+    def _restore(self, entry):
+        """Make entry the current state and return the entry that undoes it."""
+        if entry.__class__ is State:
+            previous = State(self.current_result, self.memory, self.variables)
+            self.current_result = entry.result
+            self.memory = entry.memory
+            self.variables = entry.variables
+            return previous
+
+        previous = self.current_result
+        self.current_result = entry
+        return previous
+
+    def _undo_values(self):
+        for entry in reversed(self.undo_stack.items):
+            yield entry.result if entry.__class__ is State else entry
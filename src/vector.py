@@ -0,0 +1,137 @@
+import tempfile
+
+import numpy as np
+
+from src.calculator import OPERATORS, Calculator
+from src.stack import Stack
+
+# What Division Does With Zero Divisor Elements
+ZERO_POLICIES = ("raise", "nan", "ieee")
+
+UFUNCS = {"+": np.add, "-": np.subtract, "*": np.multiply, "/": np.true_divide}
+
+
+class SpillingStack(Stack):
+    """A stack that moves large arrays to memory-mapped scratch files.
+
+    Arrays of at least spill_bytes are written to an unlinked temporary
+    file in spill_dir and replaced by a read-only np.memmap of it, so deep
+    histories of big results live on disk and are paged in only when undo
+    or redo brings them back. The file is freed with the last reference.
+    """
+
+    __slots__ = ("spill_bytes", "spill_dir", "spilled", "spilled_bytes")
+
+    def __init__(self, spill_bytes, spill_dir=None):
+        """Initialize an empty stack spilling arrays of at least spill_bytes."""
+        if spill_bytes < 1:
+            raise ValueError("spill_bytes must be at least 1")
+        super().__init__()
+        self.spill_bytes = spill_bytes
+        self.spill_dir = spill_dir
+        self.spilled = 0
+        self.spilled_bytes = 0
+
+    def push(self, data):
+        """Add an item to the top, spilling it first if it is a large array."""
+        self.items.append(self._spill(data))
+
+    def push_many(self, items):
+        """Add several items in order; the last one ends up on top."""
+        self.items.extend([self._spill(data) for data in items])
+
+    def _spill(self, data):
+        if data.__class__ is not np.ndarray or data.nbytes < self.spill_bytes:
+            return data
+
+        with tempfile.TemporaryFile(dir=self.spill_dir) as scratch:
+            data.tofile(scratch)
+            scratch.flush()
+            spilled = np.memmap(scratch, dtype=data.dtype, mode="r", shape=data.shape)
+
+        self.spilled += 1
+        self.spilled_bytes += data.nbytes
+        return spilled
+
+
+class VectorCalculator(Calculator):
+    """A Calculator whose operands may be NumPy arrays.
+
+    Array operands are combined element-wise with broadcasting. Each result
+    is computed by one ufunc writing into a buffer allocated up front, so no
+    temporaries are made. The result is then frozen read-only, which lets
+    the same array be returned, kept as current_result and pushed onto the
+    history without ever being copied.
+
+    zero_policy decides what dividing by an array with zero elements does:
+    "raise" (ValueError, like scalars), "nan" (those elements become NaN)
+    or "ieee" (IEEE 754 inf/NaN). spill_bytes, when set, moves history
+    entries of at least that size to memory-mapped files in spill_dir.
+    Scalar operands take the ordinary Calculator path.
+    """
+
+    def __init__(self, zero_policy="raise", spill_bytes=None, spill_dir=None, **options):
+        if zero_policy not in ZERO_POLICIES:
+            raise ValueError(f"Invalid Zero Policy: {zero_policy}")
+        if options.get("history_mode", "snapshot") != "snapshot":
+            raise ValueError("Array operands need history_mode='snapshot'")
+        if options.get("backend", "float") != "float":
+            raise ValueError("Array operands need the float backend")
+        if options.get("cache_size") is not None:
+            raise ValueError("Array results cannot be cached")
+        if spill_bytes is not None and (
+                options.get("history_limit") is not None or options.get("history_bytes") is not None):
+            raise ValueError("spill_bytes cannot be combined with a bounded history")
+
+        super().__init__(**options)
+        self.zero_policy = zero_policy
+        if spill_bytes is not None:
+            self.undo_stack = SpillingStack(spill_bytes, spill_dir)
+            self.redo_stack = SpillingStack(spill_bytes, spill_dir)
+
+    def calculate(self, value1, value2, operator):
+        '''Perform a calculation on scalars or arrays and store it in the undo stack.'''
+
+        if not isinstance(value1, np.ndarray) and not isinstance(value2, np.ndarray):
+            return super().calculate(value1, value2, operator)
+
+        # Validate Inputs
+        if operator not in OPERATORS:
+            raise ValueError(f"Invalid Operator: {operator}")
+
+        value1 = np.asarray(value1)
+        value2 = np.asarray(value2)
+        shape = np.broadcast_shapes(value1.shape, value2.shape)
+
+        zeros = None
+        if operator == "/":
+            zeros = value2 == 0
+            if not zeros.any():
+                zeros = None
+            elif self.zero_policy == "raise":
+                raise ValueError("Cannot divide by zero")
+
+        # One Preallocated Output Buffer, Filled in Place by a Single ufunc
+        dtype = np.result_type(value1, value2, 1.0) if operator == "/" else np.result_type(value1, value2)
+        result = np.empty(shape, dtype)
+        ufunc = UFUNCS[operator]
+
+        if zeros is None:
+            ufunc(value1, value2, out=result)
+        else:
+            # Unmasked Division Is Faster Than where=; Zero Slots Are Fixed After
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ufunc(value1, value2, out=result)
+            if self.zero_policy == "nan":
+                np.copyto(result, np.nan, where=zeros)
+
+        result.flags.writeable = False
+
+        # Store Previous Result Before Calculating
+        self.undo_stack.push(self.current_result)
+
+        # Clear Redo Stack When New Calculation is Performed
+        self.redo_stack.clear()
+
+        self.current_result = result
+        return result
@@ -0,0 +1,104 @@
+import decimal
+from fractions import Fraction
+
+import pytest
+from src.backends import DecimalBackend, FloatBackend, get_backend
+from src.calculator import Calculator
+from src.stack import ArrayStack
+
+
+class TestBackendSelection:
+    """Test choosing a numeric backend."""
+    
+    def test_default_is_float(self):
+        """Test the float backend leaves the class methods in place."""
+        calc = Calculator()
+        assert isinstance(calc.backend, FloatBackend)
+        assert "calculate" not in vars(calc)
+    
+    def test_invalid_backend(self):
+        """Test unknown backends are rejected."""
+        with pytest.raises(ValueError, match="Invalid Backend"):
+            Calculator(backend="complex")
+    
+    def test_context_only_for_decimal(self):
+        """Test a context with a non-decimal backend is rejected."""
+        with pytest.raises(ValueError, match="context"):
+            get_backend("fraction", decimal.Context())
+    
+    def test_array_stack_only_for_float(self):
+        """Test exact backends refuse ArrayStack, which would turn history into floats."""
+        for backend in ("decimal", "fraction"):
+            with pytest.raises(ValueError, match="object stack"):
+                Calculator(backend=backend, stack_type=ArrayStack)
+            with pytest.raises(ValueError, match="object stack"):
+                Calculator(backend=backend, history_limit=10, stack_type=ArrayStack)
+        assert isinstance(Calculator(stack_type=ArrayStack).undo_stack, ArrayStack)
+
+class TestDecimalBackend:
+    """Test decimal.Decimal arithmetic."""
+    
+    def test_exact_decimal_addition(self):
+        """Test 0.1 + 0.2 is exactly 0.3."""
+        calc = Calculator(backend="decimal")
+        assert calc.calculate(0.1, 0.2, '+') == decimal.Decimal("0.3")
+    
+    def test_context_precision(self):
+        """Test the configured context controls rounding."""
+        calc = Calculator(backend="decimal", context=decimal.Context(prec=5))
+        assert calc.calculate(1, 3, '/') == decimal.Decimal("0.33333")
+        assert isinstance(calc.backend, DecimalBackend)
+    
+    def test_undo_restores_decimal_zero(self):
+        """Test the initial state uses the backend's zero."""
+        calc = Calculator(backend="decimal")
+        calc.calculate(2, 3, '*')
+        result = calc.undo()
+        assert result == 0 and isinstance(result, decimal.Decimal)
+    
+    def test_expression(self):
+        """Test expressions evaluate with decimal arithmetic."""
+        calc = Calculator(backend="decimal")
+        assert calc.calculate_expression("0.1 + 0.2 * -1") == decimal.Decimal("-0.1")
+
+
+class TestFractionBackend:
+    """Test exact rational arithmetic."""
+    
+    def test_exact_thirds(self):
+        """Test 1/3 * 3 is exactly 1."""
+        calc = Calculator(backend="fraction")
+        third = calc.calculate(1, 3, '/')
+        assert third == Fraction(1, 3)
+        assert calc.calculate(third, 3, '*') == 1
+    
+    def test_string_inputs(self):
+        """Test fraction strings are accepted."""
+        calc = Calculator(backend="fraction")
+        assert calc.calculate("1/3", "1/6", '+') == Fraction(1, 2)
+    
+    def test_validation(self):
+        """Test operator and zero checks still apply."""
+        calc = Calculator(backend="fraction")
+        with pytest.raises(ValueError, match="Invalid Operator"):
+            calc.calculate(1, 2, '%')
+        with pytest.raises(ValueError, match="Cannot divide by zero"):
+            calc.calculate(1, 0.0, '/')
+        with pytest.raises(ValueError, match="Cannot divide by zero"):
+            calc.calculate_expression("1/(2-2)")
+        assert calc.undo_stack.isEmpty()
+    
+    def test_delta_mode_with_exact_backend(self):
+        """Test delta history works on top of a non-float backend."""
+        calc = Calculator(backend="fraction", history_mode="delta")
+        calc.calculate(0, "1/3", '+')
+        calc.calculate(Fraction(1, 3), 7, '/')
+        assert calc.undo() == Fraction(1, 3)
+        assert calc.undo() == 0
+        assert calc.redo() == Fraction(1, 3)
+    
+    def test_batch_requires_float(self):
+        """Test calculate_many rejects non-float backends."""
+        calc = Calculator(backend="fraction")
+        with pytest.raises(ValueError, match="float backend"):
+            calc.calculate_many([1], [2], [0])
@@ -0,0 +1,68 @@
+import math
+
+import pytest
+from src import calculator as calculator_module
+from src.calculator import Calculator
+
+
+@pytest.fixture(params=["numpy", "python"])
+def calc(request, monkeypatch):
+    """Run each batch test against both the NumPy and pure-Python kernels."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(calculator_module, "np", None)
+    return Calculator()
+
+
+class TestCalculateMany:
+    """Test the columnar batch API."""
+    
+    def test_results_match_scalar_operations(self, calc):
+        """Test each operator code computes the same value as calculate()."""
+        results, errors = calc.calculate_many([5, 10, 7, 7], [3, 4, 6, 2], [0, 1, 2, 3])
+        assert list(results) == [8.0, 6.0, 42.0, 3.5]
+        assert not any(errors)
+    
+    def test_divide_by_zero_sets_error_mask(self, calc):
+        """Test division by zero flags the row instead of aborting the batch."""
+        results, errors = calc.calculate_many([1, 4, 9], [1, 0, 3], [3, 3, 3])
+        assert list(errors) == [False, True, False]
+        assert results[0] == 1.0
+        assert math.isnan(results[1])
+        assert results[2] == 3.0
+    
+    def test_history_records_each_valid_row(self, calc):
+        """Test undo walks back one row at a time, skipping error rows."""
+        calc.calculate(1, 1, '+')  # Result: 2
+        calc.calculate_many([5, 1, 10], [3, 0, 5], [0, 3, 2])
+        assert calc.get_result() == 50
+        assert calc.undo() == 8
+        assert calc.undo() == 2
+        assert calc.undo() == 0
+    
+    def test_batch_clears_redo_stack(self, calc):
+        """Test a batch counts as a new calculation for redo purposes."""
+        calc.calculate(5, 3, '+')
+        calc.undo()
+        calc.calculate_many([1], [2], [0])
+        with pytest.raises(IndexError, match="Cannot redo"):
+            calc.redo()
+    
+    def test_all_rows_invalid_leaves_state_untouched(self, calc):
+        """Test a batch with no valid rows records no history."""
+        calc.calculate(5, 3, '+')
+        calc.calculate_many([1, 2], [0, 0], [3, 3])
+        assert calc.get_result() == 8
+        assert calc.undo_stack.size() == 1
+    
+    def test_invalid_operator_code(self, calc):
+        """Test unknown operator codes raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid Operator code"):
+            calc.calculate_many([1], [2], [7])
+        assert calc.undo_stack.isEmpty()
+    
+    def test_mismatched_lengths(self, calc):
+        """Test columns of different lengths raise ValueError."""
+        with pytest.raises(ValueError, match="equal length"):
+            calc.calculate_many([1, 2], [2], [0, 0])
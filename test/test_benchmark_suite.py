@@ -0,0 +1,44 @@
+import json
+
+import pytest
+from benchmarks.suite import SCENARIOS, compare, main, run_suite
+
+
+class TestBenchmarkSuite:
+    """Test the benchmark suite's results format and regression gate."""
+
+    def test_run_suite(self):
+        """Test every scenario runs and reports its numbers."""
+        results = run_suite(size=200, repeat=1)
+        assert results["size"] == 200
+        assert set(results["scenarios"]) == set(SCENARIOS)
+        for stats in results["scenarios"].values():
+            assert stats["seconds"] >= 0
+            assert stats["operations"] > 0
+        assert results["scenarios"]["deep_history"]["peak_bytes"] > 0
+
+    def test_compare_flags_slowdowns(self):
+        """Test only scenarios beyond the threshold are reported."""
+        baseline = {"size": 10, "scenarios": {"a": {"seconds": 1.0}, "b": {"seconds": 1.0}}}
+        results = {"size": 10, "scenarios": {"a": {"seconds": 1.2}, "b": {"seconds": 1.5},
+                                             "c": {"seconds": 9.0}}}
+        assert compare(results, baseline, threshold=0.25) == [("b", 1.0, 1.5, 0.5)]
+        assert compare(results, baseline, threshold=0.1)[0][0] == "a"
+
+    def test_compare_rejects_other_sizes(self):
+        """Test runs at different sizes are not comparable."""
+        with pytest.raises(ValueError, match="different size"):
+            compare({"size": 1, "scenarios": {}}, {"size": 2, "scenarios": {}})
+
+    def test_gate_exit_status(self, tmp_path, capsys):
+        """Test main writes JSON and fails against a much faster baseline."""
+        output = tmp_path / "results.json"
+        assert main(["--size", "100", "--repeat", "1", "--only", "push_pop",
+                     "--output", str(output)]) == 0
+
+        baseline = json.loads(output.read_text())
+        baseline["scenarios"]["push_pop"]["seconds"] /= 1000
+        output.write_text(json.dumps(baseline))
+        assert main(["--size", "100", "--repeat", "1", "--only", "push_pop",
+                     "--baseline", str(output)]) == 1
+        assert "REGRESSION push_pop" in capsys.readouterr().out
@@ -0,0 +1,111 @@
+import pytest
+from src.cache import MISSING, LFUCache, LRUCache
+from src.calculator import Calculator
+
+
+class TestLRUCache:
+    """Test least-recently-used eviction."""
+    
+    def test_evicts_least_recently_used(self):
+        """Test a recently read key survives eviction."""
+        cache = LRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert cache.get('a') == 1
+        cache.put('c', 3)
+        assert cache.get('b') is MISSING
+        assert cache.get('a') == 1
+        assert cache.stats() == {
+            "size": 2, "maxsize": 2, "hits": 2, "misses": 1,
+            "evictions": 1, "hit_rate": 2 / 3,
+        }
+    
+    def test_invalid_size(self):
+        """Test a cache must hold at least one entry."""
+        with pytest.raises(ValueError):
+            LRUCache(0)
+
+
+class TestLFUCache:
+    """Test least-frequently-used eviction."""
+    
+    def test_evicts_least_frequently_used(self):
+        """Test frequently read keys survive and ties evict the oldest."""
+        cache = LFUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.get('a')
+        cache.put('c', 3)          # Evicts b (1 use) rather than a (3 uses)
+        assert cache.get('b') is MISSING
+        assert cache.get('a') == 1
+        cache.put('d', 4)          # Evicts c, the only key used once
+        assert cache.get('c') is MISSING
+        assert cache.evictions == 2
+    
+    def test_update_existing_key(self):
+        """Test putting an existing key replaces its value without evicting."""
+        cache = LFUCache(1)
+        cache.put('a', 1)
+        cache.put('a', 2)
+        assert cache.get('a') == 2
+        assert cache.evictions == 0
+
+
+class TestCalculatorCache:
+    """Test memoized calculate()."""
+    
+    def test_hits_keep_undo_semantics(self):
+        """Test cached results are recorded in history like computed ones."""
+        calc = Calculator(cache_size=16)
+        calc.calculate(5, 3, '+')
+        calc.calculate(2, 2, '*')
+        calc.calculate(5, 3, '+')          # Cache hit
+        assert calc.cache.hits == 1
+        assert calc.undo() == 4
+        assert calc.undo() == 8
+        assert calc.undo() == 0
+        assert calc.redo() == 8
+    
+    def test_hit_clears_redo(self):
+        """Test a cache hit still clears the redo stack."""
+        calc = Calculator(cache_size=16)
+        calc.calculate(5, 3, '+')
+        calc.undo()
+        calc.calculate(5, 3, '+')
+        assert calc.cache.hits == 1
+        with pytest.raises(IndexError, match="Cannot redo"):
+            calc.redo()
+    
+    def test_types_are_part_of_key(self):
+        """Test int and float operands do not share entries."""
+        calc = Calculator(cache_size=16)
+        assert isinstance(calc.calculate(1, 2, '+'), int)
+        assert isinstance(calc.calculate(1.0, 2.0, '+'), float)
+        assert calc.cache.hits == 0
+    
+    def test_zero_operands_bypass_cache(self):
+        """Test signed zeros are never served from the cache."""
+        calc = Calculator(cache_size=16)
+        calc.calculate(5.0, 0.0, '*')
+        assert str(calc.calculate(5.0, -0.0, '*')) == "-0.0"
+        assert len(calc.cache) == 0
+    
+    def test_invalid_operations_are_not_cached(self):
+        """Test validation errors still raise every time."""
+        calc = Calculator(cache_size=16, cache_policy="lfu")
+        for _ in range(2):
+            with pytest.raises(ValueError, match="Invalid Operator"):
+                calc.calculate(1, 2, '%')
+        assert len(calc.cache) == 0
+    
+    def test_invalid_policy(self):
+        """Test unknown cache policies are rejected."""
+        with pytest.raises(ValueError, match="Invalid Cache Policy"):
+            Calculator(cache_size=4, cache_policy="fifo")
+    
+    def test_no_cache_by_default(self):
+        """Test the default calculator runs the uncached method."""
+        calc = Calculator()
+        assert calc.cache is None
+        assert "calculate" not in vars(calc)
@@ -0,0 +1,63 @@
+import math
+
+import pytest
+from src.calculator import Calculator
+from src.executor import run_chains
+
+
+def reference(start, chain):
+    """Run a chain on a plain Calculator."""
+    calc = Calculator()
+    result = start
+    for operator, operand in chain:
+        result = calc.calculate(result, operand, operator)
+    return result, list(calc.undo_stack.items)
+
+
+CHAINS = [
+    [("+", 3), ("*", 2), ("-", 1)],
+    [("/", 4), ("+", 0.5)],
+    [],
+    [("*", 10)] * 5,
+]
+STARTS = [1.0, 10.0, 7.0, 2.0]
+
+
+class TestRunChains:
+    """Test sharded chain evaluation."""
+    
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_results_match_calculator(self, workers):
+        """Test in-process and pooled runs match a plain Calculator."""
+        results, errors, histories = run_chains(STARTS, CHAINS, workers=workers,
+                                                with_history=True)
+        for i, (start, chain) in enumerate(zip(STARTS, CHAINS)):
+            expected, history = reference(start, chain)
+            assert results[i] == expected
+            assert list(histories[i]) == history
+        assert list(errors) == [0, 0, 0, 0]
+    
+    def test_history_is_optional(self):
+        """Test histories are omitted unless requested."""
+        results, _, histories = run_chains(STARTS, CHAINS, workers=0)
+        assert histories is None
+        assert list(results) == [7.0, 3.0, 7.0, 200000.0]
+    
+    def test_failed_chain_is_flagged(self):
+        """Test a chain dividing by zero is flagged without stopping others."""
+        results, errors, _ = run_chains([1.0, 2.0], [[("/", 0)], [("+", 1)]], workers=0)
+        assert list(errors) == [1, 0]
+        assert math.isnan(results[0])
+        assert results[1] == 3.0
+    
+    def test_invalid_input(self):
+        """Test bad operators and mismatched starts raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid Operator"):
+            run_chains([1.0], [[("%", 2)]], workers=0)
+        with pytest.raises(ValueError, match="start value"):
+            run_chains([1.0, 2.0], [[]], workers=0)
+    
+    def test_no_chains(self):
+        """Test an empty workload returns empty results."""
+        results, errors, histories = run_chains([], [], workers=0, with_history=True)
+        assert len(results) == 0 and len(errors) == 0 and histories == []
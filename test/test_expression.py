@@ -0,0 +1,89 @@
+import pytest
+from src.calculator import Calculator
+from src.expression import NEGATE, compile_expression, evaluate
+
+
+def calc_value(text):
+    """Compile and evaluate an expression."""
+    return evaluate(compile_expression(text))
+
+
+class TestExpressionParsing:
+    """Test tokenizing and compiling infix expressions."""
+    
+    def test_compiles_to_postfix(self):
+        """Test precedence produces the expected postfix program."""
+        assert compile_expression("1+2*3") == (1.0, 2.0, 3.0, "*", "+")
+    
+    def test_unary_minus(self):
+        """Test a leading or nested minus compiles to NEGATE."""
+        assert compile_expression("-2") == (2.0, NEGATE)
+        assert calc_value("2*-3") == -6
+        assert calc_value("-(2+3)") == -5
+        assert calc_value("+4") == 4
+    
+    def test_compiled_programs_are_cached(self):
+        """Test repeated expression text reuses the compiled program."""
+        assert compile_expression("(1+2)*3") is compile_expression("(1+2)*3")
+    
+    def test_invalid_operator(self):
+        """Test unknown symbols raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid Operator"):
+            compile_expression("5 % 3")
+    
+    def test_malformed_expressions(self):
+        """Test syntax errors raise ValueError."""
+        for text in ["1 +", "* 2", "1 2", "()", "(1", "1)", ""]:
+            with pytest.raises(ValueError):
+                compile_expression(text)
+
+
+class TestExpressionEvaluation:
+    """Test evaluating compiled programs."""
+    
+    def test_precedence_and_parentheses(self):
+        """Test operator precedence and grouping."""
+        assert calc_value("(3+4)*2/7") == 2
+        assert calc_value("3+4*2/8") == 4
+        assert calc_value("10-4-3") == 3
+        assert calc_value("16/4/2") == 2
+    
+    def test_number_forms(self):
+        """Test decimals and exponents."""
+        assert calc_value("1.5 * .5") == 0.75
+        assert calc_value("1e3 + 2.5E-1") == 1000.25
+    
+    def test_division_by_zero(self):
+        """Test dividing by zero raises like Calculator.calculate."""
+        with pytest.raises(ValueError, match="Cannot divide by zero"):
+            calc_value("1/(2-2)")
+
+
+class TestCalculateExpression:
+    """Test expressions recorded in Calculator history."""
+    
+    def test_expression_is_one_undo_step(self):
+        """Test a whole expression is undone in one step."""
+        calc = Calculator()
+        calc.calculate(1, 1, '+')
+        assert calc.calculate_expression("(3+4)*2") == 14
+        assert calc.undo() == 2
+        assert calc.redo() == 14
+    
+    def test_invalid_expression_leaves_history_untouched(self):
+        """Test a failed expression records nothing."""
+        calc = Calculator()
+        with pytest.raises(ValueError):
+            calc.calculate_expression("1/0")
+        assert calc.undo_stack.isEmpty()
+
+
+class TestNumberFastPath:
+    """Test the compile fast path for plain numbers and single operations."""
+    
+    def test_simple_forms(self):
+        """Test simple forms compile straight to programs."""
+        assert compile_expression("42") == (42.0,)
+        assert compile_expression(" 1.5e3 * .5 ") == (1500.0, 0.5, "*")
+        assert compile_expression("-3") == (3.0, NEGATE)
+        assert compile_expression("1 + 2 * 3") == (1.0, 2.0, 3.0, "*", "+")
@@ -0,0 +1,149 @@
+import pytest
+from src.calculator import Calculator
+from src.fuzz import (CALCULATORS, DEFAULT_RATIOS, FuzzFailure, Model, check, execute,
+                      generate, main, parse_ratios, throughput)
+from src.lazy import LazyCalculator
+from src.stack import TieredStack
+
+DEEP = {"calc": 0.7, "undo": 0.15, "redo": 0.15}
+
+
+class RedoManyBug(Calculator):
+    """Redoes one step too few when asked for several."""
+
+    def redo(self, steps=1):
+        if steps > 1:
+            steps -= 1
+        return super().redo(steps)
+
+
+class TestGenerate:
+    """Test the seeded operation generator."""
+
+    def test_same_seed_same_sequence(self):
+        """Test a seed always produces the same operations."""
+        assert list(generate(5, 500)) == list(generate(5, 500))
+        assert list(generate(5, 500)) != list(generate(6, 500))
+
+    def test_ratios_and_steps(self):
+        """Test only weighted kinds appear and steps stay within max_steps."""
+        operations = list(generate(1, 2000, {"calc": 1, "undo": 1}, max_steps=3))
+        kinds = {operation[0] for operation in operations}
+        assert kinds == {"calc", "undo"}
+        assert all(1 <= operation[1] <= 3 for operation in operations if operation[0] == "undo")
+
+    def test_invalid_ratios(self):
+        """Test unknown kinds and all-zero weights are rejected."""
+        with pytest.raises(ValueError, match="Invalid operation kind"):
+            list(generate(0, 1, {"square": 1}))
+        with pytest.raises(ValueError, match="not all zero"):
+            list(generate(0, 1, {"calc": 0}))
+
+    def test_parse_ratios(self):
+        """Test CLI ratio text fills in missing kinds with zero."""
+        assert parse_ratios("calc=6, undo=2") == {"calc": 6.0, "chain": 0.0, "undo": 2.0, "redo": 0.0,
+                                                 "clear": 0.0}
+        with pytest.raises(ValueError, match="Invalid ratio"):
+            parse_ratios("calc")
+
+
+class TestModel:
+    """Test the reference model mirrors Calculator's rules."""
+
+    def test_undo_redo_cursor(self):
+        """Test undo/redo move a cursor and a calculation drops redo."""
+        model = Model(Calculator().backend)
+        model.calculate(0, 5, "+")
+        model.calculate(5, 2, "*")
+        assert model.undo(2) == 0
+        assert model.redo() == 5
+        model.calculate(5, 1, "-")
+        with pytest.raises(IndexError):
+            model.redo()
+        with pytest.raises(ValueError, match="Cannot divide by zero"):
+            model.calculate(1, 0, "/")
+
+    def test_history_limit(self):
+        """Test a limited model forgets the oldest results."""
+        model = Model(Calculator().backend, history_limit=2)
+        for _ in range(5):
+            model.calculate(model.get_result(), 1, "+")
+        assert model.undo(2) == 3
+        with pytest.raises(IndexError):
+            model.undo()
+
+
+class TestCheck:
+    """Test calculators against the model on random sequences."""
+
+    @pytest.mark.parametrize("name", sorted(CALCULATORS))
+    def test_calculators_match_model(self, name):
+        """Test every CLI configuration agrees with the model."""
+        for seed in range(3):
+            assert check(CALCULATORS[name], seed, 2000) == 2000
+            check(CALCULATORS[name], seed, 2000, DEEP, max_steps=20)
+
+    def test_lazy_chains_match_model(self):
+        """Test chain() with undo/redo inside and across the pending chain."""
+        for seed in range(3):
+            check(LazyCalculator, seed, 5000, {"chain": 0.6, "calc": 0.05, "undo": 0.2, "redo": 0.15},
+                  max_steps=8)
+        assert check(LazyCalculator, 0, 1000, {"chain": 1}) == 1000
+
+    def test_deep_tiered_and_bounded_histories(self):
+        """Test compaction and eviction paths under long random runs."""
+        check(lambda: Calculator(stack_type=lambda: TieredStack(hot_items=4, chunk_items=8)),
+              seed=1, count=5000, ratios=DEEP, max_steps=40)
+        check(lambda: Calculator(history_limit=16), seed=2, count=5000, ratios=DEEP, max_steps=10)
+
+    def test_finds_and_shrinks_a_bug(self):
+        """Test a wrong multi-step redo is caught and reduced to a short replay."""
+        with pytest.raises(FuzzFailure) as failure:
+            check(RedoManyBug, seed=0, count=5000)
+        operations = failure.value.operations
+        assert len(operations) < 10
+        assert operations[-1][0] == "redo" and operations[-1][1] > 1
+
+        # The Shrunk Sequence Reproduces the Failure on Its Own
+        calc, model = RedoManyBug(), Model(Calculator().backend)
+        outcomes = []
+        for operation in operations:
+            outcome = []
+            for target in (calc, model):
+                try:
+                    outcome.append(execute(target, operation, RedoManyBug)[1])
+                except (ValueError, IndexError) as e:
+                    outcome.append(type(e))
+            outcomes.append(outcome)
+        assert all(a == b for a, b in outcomes[:-1])
+        assert outcomes[-1][0] != outcomes[-1][1]
+
+
+class TestThroughput:
+    """Test the load-generator side of the harness."""
+
+    def test_reports_rate_and_memory(self):
+        """Test throughput returns counts, a rate and traced peak memory."""
+        stats = throughput(seed=3, count=20_000)
+        assert stats["ops"] == 20_000
+        assert stats["ops_per_sec"] > 0
+        assert 0 < stats["errors"] < 20_000
+        assert stats["peak_bytes"] > 0
+        assert "peak_bytes" not in throughput(count=100, trace_memory=False)
+
+    def test_main(self, capsys):
+        """Test the CLI checks, reports and fails on a bad calculator."""
+        assert main(["--count", "2000", "--check", "--calculator", "delta"]) == 0
+        out = capsys.readouterr().out
+        assert "against the model: OK" in out and "ops/s" in out and "peak traced memory" in out
+
+        CALCULATORS["buggy"] = RedoManyBug
+        try:
+            assert main(["--count", "2000", "--check", "--calculator", "buggy", "--no-memory"]) == 1
+        finally:
+            del CALCULATORS["buggy"]
+        assert capsys.readouterr().out.startswith("FAIL seed 0:")
+
+    def test_default_ratios_cover_every_kind(self):
+        """Test the default mix exercises all four operations."""
+        assert {operation[0] for operation in generate(0, 1000)} == set(DEFAULT_RATIOS)
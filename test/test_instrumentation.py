@@ -0,0 +1,120 @@
+import pytest
+from src.calculator import Calculator
+from src.instrumentation import Instrumentation, InstrumentedStack, instrument
+from src.journal import Journal
+from src.stack import BoundedStack
+
+
+class TestInstrumentation:
+    """Test the opt-in counters and timings."""
+
+    def test_counts_per_operator(self):
+        """Test calculate is counted and timed per operator."""
+        calc = Calculator()
+        stats = instrument(calc)
+        calc.calculate(5, 3, '+')
+        calc.calculate(8, 2, '*')
+        calc.calculate(1, 1, '+')
+        with pytest.raises(ValueError):
+            calc.calculate(1, 0, '/')
+
+        snapshot = stats.snapshot()
+        assert snapshot["calculate"]["+"]["count"] == 2
+        assert snapshot["calculate"]["*"]["count"] == 1
+        assert snapshot["calculate"]["/"] == {"count": 1, "errors": 1, "seconds": pytest.approx(0, abs=1)}
+        assert snapshot["calculate"]["+"]["seconds"] >= 0
+
+    def test_undo_redo_and_stack_depths(self):
+        """Test undo/redo counts, push/pop traffic and high-water marks."""
+        calc = Calculator()
+        stats = instrument(calc)
+        for value in range(5):
+            calc.calculate(value, 1, '+')
+        calc.undo(3)
+        calc.redo()
+        with pytest.raises(IndexError):
+            calc.redo(5)
+
+        snapshot = stats.snapshot()
+        assert snapshot["methods"]["undo"]["count"] == 1
+        assert snapshot["methods"]["redo"] == {"count": 2, "errors": 1,
+                                               "seconds": snapshot["methods"]["redo"]["seconds"]}
+        undo_stack = snapshot["stacks"]["undo"]
+        assert undo_stack["push"] == 5 + 1
+        assert undo_stack["pop"] == 3
+        assert undo_stack["depth"] == 3
+        assert undo_stack["high_water"] == 5
+        assert snapshot["stacks"]["redo"]["high_water"] == 3
+        assert calc.get_result() == 3
+
+    def test_results_unchanged(self):
+        """Test an instrumented calculator behaves exactly like a plain one."""
+        plain, instrumented = Calculator(history_mode="delta"), Calculator(history_mode="delta")
+        instrument(instrumented)
+        for calc in (plain, instrumented):
+            calc.calculate(2, 3, '*')
+            calc.calculate_expression("6 / 4 + 1")
+            calc.calculate_many([1, 2], [3, 0], [1, 3])
+            calc.undo(2)
+            calc.redo()
+            calc.undo_to(lambda result: result == 6)
+        assert instrumented.get_result() == plain.get_result()
+        assert instrumented.undo_stack.items == plain.undo_stack.items
+        assert instrumented.redo_stack.size() == plain.redo_stack.size()
+
+    def test_detach_restores_originals(self):
+        """Test detach removes every wrapper so disabled costs nothing."""
+        calc = Calculator()
+        undo_stack = calc.undo_stack
+        original = vars(calc).get("calculate")
+        stats = Instrumentation()
+        stats.attach(calc)
+        assert isinstance(calc.undo_stack, InstrumentedStack)
+        with pytest.raises(ValueError, match="already attached"):
+            stats.attach(calc)
+
+        stats.detach()
+        assert calc.undo_stack is undo_stack
+        assert vars(calc).get("calculate") is original
+        assert "undo" not in vars(calc)
+        calc.calculate(1, 2, '+')
+        assert stats.snapshot()["calculate"] == {}
+
+    def test_bounded_stack_extras_visible(self):
+        """Test attributes of the wrapped stack stay reachable."""
+        calc = Calculator(history_limit=2)
+        instrument(calc)
+        for value in range(4):
+            calc.calculate(value, 1, '+')
+        assert isinstance(calc.undo_stack.stack, BoundedStack)
+        assert calc.undo_stack.evictions == 2
+
+    def test_composes_with_journal(self, tmp_path):
+        """Test instrumentation and the journal can wrap the same calculator."""
+        calc = Calculator()
+        stats = instrument(calc)
+        journal = Journal(str(tmp_path / "session.journal"))
+        journal.attach(calc)
+        calc.calculate(2, 2, '+')
+        calc.undo()
+        journal.close()
+        assert stats.snapshot()["calculate"]["+"]["count"] == 1
+        assert stats.snapshot()["methods"]["undo"]["count"] == 1
+
+    def test_prometheus_text(self):
+        """Test the Prometheus text dump."""
+        calc = Calculator()
+        stats = Instrumentation(clock=iter(range(100)).__next__)
+        stats.attach(calc)
+        calc.calculate(1, 2, '+')
+        calc.undo()
+
+        text = stats.to_prometheus()
+        assert "# TYPE calculator_operations_total counter\n" in text
+        assert 'calculator_operations_total{method="calculate",operator="+"} 1\n' in text
+        assert 'calculator_operation_seconds_total{method="calculate",operator="+"} 1.0\n' in text
+        assert 'calculator_operations_total{method="undo"} 1\n' in text
+        assert 'calculator_stack_operations_total{stack="undo",operation="push"} 1\n' in text
+        assert 'calculator_stack_depth{stack="redo"} 1\n' in text
+        assert 'calculator_stack_depth_high_water{stack="undo"} 1\n' in text
+        assert text.endswith("\n")
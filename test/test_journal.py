@@ -0,0 +1,177 @@
+import os
+
+import pytest
+from src import journal as journal_module
+from src.calculator import Calculator
+from src.journal import Journal
+from src.variables import VariableCalculator
+
+
+@pytest.fixture
+def path(tmp_path):
+    """Path of a fresh journal file."""
+    return str(tmp_path / "session.jrnl")
+
+
+class TestJournalRecovery:
+    """Test rebuilding calculator state from the journal."""
+    
+    def test_recover_empty_journal(self, path):
+        """Test a new journal recovers to the initial state."""
+        with Journal(path) as journal:
+            calc = journal.recover()
+        assert calc.get_result() == 0
+        assert calc.undo_stack.isEmpty()
+    
+    def test_recover_calculations_undo_and_redo(self, path):
+        """Test undo and redo stacks are rebuilt after a restart."""
+        with Journal(path) as journal:
+            calc = journal.recover()
+            calc.calculate(5, 3, '+')    # 8
+            calc.calculate(8, 2, '*')    # 16
+            calc.calculate(16, 4, '/')   # 4
+            calc.undo()                  # 16
+            calc.undo()                  # 8
+            calc.redo()                  # 16
+        
+        with Journal(path) as journal:
+            calc = journal.recover()
+            assert calc.get_result() == 16
+            assert calc.redo() == 4
+            assert calc.undo() == 16
+            assert calc.undo() == 8
+            assert calc.undo() == 0
+    
+    def test_multi_step_undo_redo_are_journaled(self, path):
+        """Test undo(n)/redo(n) replay with their step counts."""
+        with Journal(path) as journal:
+            calc = journal.recover()
+            for i in range(5):
+                calc.calculate(i, 1, '+')
+            calc.undo(4)
+            calc.redo(2)
+        
+        with Journal(path) as journal:
+            calc = journal.recover()
+            assert calc.get_result() == 3
+            assert calc.redo_stack.size() == 2
+    
+    def test_failed_operations_are_not_journaled(self, path):
+        """Test calls that raise leave no record behind."""
+        with Journal(path) as journal:
+            calc = journal.recover()
+            with pytest.raises(ValueError):
+                calc.calculate(1, 0, '/')
+            with pytest.raises(IndexError):
+                calc.undo()
+            assert journal.count == 0
+    
+    def test_reset_record(self, path):
+        """Test a reset record clears recovered history."""
+        with Journal(path) as journal:
+            calc = journal.recover()
+            calc.calculate(1, 2, '+')
+            journal.reset()
+        
+        with Journal(path) as journal:
+            calc = journal.recover()
+            assert calc.get_result() == 0
+            assert calc.undo_stack.isEmpty()
+    
+    def test_batch_rows_are_journaled(self, path):
+        """Test calculate_many records every valid row."""
+        with Journal(path) as journal:
+            calc = journal.recover()
+            calc.calculate_many([1, 2, 3], [1, 0, 1], [0, 3, 0])
+        
+        with Journal(path) as journal:
+            calc = journal.recover()
+            assert calc.get_result() == 4
+            assert calc.undo() == 2
+    
+    def test_expressions_are_journaled(self, path):
+        """Test calculate_expression results are recorded."""
+        with Journal(path) as journal:
+            calc = journal.recover()
+            calc.calculate_expression("(3+4)*2")
+        
+        with Journal(path) as journal:
+            assert journal.recover().get_result() == 14
+    
+    def test_journal_grows_past_initial_mapping(self, path, monkeypatch):
+        """Test appends keep working after the file is remapped."""
+        monkeypatch.setattr(journal_module, "GROW_RECORDS", 4)
+        with Journal(path) as journal:
+            calc = journal.recover()
+            for i in range(10):
+                calc.calculate(i, 1, '+')
+        
+        with Journal(path) as journal:
+            calc = journal.recover()
+            assert calc.get_result() == 10
+            assert calc.undo_stack.size() == 10
+    
+    def test_rejects_variable_calculator(self, path):
+        """Test attaching a VariableCalculator raises instead of losing its steps."""
+        with Journal(path) as journal:
+            with pytest.raises(ValueError, match="VariableCalculator"):
+                journal.attach(VariableCalculator())
+            assert journal.count == 0
+    
+    def test_rejects_foreign_file(self, path):
+        """Test opening a file that is not a journal raises ValueError."""
+        with open(path, "wb") as f:
+            f.write(b"not a journal at all, definitely")
+        with pytest.raises(ValueError, match="Not a calculator journal"):
+            Journal(path)
+
+
+class TestJournalCheckpoints:
+    """Test checkpoint snapshots bound recovery work."""
+    
+    def test_checkpoint_then_tail_replay(self, path):
+        """Test recovery combines the checkpoint with later records."""
+        with Journal(path) as journal:
+            calc = journal.recover()
+            calc.calculate(2, 3, '+')    # 5
+            calc.calculate(5, 2, '*')    # 10
+            calc.undo()                  # 5
+            journal.checkpoint(calc)
+            calc.calculate(5, 1, '-')    # 4
+        
+        with Journal(path) as journal:
+            calc = journal.recover()
+            assert calc.get_result() == 4
+            assert calc.undo() == 5
+            assert calc.undo() == 0
+    
+    def test_periodic_checkpoints(self, path):
+        """Test checkpoint_every writes checkpoints automatically."""
+        with Journal(path, checkpoint_every=3) as journal:
+            calc = journal.recover()
+            for i in range(7):
+                calc.calculate(i, 1, '+')
+            assert os.path.exists(journal.checkpoint_path)
+        
+        with Journal(path) as journal:
+            assert journal._checkpoint_count() == 6
+            calc = journal.recover()
+            assert calc.get_result() == 7
+            assert calc.undo_stack.size() == 7
+    
+    def test_checkpoint_materializes_delta_history(self, path):
+        """Test delta-mode history is checkpointed as plain results."""
+        with Journal(path) as journal:
+            calc = journal.recover(history_mode="delta")
+            calc.calculate(0, 5, '+')    # 5
+            calc.calculate(5, 2, '*')    # 10
+            calc.calculate(10, 4, '-')   # 6
+            calc.undo()                  # 10
+            journal.checkpoint(calc)
+        
+        with Journal(path) as journal:
+            calc = Calculator()
+            journal._load_checkpoint(calc)
+            assert list(calc.undo_stack.items) == [0, 5]
+            assert list(calc.redo_stack.items) == [6]
+            assert calc.get_result() == 10
@@ -0,0 +1,160 @@
+from fractions import Fraction
+
+import pytest
+from src.calculator import Calculator
+from src.lazy import LazyCalculator
+
+CHAIN = [('+', 3), ('*', 2), ('-', 1), ('*', 4), ('/', 8)]
+
+
+def eager_results(chain, start=0):
+    calc = Calculator(backend="fraction")
+    calc.calculate(start, 0, '+')
+    results = [calc.get_result()]
+    for operator, operand in chain:
+        results.append(calc.calculate(calc.get_result(), operand, operator))
+    return results
+
+
+class TestLazyCalculator:
+    """Test deferred, fused chains with per-operation undo."""
+
+    def test_chain_is_deferred(self):
+        """Test chain() records without computing until read."""
+        calc = LazyCalculator()
+        for operator, operand in CHAIN:
+            calc.chain(operator, operand)
+        assert calc.pending() == len(CHAIN)
+        assert calc.undo_stack.isEmpty()
+        assert calc.get_result() == ((0 + 3) * 2 - 1) * 4 / 8
+
+    def test_fusion_composes_affine_maps(self):
+        """Test each operation extends one running a*x + b map."""
+        calc = LazyCalculator(backend="fraction")
+        calc.chain('+', 3)
+        calc.chain('+', 4)
+        calc.chain('*', 2)
+        assert calc.get_result() == 14
+        assert calc.maps == [(1, 3), (1, 7), (2, 14)]
+
+    def test_float_chains_match_eager_results(self):
+        """Test overflow and cancellation give the eager results, not a*x + b."""
+        for start, chain in ((0, [('*', 1e200), ('*', 1e200), ('/', 1e200)]),
+                             (1, [('+', 1e16), ('-', 1e16), ('*', 3)])):
+            eager = Calculator()
+            eager.calculate(start, 0, '+')
+            expected = [eager.get_result()]
+            for operator, operand in chain:
+                expected.append(eager.calculate(eager.get_result(), operand, operator))
+            assert expected[-1] == 0.0
+
+            calc = LazyCalculator()
+            calc.calculate(start, 0, '+')
+            calc.chain_many(chain)
+            assert calc.get_result() == expected[-1]
+            for value in reversed(expected[:-1]):
+                assert calc.undo() == value
+            calc.redo(len(chain))
+            calc.flush()
+            assert calc.undo_stack.items == eager.undo_stack.items
+
+    def test_exact_backend_matches_step_by_step(self):
+        """Test fused results equal eager results with fractions."""
+        calc = LazyCalculator(backend="fraction")
+        calc.calculate(Fraction(1, 3), 0, '+')
+        for operator, operand in CHAIN:
+            calc.chain(operator, operand)
+        expected = eager_results(CHAIN, Fraction(1, 3))
+        assert calc.get_result() == expected[-1]
+        for value in reversed(expected[:-1]):
+            assert calc.undo() == value
+
+    def test_undo_redo_per_operation(self):
+        """Test undo/redo move one chained operation at a time."""
+        calc = LazyCalculator()
+        for operator, operand in CHAIN:
+            calc.chain(operator, operand)
+        assert calc.undo() == 20
+        assert calc.undo(2) == 6
+        assert calc.redo() == 5
+        assert calc.pending() == len(CHAIN)
+        assert calc.undo(3) == 0
+        with pytest.raises(IndexError):
+            calc.undo()
+        assert calc.redo(5) == 2.5
+
+    def test_chain_after_undo_discards_redo(self):
+        """Test a new operation drops the undone tail of the chain."""
+        calc = LazyCalculator()
+        calc.chain('+', 10)
+        calc.chain('*', 3)
+        calc.undo()
+        calc.chain('-', 4)
+        assert calc.get_result() == 6
+        with pytest.raises(IndexError, match="redo"):
+            calc.redo()
+        assert calc.undo(2) == 0
+
+    def test_flush_writes_per_operation_history(self):
+        """Test flushing produces the same stacks as eager calculation."""
+        calc = LazyCalculator()
+        for operator, operand in CHAIN:
+            calc.chain(operator, operand)
+        calc.undo(2)
+        calc.flush()
+        assert calc.pending() == 0
+        assert calc.undo_stack.items == [0, 3, 6]
+        assert calc.redo_stack.items == [2.5, 20]
+        assert calc.get_result() == 5
+
+    def test_undo_past_chain_reaches_eager_history(self):
+        """Test undo and redo cross between the chain and earlier results."""
+        calc = LazyCalculator()
+        calc.calculate(2, 3, '+')
+        calc.chain('*', 2)
+        calc.chain('+', 1)
+        assert calc.undo(3) == 0
+        assert calc.redo(3) == 11
+        assert calc.undo() == 10
+
+    def test_eager_methods_flush_first(self):
+        """Test calculate and calculate_expression see the full chain."""
+        calc = LazyCalculator()
+        calc.chain('+', 2)
+        calc.chain('*', 5)
+        calc.calculate_expression("1 + 1")
+        assert calc.undo_stack.items == [0, 2, 10]
+        calc.chain('-', 1)
+        calc.calculate(calc.get_result(), 3, '*')
+        assert calc.get_result() == 3
+        assert calc.undo_to(lambda result: result == 10) == 10
+
+    def test_chain_many(self):
+        """Test chain_many records like chain and validates everything first."""
+        calc = LazyCalculator(backend="decimal")
+        calc.chain_many(CHAIN)
+        assert str(calc.get_result()) == "2.5"
+        with pytest.raises(ValueError, match="divide by zero"):
+            calc.chain_many([('+', 1), ('/', 0)])
+        assert calc.pending() == len(CHAIN)
+        assert str(calc.undo(2)) == "5"
+
+    def test_validation(self):
+        """Test bad operators and division by zero fail at chain time."""
+        calc = LazyCalculator()
+        with pytest.raises(ValueError, match="Invalid Operator"):
+            calc.chain('^', 2)
+        with pytest.raises(ValueError, match="divide by zero"):
+            calc.chain('/', 0)
+        with pytest.raises(ValueError, match="at least 1"):
+            calc.undo(0)
+        assert calc.pending() == 0
+
+    def test_delta_history(self):
+        """Test lazy chains flush into delta-mode histories."""
+        calc = LazyCalculator(history_mode="delta")
+        calc.chain('+', 4)
+        calc.chain('*', 2)
+        calc.calculate(1, 1, '+')
+        assert calc.undo(3) == 0
+        assert calc.redo(2) == 8
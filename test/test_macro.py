@@ -0,0 +1,204 @@
+import io
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+from src.calculator import Calculator
+from src.instrumentation import instrument
+from src.journal import Journal
+from src.lazy import LazyCalculator
+from src.macro import parse_macro
+from src.main import run_batch
+from src.stack import ArrayStack
+from src.threadsafe import ThreadSafeCalculator
+from src.undo_tree import BranchingCalculator
+from src.variables import VariableCalculator
+
+TAX = [("*", 1.2), ("+", 5.0), ("-", 1.0), ("/", 2.0)]
+
+
+def step_by_step(value, steps):
+    """Apply steps one calculate() at a time and return the calculator."""
+    calc = Calculator()
+    calc.calculate(value, steps[0][1], steps[0][0])
+    for operator, operand in steps[1:]:
+        calc.calculate(calc.get_result(), operand, operator)
+    return calc
+
+
+class TestMacro:
+    """Test compiled macros on the Calculator."""
+
+    def test_replay_matches_step_by_step(self):
+        """Test a replay gives exactly the result of calculating each step."""
+        calc = Calculator()
+        calc.define_macro("tax", TAX)
+        for value in (0, 1, 100.5, -7):
+            assert calc.play_macro("tax", value) == step_by_step(value, TAX).get_result()
+
+    def test_replay_is_one_undo_step(self):
+        """Test a default replay records only the previous result."""
+        calc = Calculator()
+        calc.calculate(1, 1, "+")
+        calc.define_macro("tax", TAX)
+        calc.play_macro("tax", 100)
+        assert calc.undo_stack.items == [0, 2]
+        assert calc.undo() == 2
+        assert calc.redo() == step_by_step(100, TAX).get_result()
+
+    def test_per_step_replay_matches_calculate_history(self):
+        """Test per_step records the same undo entries as calculate()."""
+        calc = Calculator()
+        calc.define_macro("tax", TAX)
+        calc.play_macro("tax", 100, per_step=True)
+        expected = step_by_step(100, TAX)
+        assert calc.undo_stack.items == expected.undo_stack.items
+        assert calc.undo(len(TAX)) == 0
+
+    def test_replay_defaults_to_current_result_and_clears_redo(self):
+        """Test the current result is the default input and redo is cleared."""
+        calc = Calculator()
+        calc.calculate(10, 0, "+")
+        calc.calculate(20, 0, "+")
+        calc.undo()
+        calc.define_macro("double", [("*", 2)])
+        assert calc.play_macro("double") == 20
+        assert calc.redo_stack.isEmpty()
+
+    def test_invalid_macros(self):
+        """Test bad steps are rejected when the macro is defined."""
+        calc = Calculator()
+        with pytest.raises(ValueError, match="Cannot divide by zero"):
+            calc.define_macro("bad", [("/", 0)])
+        with pytest.raises(ValueError, match="Invalid Operator"):
+            calc.define_macro("bad", [("%", 2)])
+        with pytest.raises(ValueError, match="at least one step"):
+            calc.define_macro("bad", [])
+        with pytest.raises(ValueError, match="Unknown macro"):
+            calc.play_macro("bad")
+
+    def test_record_and_stop(self):
+        """Test calculate() calls are recorded and calculate is restored."""
+        calc = Calculator()
+        calc.record_macro("tax")
+        calc.calculate(100, 1.2, "*")
+        calc.calculate(calc.get_result(), 5.0, "+")
+        macro = calc.stop_recording()
+        assert macro.steps == (("*", 1.2), ("+", 5.0))
+        assert "calculate" not in vars(calc)
+        assert calc.play_macro("tax", 200) == 245.0
+
+    def test_recording_rules(self):
+        """Test recorded steps must chain and recording cannot nest."""
+        calc = Calculator()
+        with pytest.raises(ValueError, match="Not recording"):
+            calc.stop_recording()
+        calc.record_macro("m")
+        with pytest.raises(ValueError, match="Already recording"):
+            calc.record_macro("n")
+        calc.calculate(1, 2, "+")
+        with pytest.raises(ValueError, match="continue from the current result"):
+            calc.calculate(10, 2, "+")
+        calc.stop_recording()
+
+    def test_exact_backends(self):
+        """Test decimal and fraction macros keep their number types."""
+        decimal_calc = Calculator(backend="decimal")
+        decimal_calc.define_macro("m", [("+", 0.1), ("*", 3)])
+        assert decimal_calc.play_macro("m", 0.2) == Decimal("0.9")
+
+        fraction_calc = Calculator(backend="fraction")
+        fraction_calc.define_macro("m", [("/", 3), ("+", "1/3")])
+        assert fraction_calc.play_macro("m", 1, per_step=True) == Fraction(2, 3)
+        assert fraction_calc.undo() == Fraction(1, 3)
+
+    def test_other_calculators(self):
+        """Test macros with delta mode, ArrayStack, variables and lazy chains."""
+        for calc in (Calculator(history_mode="delta"), Calculator(stack_type=ArrayStack),
+                     VariableCalculator()):
+            calc.define_macro("tax", TAX)
+            calc.play_macro("tax", 100, per_step=True)
+            assert calc.undo(len(TAX)) == 0
+
+        lazy = LazyCalculator()
+        lazy.chain("+", 4)
+        lazy.define_macro("double", [("*", 2)])
+        assert lazy.play_macro("double") == 8
+        assert lazy.undo() == 4
+
+
+class TestMacroWrappers:
+    """Test play_macro on calculators that wrap or replace the history methods."""
+
+    def test_threadsafe_publishes_result(self):
+        """Test a replay runs under the lock and publishes a new snapshot."""
+        calc = ThreadSafeCalculator()
+        calc.calculate(1, 2, "+")
+        calc.define_macro("double", [("*", 2)])
+        version = calc.snapshot()[0]
+        assert calc.play_macro("double") == 6.0
+        assert calc.get_result() == 6.0
+        assert calc.snapshot() == (version + 1, 6.0)
+
+    def test_branching_commits_versions(self):
+        """Test replays add one version, or one per step, to the undo tree."""
+        calc = BranchingCalculator()
+        calc.define_macro("tax", TAX)
+        assert calc.play_macro("tax", 100) == step_by_step(100, TAX).get_result()
+        assert calc.version == 1
+        calc.play_macro("tax", 100, per_step=True)
+        assert calc.version == 1 + len(TAX)
+        assert calc.undo(len(TAX)) == step_by_step(100, TAX).get_result()
+
+    def test_journal_records_replays(self, tmp_path):
+        """Test replays are journaled and recovered, per step when asked."""
+        path = str(tmp_path / "calc.journal")
+        with Journal(path) as journal:
+            calc = journal.attach(Calculator())
+            calc.calculate(1, 2, "+")
+            calc.define_macro("m", [("*", 2), ("+", 3)])
+            calc.play_macro("m")
+            calc.play_macro("m", 1, per_step=True)
+            assert journal.count == 4
+
+        with Journal(path) as journal:
+            recovered = journal.recover()
+            assert recovered.get_result() == 5.0
+            assert recovered.undo() == 2.0
+            assert recovered.undo() == 9.0
+            assert recovered.undo() == 3
+
+    def test_instrumentation_times_replays(self):
+        """Test replays are counted like other timed methods."""
+        calc = Calculator()
+        stats = instrument(calc)
+        calc.define_macro("m", [("+", 1)])
+        calc.play_macro("m")
+        assert stats.snapshot()["methods"]["play_macro"]["count"] == 1
+        assert stats.snapshot()["stacks"]["undo"]["push"] == 1
+
+
+class TestMacroCommands:
+    """Test the macro, play and play-steps CLI commands."""
+
+    def test_parse_macro(self):
+        """Test step text is split into (operator, operand) pairs."""
+        assert parse_macro("*1.2 + 5 --3 /.5") == [("*", 1.2), ("+", 5.0), ("-", -3.0), ("/", 0.5)]
+        with pytest.raises(ValueError, match="Invalid macro step: %2"):
+            parse_macro("*2 %2")
+        with pytest.raises(ValueError, match="at least one step"):
+            parse_macro("  ")
+
+    def test_batch_session(self):
+        """Test macros are defined, replayed, undone and survive clear."""
+        out, err = io.StringIO(), io.StringIO()
+        failures = run_batch(io.StringIO(
+            "macro tax = *1.2 +5\nplay tax 100\nplay-steps tax\nundo\nclear\nplay tax 10\n"
+            "play nope\nmacro bad = *x\nplay tax abc\n"), out, err)
+        assert out.getvalue().splitlines() == ["0", "125.0", "155.0", "150.0", "0", "17.0"]
+        assert err.getvalue().splitlines() == [
+            "line 7: Error: Unknown macro: nope",
+            "line 8: Error: Invalid macro step: *x",
+            "line 9: Error: Invalid starting value: abc",
+        ]
+        assert failures == 3
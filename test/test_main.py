@@ -0,0 +1,110 @@
+import io
+
+from src.calculator import Calculator
+from src.main import COMMAND_HELP, COMMANDS, execute_command, main, register_command, run_batch
+
+
+def batch(text):
+    """Run text through batch mode and return (output, errors, failures)."""
+    out, err = io.StringIO(), io.StringIO()
+    failures = run_batch(io.StringIO(text), out, err)
+    return out.getvalue(), err.getvalue(), failures
+
+
+class TestBatchMode:
+    """Test the non-interactive streaming mode."""
+    
+    def test_results_one_per_line(self):
+        """Test every command writes its result on its own line."""
+        out, err, failures = batch("calc 5 + 3\ncalc (3+4)*2/7\nundo\nredo\n")
+        assert out.splitlines() == ["8.0", "2.0", "8.0", "2.0"]
+        assert err == ""
+        assert failures == 0
+    
+    def test_errors_report_line_numbers_and_continue(self):
+        """Test a bad line is reported and the run keeps going."""
+        out, err, failures = batch("undo\ncalc 1/0\nhello\ncalc 2*2\n")
+        assert out.splitlines() == ["4.0"]
+        assert err.splitlines() == [
+            "line 1: Error: No operations to undo",
+            "line 2: Error: Cannot divide by zero",
+            "line 3: Error: Invalid command: hello",
+        ]
+        assert failures == 3
+    
+    def test_clear_blank_lines_comments_and_exit(self):
+        """Test clear resets, blanks/comments are skipped, exit stops."""
+        out, _, _ = batch("calc 1+1\n\n# comment\nclear\nundo\nexit\ncalc 9+9\n")
+        assert out.splitlines() == ["2.0", "0"]
+    
+    def test_output_is_chunked(self, monkeypatch):
+        """Test results are written in chunks rather than per line."""
+        monkeypatch.setattr("src.main.BATCH_CHUNK_LINES", 2)
+        out, _, _ = batch("calc 1+1\n" * 5)
+        assert out.splitlines() == ["2.0"] * 5
+    
+    def test_main_batch_from_file(self, tmp_path, capsys):
+        """Test main --batch FILE runs without the menu."""
+        path = tmp_path / "commands.txt"
+        path.write_text("calc 2*3\nundo\n")
+        assert main(["--batch", str(path)]) == 0
+        captured = capsys.readouterr()
+        assert captured.out.splitlines() == ["6.0", "0"]
+        assert "CALCULATOR" not in captured.out
+
+
+class TestCommandRegistry:
+    """Test table-driven dispatch and plugin commands."""
+    
+    def test_builtin_commands(self):
+        """Test the built-in commands, including multi-step undo/redo."""
+        out, err, _ = batch("calc 1+1\ncalc 2*3\ncalc 4-1\nundo 2\nredo 2\nundo x\nclear now\ncalc\n")
+        assert out.splitlines() == ["2.0", "6.0", "3.0", "2.0", "3.0"]
+        assert err.splitlines() == [
+            "line 6: Error: Invalid step count: x",
+            "line 7: Error: Invalid command: clear now",
+            "line 8: Error: Please use format 'calc <expression>'",
+        ]
+    
+    def test_plugin_registers_command(self, monkeypatch):
+        """Test a registered handler is reachable from every front end."""
+        monkeypatch.setattr("src.main.COMMANDS", dict(COMMANDS))
+        monkeypatch.setattr("src.main.COMMAND_HELP", dict(COMMAND_HELP))
+        
+        @register_command("double", "double", "Double the current result")
+        def command_double(calc, argument):
+            return calc, calc.calculate(calc.get_result(), 2, '*')
+        
+        calc, result = execute_command(Calculator(), "calc 21")
+        assert execute_command(calc, "double") == (calc, 42)
+        out, _, _ = batch("calc 1.5\ndouble\nundo\n")
+        assert out.splitlines() == ["1.5", "3.0", "1.5"]
+    
+    def test_main_loads_plugins(self, tmp_path, monkeypatch, capsys):
+        """Test --plugin imports a module before running."""
+        monkeypatch.setattr("src.main.COMMANDS", dict(COMMANDS))
+        monkeypatch.setattr("src.main.COMMAND_HELP", dict(COMMAND_HELP))
+        (tmp_path / "calc_square_plugin.py").write_text(
+            "from src.main import register_command\n"
+            "@register_command('square')\n"
+            "def square(calc, argument):\n"
+            "    return calc, calc.calculate(calc.get_result(), calc.get_result(), '*')\n"
+        )
+        monkeypatch.syspath_prepend(str(tmp_path))
+        commands = tmp_path / "commands.txt"
+        commands.write_text("calc 3\nsquare\n")
+        assert main(["--plugin", "calc_square_plugin", "--batch", str(commands)]) == 0
+        assert capsys.readouterr().out.splitlines() == ["3.0", "9.0"]
+    
+    def test_interactive_session(self, monkeypatch, capsys):
+        """Test the prompt loop prints the menu once and dispatches commands."""
+        inputs = iter(["calc 2 + 2", "bogus", "undo 5", "help", "exit"])
+        monkeypatch.setattr("builtins.input", lambda prompt: next(inputs))
+        assert main([]) == 0
+        out = capsys.readouterr().out
+        assert out.count("CALCULATOR WITH UNDO/REDO") == 1
+        assert "Result: 4.0" in out
+        assert "Invalid command. Type 'help'" in out
+        assert "Error: No operations to undo" in out
+        assert "undo [n]" in out
+
@@ -0,0 +1,104 @@
+import io
+import pickle
+
+import pytest
+from src.calculator import Calculator
+from src.serialize import HEADER, dump, dumps, load, loads, views
+from src.stack import ArrayStack, BoundedStack
+import src.serialize as serialize
+
+
+def make_session(**options):
+    calc = Calculator(**options)
+    for value in range(1, 8):
+        calc.calculate(value, 1.5, '*')
+    calc.undo(3)
+    return calc
+
+
+class TestSessionFormat:
+    """Test binary session export and import."""
+
+    def test_round_trip(self):
+        """Test stacks and result survive dumps/loads."""
+        calc = make_session()
+        data = dumps(calc)
+        assert len(data) == HEADER.size + 8 * (calc.undo_stack.size() + calc.redo_stack.size())
+
+        copy = loads(data)
+        assert copy.get_result() == calc.get_result()
+        assert copy.undo_stack.items == calc.undo_stack.items
+        assert copy.redo_stack.items == calc.redo_stack.items
+        assert copy.redo(3) == calc.redo(3)
+        assert copy.undo(4) == calc.undo(4)
+
+    def test_views_are_zero_copy(self):
+        """Test views() reads the stacks straight out of the buffer."""
+        calc = make_session()
+        data = bytearray(dumps(calc))
+        current, undo_view, redo_view = views(data)
+        assert current == calc.get_result()
+        assert list(undo_view) == calc.undo_stack.items
+        assert undo_view.readonly
+
+        data[HEADER.size:HEADER.size + 8] = bytes(8)
+        assert undo_view[0] == 0.0
+
+    def test_delta_history_imports_anywhere(self):
+        """Test delta entries are materialized and load into other stack types."""
+        calc = make_session(history_mode="delta")
+        data = dumps(calc)
+        plain = make_session()
+        assert data == dumps(plain)
+
+        for options in ({"stack_type": ArrayStack}, {"history_mode": "delta"}):
+            copy = loads(data, **options)
+            assert copy.redo(3) == 7 * 1.5
+            assert copy.undo(7) == 0
+
+    def test_array_stack_export(self):
+        """Test ArrayStack storage is written as is."""
+        calc = make_session(stack_type=ArrayStack)
+        assert dumps(calc) == dumps(make_session())
+
+    def test_bounded_import_evicts(self):
+        """Test importing into a bounded history keeps the newest entries."""
+        copy = loads(dumps(make_session()), history_limit=2)
+        assert isinstance(copy.undo_stack, BoundedStack)
+        assert copy.undo_stack.size() == 2
+        assert copy.undo_stack.evictions == 2
+
+    def test_streaming(self, monkeypatch):
+        """Test dump/load stream in chunks and match dumps/loads."""
+        monkeypatch.setattr(serialize, "CHUNK_ITEMS", 2)
+        calc = make_session()
+        stream = io.BytesIO()
+        dump(calc, stream)
+        assert stream.getvalue() == dumps(calc)
+
+        stream.seek(0)
+        copy = load(stream)
+        assert copy.undo_stack.items == calc.undo_stack.items
+        assert copy.redo_stack.items == calc.redo_stack.items
+        assert copy.get_result() == calc.get_result()
+
+    def test_rejects_bad_data(self):
+        """Test bad magic, versions and truncation are reported."""
+        data = dumps(make_session())
+        with pytest.raises(ValueError, match="Not a calculator session"):
+            loads(b"X" * len(data))
+        with pytest.raises(ValueError, match="Unsupported session version: 9"):
+            loads(data[:8] + (9).to_bytes(4, "little") + data[12:])
+        with pytest.raises(ValueError, match="Truncated"):
+            loads(data[:-1])
+        with pytest.raises(ValueError, match="Truncated"):
+            load(io.BytesIO(data[:-8]))
+        with pytest.raises(ValueError, match="float backend"):
+            dumps(Calculator(backend="decimal"))
+
+    def test_smaller_than_pickle(self):
+        """Test the format is more compact than pickling the calculator."""
+        calc = Calculator()
+        for value in range(1000):
+            calc.calculate(value, 0.5, '*')
+        assert len(dumps(calc)) < len(pickle.dumps(calc))
@@ -0,0 +1,133 @@
+import asyncio
+
+from src.server import CalculatorServer, SessionStore, handle_line
+
+
+class FakeClock:
+    """A controllable monotonic clock."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestSessionStore:
+    """Test session bookkeeping and request handling."""
+    
+    def test_sessions_are_independent(self):
+        """Test each session id has its own calculator."""
+        store = SessionStore()
+        assert handle_line(store, "a calc 1+1\n") == "OK 2.0\n"
+        assert handle_line(store, "b calc 5*5\n") == "OK 25.0\n"
+        assert handle_line(store, "a undo\n") == "OK 0\n"
+        assert handle_line(store, "b undo\n") == "OK 0\n"
+        assert len(store) == 2
+    
+    def test_errors_are_reported(self):
+        """Test failures come back as ERR lines."""
+        store = SessionStore()
+        assert handle_line(store, "a redo\n") == "ERR Cannot redo when redo stack is empty\n"
+        assert handle_line(store, "a calc 1/0\n") == "ERR Cannot divide by zero\n"
+        assert handle_line(store, "a\n").startswith("ERR")
+    
+    def test_clear_resets_session(self):
+        """Test clear replaces the session calculator."""
+        store = SessionStore()
+        handle_line(store, "a calc 1+1")
+        assert handle_line(store, "a clear") == "OK 0\n"
+        assert handle_line(store, "a undo").startswith("ERR")
+    
+    def test_idle_sessions_expire(self):
+        """Test only sessions idle past the timeout are dropped."""
+        clock = FakeClock()
+        store = SessionStore(idle_timeout=10, clock=clock)
+        handle_line(store, "old calc 1+1")
+        clock.now = 8
+        handle_line(store, "new calc 1+1")
+        clock.now = 15
+        assert store.expire_idle() == 1
+        assert list(store.sessions) == ["new"]
+        assert store.expired == 1
+    
+    def test_using_a_session_keeps_it_alive(self):
+        """Test activity moves a session to the back of the expiry order."""
+        clock = FakeClock()
+        store = SessionStore(idle_timeout=10, clock=clock)
+        handle_line(store, "a calc 1+1")
+        handle_line(store, "b calc 1+1")
+        clock.now = 9
+        handle_line(store, "a undo")
+        clock.now = 15
+        assert store.expire_idle() == 1
+        assert list(store.sessions) == ["a"]
+
+
+class TestCalculatorServer:
+    """Test the asyncio server end to end."""
+    
+    def test_pipelined_requests_over_tcp(self):
+        """Test a client can pipeline requests for several sessions."""
+        async def scenario():
+            server = await CalculatorServer().start()
+            host, port = server.address
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(b"a calc 2*3\nb calc 1+1\na undo\nb bogus\n")
+            replies = [await reader.readline() for _ in range(4)]
+            writer.close()
+            await server.close()
+            return replies
+        
+        assert asyncio.run(scenario()) == [
+            b"OK 6.0\n", b"OK 2.0\n", b"OK 0\n", b"ERR Invalid command: bogus\n",
+        ]
+    
+    def test_bad_bytes_and_long_lines_get_err_replies(self):
+        """Test invalid UTF-8 and over-long lines are answered and the connection survives."""
+        async def scenario():
+            server = await CalculatorServer().start()
+            host, port = server.address
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(b"a calc \xff\xfe\n" + b"a calc " + b"1" * 100_000 + b"\na calc 1+2\n")
+            replies = [await reader.readline() for _ in range(3)]
+            writer.close()
+            await server.close()
+            return replies
+        
+        replies = asyncio.run(scenario())
+        assert replies[0].startswith(b"ERR")
+        assert replies[1] == b"ERR Request line too long\n"
+        assert replies[2] == b"OK 3.0\n"
+    
+    def test_long_line_tail_is_not_run_as_a_request(self):
+        """Test the rest of an over-long line arriving later is dropped with it."""
+        async def scenario():
+            server = await CalculatorServer().start()
+            host, port = server.address
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(b"a calc 1+" + b"1" * 70_000)
+            await writer.drain()
+            await asyncio.sleep(0.05)
+            writer.write(b" evil calc 5\na calc 1+2\n")
+            replies = [await reader.readline() for _ in range(2)]
+            sessions = list(server.store.sessions)
+            writer.close()
+            await server.close()
+            return replies, sessions
+        
+        replies, sessions = asyncio.run(scenario())
+        assert replies == [b"ERR Request line too long\n", b"OK 3.0\n"]
+        assert sessions == ["a"]
+    
+    def test_sweeper_expires_sessions(self):
+        """Test the background sweep drops idle sessions."""
+        async def scenario():
+            server = CalculatorServer(idle_timeout=0, sweep_interval=0.01)
+            await server.start()
+            server.store.execute("a", "calc 1+1")
+            await asyncio.sleep(0.05)
+            await server.close()
+            return len(server.store)
+        
+        assert asyncio.run(scenario()) == 0
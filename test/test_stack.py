@@ -1,5 +1,8 @@
+import sys
+
 import pytest
-from src.stack import Stack
+from src.calculator import Calculator, Delta
+from src.stack import RECLAIM_PER_PUSH, RECLAIM_STEP, ArrayStack, BoundedStack, Stack, TieredStack
 
 
 class TestStackBasicOperations:
@@ -176,4 +179,276 @@ class TestStackSequences:
         assert stack.size() == 100
         for i in range(99, -1, -1):
             assert stack.pop() == i
-        assert stack.isEmpty()
\ No newline at end of file
+        assert stack.isEmpty()
+
+class TestStackClear:
+    """Test clear/truncate and incremental reclamation."""
+    
+    def test_clear_empties_stack(self):
+        """Test clear removes every item."""
+        stack = Stack()
+        stack.push_many(range(10))
+        stack.clear()
+        assert stack.isEmpty()
+        with pytest.raises(IndexError, match="Empty Stack"):
+            stack.peek()
+    
+    def test_clear_reclaims_incrementally(self):
+        """Test retired items are released a step at a time."""
+        stack = Stack()
+        stack.push_many(range(RECLAIM_STEP * 3))
+        stack.clear()
+        assert stack.pending_reclaim() == RECLAIM_STEP * 2
+        stack.clear()
+        assert stack.pending_reclaim() == RECLAIM_STEP
+        stack.clear()
+        assert stack.pending_reclaim() == 0
+    
+    def test_pushes_reclaim_retired_items(self):
+        """Test each pushed item releases retired items too."""
+        stack = Stack()
+        stack.push_many(range(RECLAIM_STEP * 4))
+        stack.clear()
+        stack.push('a')
+        assert stack.pending_reclaim() == RECLAIM_STEP * 3 - RECLAIM_PER_PUSH
+        stack.push_many(range(10))
+        assert stack.pending_reclaim() == RECLAIM_STEP * 3 - RECLAIM_PER_PUSH * 11
+    
+    def test_pending_reclaim_stays_bounded(self):
+        """Test repeated big-undo/calculate cycles do not pile up retired items."""
+        depth = 20_000
+        for step_by_step in (False, True):
+            calc = Calculator()
+            for _ in range(50):
+                calc.calculate_many([1.0] * depth, [2.0] * depth, [0] * depth)
+                if step_by_step:
+                    for _ in range(depth):
+                        calc.undo()
+                else:
+                    calc.undo(depth)
+                calc.calculate(1, 1, '+')
+                assert calc.redo_stack.pending_reclaim() <= depth
+    
+    def test_reclaim_everything(self):
+        """Test reclaim() without a limit releases all retired items."""
+        stack = Stack()
+        stack.push_many(range(RECLAIM_STEP * 5))
+        stack.clear()
+        stack.reclaim()
+        assert stack.pending_reclaim() == 0
+    
+    def test_push_after_clear(self):
+        """Test the stack is usable while reclamation is pending."""
+        stack = Stack()
+        stack.push_many(range(RECLAIM_STEP * 2))
+        stack.clear()
+        stack.push('a')
+        assert stack.size() == 1
+        assert stack.pop() == 'a'
+    
+    def test_truncate_keeps_bottom_items(self):
+        """Test truncate drops only the items above the given size."""
+        for stack in (Stack(), ArrayStack(), BoundedStack(max_items=10)):
+            stack.push_many([1, 2, 3, 4])
+            stack.truncate(2)
+            assert stack.size() == 2
+            assert stack.peek() == 2
+            stack.truncate(0)
+            assert stack.isEmpty()
+    
+    def test_clear_variants(self):
+        """Test ArrayStack and BoundedStack support clear."""
+        for stack in (ArrayStack(), BoundedStack(max_items=3, max_bytes=1000)):
+            stack.push_many([1.0, 2.0])
+            stack.clear()
+            assert stack.isEmpty()
+        assert stack.nbytes == 0
+
+
+class TestStackSliceTransfer:
+    """Test pop_many and transfer."""
+    
+    def test_pop_many_returns_bottom_to_top(self):
+        """Test pop_many removes the top items in one slice."""
+        for stack in (Stack(), ArrayStack(), BoundedStack(max_items=10)):
+            stack.push_many([1, 2, 3, 4])
+            assert list(stack.pop_many(3)) == [2, 3, 4]
+            assert stack.size() == 1
+    
+    def test_pop_many_too_many_leaves_stack_untouched(self):
+        """Test asking for more items than stored raises and removes nothing."""
+        for stack in (Stack(), ArrayStack(), BoundedStack(max_items=10)):
+            stack.push_many([1, 2])
+            with pytest.raises(IndexError, match="Empty Stack"):
+                stack.pop_many(3)
+            assert stack.size() == 2
+    
+    def test_transfer_matches_repeated_pop_push(self):
+        """Test transfer is equivalent to count pop/push pairs."""
+        source, target = Stack(), Stack()
+        source.push_many([1, 2, 3, 4])
+        target.push('x')
+        source.transfer(target, 3)
+        assert source.items == [1]
+        assert target.items == ['x', 4, 3, 2]
+
+
+class TestBoundedStack:
+    """Test the capacity-limited stack."""
+    
+    def test_requires_a_capacity(self):
+        """Test a BoundedStack without any cap is rejected."""
+        with pytest.raises(ValueError):
+            BoundedStack()
+    
+    def test_max_items_evicts_oldest(self):
+        """Test pushing past max_items drops the bottom item."""
+        stack = BoundedStack(max_items=3)
+        for i in range(5):
+            stack.push(i)
+        assert stack.size() == 3
+        assert stack.evictions == 2
+        assert [stack.pop(), stack.pop(), stack.pop()] == [4, 3, 2]
+        assert stack.isEmpty()
+    
+    def test_max_bytes_tracks_budget(self):
+        """Test the byte budget evicts oldest items and counts bytes."""
+        item_size = sys.getsizeof(1.5)
+        stack = BoundedStack(max_bytes=item_size * 2)
+        stack.push(1.5)
+        stack.push(2.5)
+        stack.push(3.5)
+        assert stack.size() == 2
+        assert stack.nbytes == item_size * 2
+        assert stack.evictions == 1
+        assert stack.evicted_bytes == item_size
+        stack.pop()
+        assert stack.nbytes == item_size
+    
+    def test_pop_empty_raises_error(self):
+        """Test pop on an empty bounded stack raises IndexError."""
+        stack = BoundedStack(max_items=2)
+        with pytest.raises(IndexError, match="Empty Stack"):
+            stack.pop()
+    
+    def test_push_many_respects_capacity(self):
+        """Test bulk pushes evict like single pushes."""
+        stack = BoundedStack(max_items=2)
+        stack.push_many([1, 2, 3, 4])
+        assert stack.peek() == 4
+        assert stack.size() == 2
+        assert stack.evictions == 2
+
+
+class TestArrayStack:
+    """Test the array('d')-backed numeric stack."""
+    
+    def test_push_pop_lifo(self):
+        """Test ArrayStack keeps LIFO order and returns floats."""
+        stack = ArrayStack()
+        stack.push(1)
+        stack.push(2.5)
+        assert stack.size() == 2
+        assert stack.peek() == 2.5
+        assert stack.pop() == 2.5
+        result = stack.pop()
+        assert result == 1.0 and isinstance(result, float)
+        assert stack.isEmpty()
+    
+    def test_empty_errors_match_stack(self):
+        """Test pop/peek on an empty ArrayStack raise like Stack."""
+        stack = ArrayStack()
+        with pytest.raises(IndexError, match="Empty Stack"):
+            stack.pop()
+        with pytest.raises(IndexError, match="Empty Stack"):
+            stack.peek()
+    
+    def test_rejects_non_numeric(self):
+        """Test only numbers can be stored."""
+        stack = ArrayStack()
+        with pytest.raises(TypeError):
+            stack.push("string")
+    
+    def test_has_no_instance_dict(self):
+        """Test __slots__ keeps per-instance overhead down."""
+        assert not hasattr(ArrayStack(), "__dict__")
+
+
+class TestTieredStack:
+    """Test the stack that compresses older items into cold chunks."""
+    
+    def test_compacts_past_the_hot_tier(self):
+        """Test old items move into compressed chunks of chunk_items."""
+        stack = TieredStack(hot_items=2, chunk_items=3)
+        stack.push_many([float(i) for i in range(10)])
+        stats = stack.stats()
+        assert stack.size() == 10
+        assert stats["cold_items"] == 6 and stats["chunks"] == 2
+        assert stats["hot_items"] == 4
+        assert stats["compressed_bytes"] > 0
+    
+    def test_lifo_across_tiers(self):
+        """Test pops thaw chunks transparently and keep LIFO order."""
+        stack = TieredStack(hot_items=2, chunk_items=3)
+        for i in range(20):
+            stack.push(float(i))
+        assert [stack.pop() for _ in range(20)] == [float(i) for i in range(19, -1, -1)]
+        assert stack.isEmpty()
+        with pytest.raises(IndexError, match="Empty Stack"):
+            stack.pop()
+    
+    def test_pop_many_and_peek_reach_cold_items(self):
+        """Test bulk pops and peek decompress as many chunks as needed."""
+        stack = TieredStack(hot_items=1, chunk_items=2)
+        stack.push_many(list(range(9)))
+        assert stack.pop_many(7) == [2, 3, 4, 5, 6, 7, 8]
+        assert stack.peek() == 1
+        assert stack.items == [0, 1]
+        with pytest.raises(IndexError, match="Empty Stack"):
+            stack.pop_many(3)
+    
+    def test_keeps_mixed_entry_types(self):
+        """Test non-float entries such as ints and Deltas round-trip."""
+        stack = TieredStack(hot_items=0, chunk_items=2)
+        entries = [0, Delta("+", 2.0), "text", 1.5]
+        stack.push_many(entries)
+        assert list(map(repr, stack.items)) == list(map(repr, entries))
+        assert list(map(repr, stack.pop_many(4))) == list(map(repr, entries))
+        assert stack.pop_many(0) == []
+    
+    def test_cold_dir_chunks_on_disk(self, tmp_path):
+        """Test chunks written to a scratch file read back in order."""
+        stack = TieredStack(hot_items=1, chunk_items=4, cold_dir=str(tmp_path))
+        stack.push_many([float(i) for i in range(50)])
+        assert stack.stats()["chunks"] == 12
+        assert [stack.pop() for _ in range(50)] == [float(i) for i in range(49, -1, -1)]
+        stack.push_many([1.0] * 10)
+        assert stack.items == [1.0] * 10
+    
+    def test_clear_and_truncate(self):
+        """Test clear() empties both tiers and truncate() keeps the bottom."""
+        stack = TieredStack(hot_items=1, chunk_items=2)
+        stack.push_many(list(range(10)))
+        stack.truncate(3)
+        assert stack.items == [0, 1, 2]
+        stack.clear()
+        assert stack.isEmpty() and stack.size() == 0
+        assert stack.stats()["chunks"] == 0
+    
+    def test_invalid_tier_sizes(self):
+        """Test nonsensical tier sizes are rejected."""
+        with pytest.raises(ValueError):
+            TieredStack(hot_items=-1)
+        with pytest.raises(ValueError):
+            TieredStack(chunk_items=0)
+    
+    def test_calculator_deep_rewind(self):
+        """Test a calculator with a tiered history undoes back to the start."""
+        calc = Calculator(stack_type=lambda: TieredStack(hot_items=4, chunk_items=8))
+        for _ in range(100):
+            calc.calculate(calc.get_result(), 1, "+")
+        assert calc.undo_stack.stats()["chunks"] > 0
+        assert calc.undo(60) == 40
+        assert calc.undo() == 39
+        assert calc.redo(61) == 100
+        assert calc.undo(100) == 0
@@ -0,0 +1,89 @@
+import itertools
+import random
+import threading
+
+import pytest
+from src.threadsafe import ThreadSafeCalculator
+
+
+class TestThreadSafeCalculator:
+    """Test the lock-serialized, lock-free-read calculator."""
+    
+    def test_behaves_like_calculator(self):
+        """Test single-threaded behaviour is unchanged."""
+        calc = ThreadSafeCalculator()
+        calc.calculate(5, 3, '+')
+        calc.calculate_expression("(3+4)*2")
+        assert calc.undo() == 8
+        assert calc.redo() == 14
+        assert calc.undo(2) == 0
+        assert calc.snapshot() == (5, 0)
+        with pytest.raises(IndexError, match="No operations to undo"):
+            calc.undo()
+    
+    def test_failed_writes_do_not_publish(self):
+        """Test a write that raises leaves the snapshot untouched."""
+        calc = ThreadSafeCalculator()
+        with pytest.raises(ValueError):
+            calc.calculate(1, 0, '/')
+        assert calc.snapshot() == (0, 0)
+    
+    def test_wraps_selected_implementations(self):
+        """Test options that swap implementations are still serialized."""
+        calc = ThreadSafeCalculator(history_mode="delta", backend="fraction")
+        calc.calculate(0, "1/2", '+')
+        assert calc.undo_to(lambda result: result == 0) == 0
+        assert calc.snapshot()[0] >= 2
+    
+    def test_concurrent_stress_keeps_invariants(self):
+        """Test concurrent writers and readers never observe torn state."""
+        calc = ThreadSafeCalculator()
+        ids = itertools.count(1)
+        produced = {0}
+        errors = []
+        stop = threading.Event()
+        
+        def writer(seed):
+            rng = random.Random(seed)
+            for _ in range(2000):
+                action = rng.random()
+                try:
+                    if action < 0.5:
+                        value = next(ids)
+                        produced.add(value)
+                        calc.calculate(value, 0, '+')
+                    elif action < 0.75:
+                        calc.undo(rng.randint(1, 3))
+                    else:
+                        calc.redo(rng.randint(1, 3))
+                except IndexError as e:
+                    if str(e) not in ("No operations to undo",
+                                      "Cannot redo when redo stack is empty"):
+                        errors.append(e)
+        
+        def reader():
+            last_version = -1
+            while not stop.is_set():
+                version, result = calc.snapshot()
+                if version < last_version or result not in produced:
+                    errors.append((version, result))
+                last_version = version
+        
+        writers = [threading.Thread(target=writer, args=(seed,)) for seed in range(4)]
+        readers = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        stop.set()
+        for thread in readers:
+            thread.join()
+        
+        assert errors == []
+        
+        # Every Value Appears Once Across Both Stacks and the Current Result
+        history = list(calc.undo_stack.items) + list(calc.redo_stack.items)
+        history.append(calc.get_result())
+        assert len(history) == len(set(history))
+        assert set(history) <= produced
+        assert calc.get_result() == calc.current_result
@@ -1,5 +1,6 @@
 import pytest
-from src.calculator import Calculator
+from src.calculator import Calculator, Delta
+from src.stack import ArrayStack
 
 
 class TestUndoRedoEdgeCases:
@@ -68,6 +69,16 @@ class TestUndoRedoEdgeCases:
         with pytest.raises(IndexError, match="Cannot redo"):
             calc.redo()
     
+    def test_new_calculation_reuses_redo_stack(self):
+        """Test redo invalidation clears in place instead of reallocating."""
+        calc = Calculator()
+        calc.calculate(5, 3, '+')
+        calc.undo()
+        redo_stack = calc.redo_stack
+        calc.calculate(10, 2, '*')
+        assert calc.redo_stack is redo_stack
+        assert calc.redo_stack.isEmpty()
+    
     def test_undo_beyond_initial_state(self):
         """Test cannot undo beyond initial state."""
         calc = Calculator()
@@ -203,4 +214,209 @@ class TestUndoRedoEdgeCases:
         
         # Redo it
         calc.redo()
-        assert calc.get_result() == 15
\ No newline at end of file
+        assert calc.get_result() == 15
+
+class TestMultiStepUndoRedo:
+    """Test undo(n), redo(n) and undo_to(predicate)."""
+    
+    def build(self, **options):
+        """Calculator with results 1..10 after starting from 0."""
+        calc = Calculator(**options)
+        for i in range(1, 11):
+            calc.calculate(i - 1, 1, '+')
+        return calc
+    
+    def test_undo_n_matches_single_undos(self):
+        """Test undo(n) leaves the same state as n undo() calls."""
+        bulk, single = self.build(), self.build()
+        assert bulk.undo(4) == 6
+        for _ in range(4):
+            single.undo()
+        assert bulk.undo_stack.items == single.undo_stack.items
+        assert bulk.redo_stack.items == single.redo_stack.items
+    
+    def test_redo_n_matches_single_redos(self):
+        """Test redo(n) leaves the same state as n redo() calls."""
+        bulk, single = self.build(), self.build()
+        bulk.undo(8)
+        single.undo(8)
+        assert bulk.redo(5) == 7
+        for _ in range(5):
+            single.redo()
+        assert bulk.undo_stack.items == single.undo_stack.items
+        assert bulk.redo_stack.items == single.redo_stack.items
+    
+    def test_undo_everything_and_back(self):
+        """Test undoing and redoing the whole history at once."""
+        calc = self.build()
+        assert calc.undo(10) == 0
+        assert calc.redo(10) == 10
+    
+    def test_too_many_steps_changes_nothing(self):
+        """Test over-long jumps raise without partial moves."""
+        calc = self.build()
+        with pytest.raises(IndexError, match="No operations to undo"):
+            calc.undo(11)
+        assert calc.get_result() == 10
+        calc.undo(3)
+        with pytest.raises(IndexError, match="Cannot redo"):
+            calc.redo(4)
+        assert calc.get_result() == 7
+        with pytest.raises(ValueError):
+            calc.undo(0)
+    
+    def test_undo_to_predicate(self):
+        """Test undo_to stops at the most recent matching result."""
+        calc = self.build()
+        assert calc.undo_to(lambda result: result % 4 == 0) == 8
+        assert calc.undo_to(lambda result: result < 3) == 2
+        with pytest.raises(IndexError, match="No earlier result matches"):
+            calc.undo_to(lambda result: result > 100)
+        assert calc.get_result() == 2
+    
+    def test_delta_mode_multi_step(self):
+        """Test multi-step undo/redo and undo_to in delta mode."""
+        calc = self.build(history_mode="delta")
+        assert calc.undo(5) == 5
+        assert calc.redo(2) == 7
+        assert calc.undo_to(lambda result: result == 1) == 1
+        with pytest.raises(IndexError):
+            calc.undo(2)
+        assert calc.get_result() == 1
+    
+    def test_array_stack_multi_step(self):
+        """Test slice transfers with the array-backed history."""
+        calc = self.build(stack_type=ArrayStack)
+        assert calc.undo(9) == 1
+        assert calc.redo(9) == 10
+
+
+class TestBoundedHistory:
+    """Test undo history capped by history_limit / history_bytes."""
+    
+    def test_history_limit_caps_undo_depth(self):
+        """Test only the most recent history_limit steps can be undone."""
+        calc = Calculator(history_limit=2)
+        for i in range(1, 5):
+            calc.calculate(i, 0, '+')
+        assert calc.undo() == 3
+        assert calc.undo() == 2
+        with pytest.raises(IndexError, match="No operations to undo"):
+            calc.undo()
+        assert calc.undo_stack.evictions == 2
+    
+    def test_redo_still_works_with_limit(self):
+        """Test redo is unaffected by the undo cap."""
+        calc = Calculator(history_limit=1)
+        calc.calculate(1, 1, '+')
+        calc.calculate(2, 2, '+')
+        calc.undo()
+        assert calc.redo() == 4
+    
+    def test_history_bytes_caps_memory(self):
+        """Test the byte budget bounds the undo stack."""
+        calc = Calculator(history_bytes=1000)
+        for i in range(1000):
+            calc.calculate(float(i), 1.0, '+')
+        assert calc.undo_stack.nbytes <= 1000
+        assert calc.undo_stack.evictions > 0
+
+
+class TestArrayStackHistory:
+    """Test a Calculator using the compact ArrayStack history."""
+    
+    def test_undo_redo_round_trip(self):
+        """Test undo/redo behave the same with ArrayStack."""
+        calc = Calculator(stack_type=ArrayStack)
+        calc.calculate(2, 3, '+')   # 5
+        calc.calculate(5, 4, '*')   # 20
+        assert calc.undo() == 5
+        assert calc.undo() == 0
+        assert calc.redo() == 5
+        calc.calculate(1, 1, '+')
+        assert isinstance(calc.redo_stack, ArrayStack)
+        with pytest.raises(IndexError, match="Cannot redo"):
+            calc.redo()
+
+
+class TestDeltaHistory:
+    """Test the operation-log (delta) history mode."""
+    
+    def test_invalid_history_mode(self):
+        """Test unknown history modes are rejected."""
+        with pytest.raises(ValueError, match="Invalid History Mode"):
+            Calculator(history_mode="diff")
+    
+    def test_array_stack_rejected(self):
+        """Test delta mode refuses ArrayStack, which cannot hold Delta entries."""
+        with pytest.raises(ValueError, match="object stack"):
+            Calculator(history_mode="delta", stack_type=ArrayStack)
+        with pytest.raises(ValueError, match="object stack"):
+            Calculator(history_mode="delta", history_limit=10, stack_type=ArrayStack)
+    
+    def test_chained_operations_record_deltas(self):
+        """Test chained calculations store operations instead of states."""
+        calc = Calculator(history_mode="delta")
+        calc.calculate(0, 5, '+')    # 5
+        calc.calculate(5, 4, '*')    # 20
+        calc.calculate(20, 2, '/')   # 10
+        assert all(isinstance(entry, Delta) for entry in calc.undo_stack.items)
+        assert calc.undo() == 20
+        assert calc.undo() == 5
+        assert calc.undo() == 0
+        assert calc.redo() == 5
+        assert calc.redo() == 20
+        assert calc.redo() == 10
+    
+    def test_multiply_by_zero_falls_back_to_snapshot(self):
+        """Test non-invertible operations store a snapshot."""
+        calc = Calculator(history_mode="delta")
+        calc.calculate(0, 7, '+')    # 7
+        calc.calculate(7, 0, '*')    # 0
+        assert calc.undo_stack.peek() == 7
+        assert calc.undo() == 7
+        assert calc.redo() == 0
+    
+    def test_unchained_operation_falls_back_to_snapshot(self):
+        """Test a calculation not starting from the current result snapshots."""
+        calc = Calculator(history_mode="delta")
+        calc.calculate(2, 3, '+')    # 5
+        calc.calculate(10, 1, '-')   # 9, value1 is not the current result
+        assert not isinstance(calc.undo_stack.peek(), Delta)
+        assert calc.undo() == 5
+    
+    def test_lossy_float_operation_falls_back_to_snapshot(self):
+        """Test operations whose inverse would round differently snapshot."""
+        calc = Calculator(history_mode="delta")
+        calc.calculate(0, 0.1, '+')
+        calc.calculate(0.1, 1e20, '+')   # 0.1 is absorbed by rounding
+        assert calc.undo() == 0.1
+    
+    def test_sign_of_zero_falls_back_to_snapshot(self):
+        """Test undo and redo keep -0.0 and 0.0 apart, as snapshot mode does."""
+        calc = Calculator(history_mode="delta")
+        calc.calculate(0.0, -1.0, '*')   # -0.0
+        calc.calculate(calc.get_result(), 5, '+')
+        assert str(calc.undo()) == "-0.0"
+        
+        calc = Calculator(history_mode="delta")
+        calc.calculate(-0.0, 5, '*')     # -0.0 from value1 -0.0 == current 0
+        calc.undo()
+        assert str(calc.redo()) == "-0.0"
+    
+    def test_repeated_operations_share_entries(self):
+        """Test identical operations reuse one Delta object."""
+        calc = Calculator(history_mode="delta")
+        for _ in range(3):
+            calc.calculate(calc.get_result(), 1, '+')
+        first, second, third = calc.undo_stack.items
+        assert first is second is third
+    
+    def test_new_calculation_clears_redo(self):
+        """Test delta mode still clears redo on a new calculation."""
+        calc = Calculator(history_mode="delta")
+        calc.calculate(0, 1, '+')
+        calc.undo()
+        calc.calculate(0, 2, '+')
+        with pytest.raises(IndexError, match="Cannot redo"):
+            calc.redo()
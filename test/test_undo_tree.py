@@ -0,0 +1,107 @@
+from fractions import Fraction
+
+import pytest
+from src.undo_tree import BranchingCalculator, UndoTree, ancestor
+
+
+class TestUndoTree:
+    """Test the persistent version tree."""
+    
+    def test_ancestor_lookup(self):
+        """Test jump pointers find the right ancestor at every depth."""
+        tree = UndoTree()
+        for i in range(1, 200):
+            tree.commit(i)
+        tip = tree.current
+        for depth in range(200):
+            assert ancestor(tip, depth).value == depth
+    
+    def test_multi_step_undo_redo(self):
+        """Test undo(n) and redo(n) move n versions at once."""
+        tree = UndoTree()
+        for i in range(1, 11):
+            tree.commit(i)
+        assert tree.undo(7).value == 3
+        assert tree.redo(5).value == 8
+        with pytest.raises(IndexError, match="Cannot redo"):
+            tree.redo(3)
+        with pytest.raises(IndexError, match="No operations to undo"):
+            tree.undo(9)
+    
+    def test_invalid_steps(self):
+        """Test non-positive step counts are rejected."""
+        tree = UndoTree()
+        tree.commit(1)
+        with pytest.raises(ValueError):
+            tree.undo(0)
+
+
+class TestBranchingCalculator:
+    """Test the calculator that keeps every branch."""
+    
+    def test_new_calculation_after_undo_keeps_old_branch(self):
+        """Test the abandoned branch is still reachable with goto."""
+        calc = BranchingCalculator()
+        calc.calculate(5, 3, '+')    # version 1: 8
+        calc.calculate(8, 2, '*')    # version 2: 16
+        calc.undo()                  # back to 8
+        calc.calculate(8, 1, '-')    # version 3: 7, new branch
+        with pytest.raises(IndexError, match="Cannot redo"):
+            calc.redo()
+        assert calc.goto(2) == 16
+        assert calc.undo() == 8
+        assert calc.redo() == 16
+        assert calc.goto(3) == 7
+        assert calc.version == 3
+    
+    def test_goto_back_along_redo_path_keeps_redo(self):
+        """Test jumping to an ancestor keeps the redo path."""
+        calc = BranchingCalculator()
+        for i in range(1, 6):
+            calc.calculate(i, 0, '+')
+        calc.goto(2)
+        assert calc.redo(3) == 5
+    
+    def test_undo_redo_many_steps(self):
+        """Test undo(n)/redo(n) on a long history."""
+        calc = BranchingCalculator()
+        for i in range(1, 1001):
+            calc.calculate(i, 0, '+')
+        assert calc.undo(1000) == 0
+        assert calc.redo(500) == 500
+        assert calc.get_result() == 500
+    
+    def test_validation_and_expressions(self):
+        """Test validation errors and expressions behave like Calculator."""
+        calc = BranchingCalculator()
+        with pytest.raises(ValueError, match="Invalid Operator"):
+            calc.calculate(1, 2, '%')
+        with pytest.raises(ValueError, match="Cannot divide by zero"):
+            calc.calculate(1, 0, '/')
+        assert calc.calculate_expression("(3+4)*2") == 14
+        assert calc.undo() == 0
+    
+    def test_batch_records_one_version_per_row(self):
+        """Test calculate_many commits each valid row."""
+        calc = BranchingCalculator()
+        calc.calculate_many([1, 2, 3], [1, 0, 1], [0, 3, 0])
+        assert calc.get_result() == 4
+        assert calc.undo() == 2
+        assert calc.version == 1
+    
+    def test_fraction_backend(self):
+        """Test backends work with the tree history."""
+        calc = BranchingCalculator(backend="fraction")
+        assert calc.calculate(1, 3, '/') == Fraction(1, 3)
+        assert calc.calculate_expression("1/3 + 1/6") == Fraction(1, 2)
+        assert calc.undo(2) == 0
+    
+    def test_undo_to_predicate(self):
+        """Test undo_to walks the current branch."""
+        calc = BranchingCalculator()
+        for i in range(1, 6):
+            calc.calculate(i, 0, '+')
+        assert calc.undo_to(lambda result: result == 2) == 2
+        assert calc.redo(3) == 5
+        with pytest.raises(IndexError):
+            calc.undo_to(lambda result: result > 10)
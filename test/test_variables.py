@@ -0,0 +1,198 @@
+import io
+import random
+
+import pytest
+from src import serialize
+from src.expression import Variable, compile_expression, evaluate
+from src.journal import Journal
+from src.main import run_batch
+from src.pmap import PersistentMap
+from src.variables import State, VariableCalculator
+
+
+class CollidingKey:
+    """A key whose hash is chosen by the test."""
+
+    def __init__(self, name, key_hash):
+        self.name = name
+        self.key_hash = key_hash
+
+    def __hash__(self):
+        return self.key_hash
+
+    def __eq__(self, other):
+        return isinstance(other, CollidingKey) and other.name == self.name
+
+
+class TestPersistentMap:
+    """Test the structure-sharing map."""
+
+    def test_versions_are_independent(self):
+        """Test set/delete return new maps and leave the old ones intact."""
+        empty = PersistentMap()
+        one = empty.set("x", 1)
+        two = one.set("y", 2)
+        changed = two.set("x", 10)
+        removed = changed.delete("y")
+
+        assert len(empty) == 0 and "x" not in empty
+        assert dict(two.items()) == {"x": 1, "y": 2}
+        assert changed["x"] == 10 and two["x"] == 1
+        assert dict(removed.items()) == {"x": 10}
+        assert one.set("x", one["x"]) is one
+        with pytest.raises(KeyError):
+            removed.delete("y")
+
+    def test_matches_dict(self):
+        """Test random updates, including hash collisions, against a dict."""
+        rng = random.Random(7)
+        keys = [f"v{i}" for i in range(300)] + [CollidingKey(i, rng.choice([1, 33, 1 << 40]))
+                                                 for i in range(40)]
+        versions = []
+        current, expected = PersistentMap(), {}
+        for _ in range(4000):
+            key = rng.choice(keys)
+            if key in expected and rng.random() < 0.3:
+                current = current.delete(key)
+                del expected[key]
+            else:
+                current = current.set(key, rng.random())
+                expected[key] = current[key]
+            versions.append((current, dict(expected)))
+
+        for version, snapshot in versions[::97]:
+            assert len(version) == len(snapshot)
+            assert dict(version.items()) == snapshot
+            assert version == PersistentMap(snapshot)
+
+    def test_shares_structure(self):
+        """Test one update copies only the path to the changed key."""
+        base = PersistentMap({f"v{i}": i for i in range(5000)})
+        updated = base.set("v0", -1)
+        shared = sum(1 for a, b in zip(base.root.entries, updated.root.entries) if a is b)
+        assert shared >= len(base.root.entries) - 1
+
+
+class TestVariableExpressions:
+    """Test named operands in compiled expressions."""
+
+    def test_variables_compile_and_evaluate(self):
+        """Test names compile to Variables and are looked up when evaluated."""
+        program = compile_expression("x * (y + 1)")
+        assert program[0] == Variable("x")
+        assert evaluate(program, {"x": 3.0, "y": 1.0}) == 6.0
+        with pytest.raises(ValueError, match="Unknown variable: y"):
+            evaluate(program, {"x": 3.0})
+        with pytest.raises(ValueError, match="Unknown variable: x"):
+            evaluate(program)
+
+
+class TestVariableCalculator:
+    """Test the memory register, variables and their undo history."""
+
+    def test_let_and_use(self):
+        """Test variables are set from expressions and used in calculations."""
+        calc = VariableCalculator()
+        assert calc.let("x", "2 * 3") == 6.0
+        assert calc.let("y", "x + 1") == 7.0
+        assert calc.calculate_expression("x * y") == 42.0
+        with pytest.raises(ValueError, match="Invalid variable name"):
+            calc.let("2x", 1)
+
+    def test_memory_register(self):
+        """Test M+, M-, MR and MC."""
+        calc = VariableCalculator()
+        calc.calculate(5, 5, '+')
+        assert calc.memory_add() == 10
+        calc.calculate(1, 2, '+')
+        assert calc.memory_subtract() == 7
+        calc.calculate(0, 0, '+')
+        assert calc.memory_recall() == 7
+        assert calc.memory_clear() == 0
+        assert calc.get_result() == 7
+
+    def test_undo_redo_cover_all_state(self):
+        """Test undo/redo step through result, register and variable changes."""
+        calc = VariableCalculator()
+        calc.let("x", 1)
+        calc.calculate_expression("x + 1")
+        calc.memory_add()
+        calc.let("x", 5)
+        calc.calculate_expression("x * 2")
+
+        assert calc.undo() == 2.0
+        assert calc.variables["x"] == 5
+        calc.undo()
+        assert calc.variables["x"] == 1 and calc.memory == 2.0
+        calc.undo()
+        assert calc.memory == 0
+        assert calc.undo(2) == 0
+        assert "x" not in calc.variables
+
+        assert calc.redo(4) == 2.0
+        assert (calc.variables["x"], calc.memory) == (5, 2.0)
+        assert calc.redo() == 10.0
+
+    def test_new_change_clears_redo(self):
+        """Test a variable change after undo discards the redo history."""
+        calc = VariableCalculator()
+        calc.calculate(1, 1, '+')
+        calc.undo()
+        calc.let("z", 3)
+        with pytest.raises(IndexError):
+            calc.redo()
+        assert isinstance(calc.undo_stack.peek(), State)
+
+    def test_forget_and_undo_to(self):
+        """Test forget is undoable and undo_to sees results behind States."""
+        calc = VariableCalculator()
+        calc.calculate(4, 4, '+')
+        calc.let("a", 1)
+        calc.forget("a")
+        with pytest.raises(ValueError, match="Unknown variable"):
+            calc.forget("a")
+        assert calc.undo_to(lambda result: result == 0) == 0
+        assert calc.redo(3) == 8
+        assert "a" not in calc.variables
+
+    def test_exact_backend(self):
+        """Test variables and memory keep the backend's number type."""
+        calc = VariableCalculator(backend="fraction")
+        calc.let("third", "1 / 3")
+        assert calc.calculate_expression("third * 3") == 1
+        calc.memory_add()
+        assert str(calc.memory) == "1"
+
+    def test_session_export_and_checkpoint_are_rejected(self, tmp_path):
+        """Test exporting or checkpointing raises instead of dropping memory and variables."""
+        calc = VariableCalculator()
+        calc.calculate(1, 2, '+')
+        calc.let('x', 5)
+        calc.memory_add()
+
+        with pytest.raises(ValueError, match="VariableCalculator"):
+            serialize.dumps(calc)
+        with pytest.raises(ValueError, match="VariableCalculator"):
+            serialize.dump(calc, io.BytesIO())
+        with Journal(str(tmp_path / "calc.journal")) as journal:
+            with pytest.raises(ValueError, match="VariableCalculator"):
+                journal.checkpoint(calc)
+        assert not (tmp_path / "calc.journal.ckpt").exists()
+
+    def test_rejects_unsupported_options(self):
+        """Test delta mode and ArrayStack are rejected."""
+        from src.stack import ArrayStack
+        with pytest.raises(ValueError, match="snapshot"):
+            VariableCalculator(history_mode="delta")
+        with pytest.raises(ValueError, match="ArrayStack"):
+            VariableCalculator(stack_type=ArrayStack)
+
+    def test_cli_commands(self):
+        """Test let and memory commands in batch mode."""
+        out, err = io.StringIO(), io.StringIO()
+        run_batch(io.StringIO("let rate = 1.5\ncalc 10 * rate\nm+\nmr\nundo 2\nlet r\ncalc q\n"), out, err)
+        assert out.getvalue().splitlines() == ["1.5", "15.0", "15.0", "15.0", "15.0"]
+        assert err.getvalue().splitlines() == [
+            "line 6: Error: Please use format 'let <name> = <expression>'",
+            "line 7: Error: Unknown variable: q",
+        ]
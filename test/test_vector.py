@@ -0,0 +1,87 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.vector import SpillingStack, VectorCalculator  # noqa: E402
+
+
+class TestVectorCalculator:
+    """Test element-wise array operands."""
+
+    def test_elementwise_with_broadcasting(self):
+        """Test the four operators apply element-wise and broadcast."""
+        calc = VectorCalculator()
+        result = calc.calculate(np.array([1.0, 2.0, 3.0]), 2, '*')
+        assert result.tolist() == [2.0, 4.0, 6.0]
+        result = calc.calculate(result, np.array([[1.0], [2.0]]), '-')
+        assert result.shape == (2, 3)
+        assert calc.calculate(np.arange(4), np.arange(4), '+').dtype == np.arange(4).dtype
+        assert calc.calculate(np.arange(1, 4), 2, '/').tolist() == [0.5, 1.0, 1.5]
+        with pytest.raises(ValueError):
+            calc.calculate(np.ones(2), np.ones(3), '+')
+
+    def test_scalars_take_plain_path(self):
+        """Test scalar calls behave exactly like Calculator."""
+        calc = VectorCalculator()
+        assert calc.calculate(6, 3, '/') == 2
+        with pytest.raises(ValueError, match="Cannot divide by zero"):
+            calc.calculate(1, 0, '/')
+        with pytest.raises(ValueError, match="Invalid Operator"):
+            calc.calculate(np.ones(2), 1, '%')
+
+    def test_zero_policies(self):
+        """Test what division by zero elements does under each policy."""
+        values = np.array([1.0, -2.0, 0.0])
+        divisors = np.array([2.0, 0.0, 0.0])
+
+        with pytest.raises(ValueError, match="Cannot divide by zero"):
+            VectorCalculator().calculate(values, divisors, '/')
+
+        result = VectorCalculator(zero_policy="nan").calculate(values, divisors, '/')
+        assert result[0] == 0.5 and np.isnan(result[1:]).all()
+
+        result = VectorCalculator(zero_policy="ieee").calculate(values, divisors, '/')
+        assert result[1] == -np.inf and np.isnan(result[2])
+
+        with pytest.raises(ValueError, match="Invalid Zero Policy"):
+            VectorCalculator(zero_policy="skip")
+
+    def test_history_holds_read_only_results(self):
+        """Test results are frozen and history keeps the same objects."""
+        calc = VectorCalculator()
+        first = calc.calculate(np.ones(3), 1, '+')
+        second = calc.calculate(first, 2, '*')
+        assert not first.flags.writeable
+        with pytest.raises(ValueError):
+            first[0] = 5
+
+        assert calc.undo() is first
+        assert calc.redo() is second
+        assert calc.undo_stack.peek() is first
+        assert calc.undo(2) == 0
+
+    def test_spills_large_entries(self, tmp_path):
+        """Test large history entries become memory-mapped and undo still works."""
+        calc = VectorCalculator(spill_bytes=1024, spill_dir=str(tmp_path))
+        small = calc.calculate(np.ones(8), 1, '+')
+        large = calc.calculate(np.arange(1000.0), 1, '+')
+        calc.calculate(large, 2, '*')
+
+        assert isinstance(calc.undo_stack.peek(), np.memmap)
+        assert calc.undo_stack.items[1] is small
+        assert calc.undo_stack.spilled == 1
+        assert calc.undo_stack.spilled_bytes == large.nbytes
+
+        restored = calc.undo()
+        assert np.array_equal(restored, large)
+        assert not restored.flags.writeable
+        assert calc.redo()[-1] == 2000.0
+
+    def test_rejects_unsupported_options(self):
+        """Test options that cannot handle arrays are rejected."""
+        for options in ({"history_mode": "delta"}, {"backend": "decimal"}, {"cache_size": 8},
+                        {"spill_bytes": 10, "history_limit": 5}):
+            with pytest.raises(ValueError):
+                VectorCalculator(**options)
+        with pytest.raises(ValueError, match="at least 1"):
+            SpillingStack(0)